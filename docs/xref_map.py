@@ -22,6 +22,7 @@ xref_map = {
 'Image': ('class', 'menpo.image.Image'),
 'image_paths': ('function', 'menpo.io.image_paths'),
 'ImageBoundaryError': ('class', 'menpo.image.ImageBoundaryError'),
+'ImagePyramid': ('class', 'menpo.image.ImagePyramid'),
 'InstanceBackedModel': ('class', 'menpo.model.instancebacked.InstanceBackedModel'),
 'Invertible': ('class', 'menpo.transform.base.invertible.Invertible'),
 'LabelledPointUndirectedGraph': ('class', 'menpo.shape.LabelledPointUndirectedGraph'),
@@ -71,5 +72,7 @@ xref_map = {
 'view_patches': ('function', 'menpo.visualize.view_patches'),
 'VComposable': ('class', 'menpo.transform.VComposable'),
 'VInvertible': ('class', 'menpo.transform.base.invertible.VInvertible'),
+'WarpPlan': ('class', 'menpo.image.WarpPlan'),
+'warp_images': ('function', 'menpo.image.warp_images'),
 'video_paths': ('function', 'menpo.io.video_paths'),
 }
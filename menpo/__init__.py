@@ -1,14 +1,35 @@
+import sys
+
 from . import base
 
-from . import feature
-from . import image
-from . import io
-from . import landmark
-from . import math
-from . import model
-from . import shape
-from . import transform
-from . import visualize
+# The subpackages are imported on first attribute access (e.g. menpo.image),
+# so that importing menpo (or a single subpackage such as menpo.shape) only
+# pays for what is actually used. Module level __getattr__ requires
+# Python 3.7 (PEP 562) - older versions import everything upfront.
+_SUBPACKAGES = ('feature', 'image', 'io', 'landmark', 'math', 'model',
+                'shape', 'transform', 'visualize')
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name in _SUBPACKAGES:
+            import importlib
+            # importing a submodule also binds it as an attribute of menpo
+            return importlib.import_module('.' + name, __name__)
+        raise AttributeError("module '{}' has no attribute "
+                             "'{}'".format(__name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | set(_SUBPACKAGES))
+else:
+    from . import feature
+    from . import image
+    from . import io
+    from . import landmark
+    from . import math
+    from . import model
+    from . import shape
+    from . import transform
+    from . import visualize
 
 from ._version import get_versions
 __version__ = get_versions()['version']
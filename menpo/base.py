@@ -2,6 +2,7 @@ import collections
 from itertools import chain
 from functools import partial, wraps
 import os.path
+import re
 from pprint import pformat
 import warnings
 import textwrap
@@ -661,6 +662,232 @@ class LazyList(collections.Sequence, Copyable):
         new._callables = list(chain(*zip(*[new._callables] * n)))
         return new
 
+    def prefetch(self, n_workers=None, read_ahead=None, backend='thread'):
+        r"""
+        Iterate over this LazyList, evaluating upcoming items in a pool of
+        workers. Items are always yielded in the order of the list.
+
+        At most ``read_ahead`` items are ever submitted to the pool ahead of
+        the consumer, so memory usage is capped by the size of the read-ahead
+        window rather than by the length of the list. Any exception raised by
+        a callable is re-raised when the consumer reaches that item.
+
+        Parameters
+        ----------
+        n_workers : `int`, optional
+            The number of workers to evaluate items with. If ``None``, the
+            number of CPUs on the machine is used.
+        read_ahead : `int`, optional
+            The maximum number of items that are evaluated (or are being
+            evaluated) but have not yet been consumed, including the item
+            that was last yielded. If ``None``, twice the number of workers is
+            used.
+        backend : ``{'thread', 'process'}``, optional
+            If ``'thread'``, items are evaluated in a thread pool. This is
+            most useful for I/O bound callables (or those that release the
+            GIL, such as image decoding). If ``'process'``, items are evaluated
+            in a process pool, in which case the callables and their results
+            **must** be picklable.
+
+        Yields
+        ------
+        item : `object`
+            Each evaluated item of this LazyList, in order.
+
+        Raises
+        ------
+        ValueError
+            If ``n_workers`` or ``read_ahead`` are not positive or the
+            ``backend`` is unknown.
+
+        Examples
+        --------
+        >>> import menpo.io as mio
+        >>> images = mio.import_images('./massive_image_db/*')
+        >>> for image in images.prefetch(n_workers=8):
+        >>>     pass  # up to 16 images are being decoded in the background
+        """
+        from multiprocessing import cpu_count
+        if n_workers is None:
+            n_workers = cpu_count()
+        if read_ahead is None:
+            read_ahead = 2 * n_workers
+        if n_workers <= 0 or read_ahead <= 0:
+            raise ValueError('n_workers and read_ahead must be positive '
+                             '({} and {} provided)'.format(n_workers,
+                                                           read_ahead))
+        if backend == 'thread':
+            from multiprocessing.pool import ThreadPool as Pool
+        elif backend == 'process':
+            from multiprocessing import Pool
+        else:
+            raise ValueError("backend must be one of 'thread' or 'process' "
+                             "({} provided)".format(backend))
+        # Capture the callables now so that the iteration is unaffected by
+        # any later changes to this list
+        return _prefetch_callables(list(self._callables), Pool, n_workers,
+                                   read_ahead)
+
+    def cached(self, max_bytes=None, policy='lru'):
+        r"""
+        Create a new LazyList that memoizes the evaluated items of this list
+        in memory. Repeated access to an item that is still cached returns
+        the stored object rather than re-invoking the underlying callable.
+
+        The size of each item is estimated by summing the ``nbytes`` of the
+        arrays it holds (e.g. the pixels and mask of an :map:`Image` or the
+        points of a :map:`PointCloud`, including any landmarks). When the
+        total exceeds ``max_bytes``, items are evicted according to
+        ``policy``. Slices and maps of the returned list share the same cache.
+
+        Note that the **same** object is returned on every cache hit, so
+        cached items should not be mutated in place.
+
+        Parameters
+        ----------
+        max_bytes : `int`, optional
+            The memory budget of the cache, in bytes. If ``None``, the cache
+            is unbounded. Items larger than ``max_bytes`` are never cached.
+        policy : ``{'lru', 'fifo'}``, optional
+            The eviction policy. ``'lru'`` evicts the least recently used item
+            first whilst ``'fifo'`` evicts the item that was cached first.
+
+        Returns
+        -------
+        lazy : `LazyList`
+            A new LazyList that caches the items of this list. The cache (and
+            its hit, miss and eviction counters) is available as the
+            ``cache`` attribute, see :map:`LazyListCache`.
+
+        Examples
+        --------
+        >>> images = menpo.io.import_images('./db/*').map(lambda x: x.rescale(0.5))
+        >>> images = images.cached(max_bytes=2 * 1024 ** 3)  # 2GB budget
+        >>> for epoch in range(10):
+        >>>     for image in images:
+        >>>         pass  # only imported and rescaled on the first epoch
+        >>> print(images.cache)
+        """
+        cache = LazyListCache(max_bytes=max_bytes, policy=policy)
+        new = self.copy()
+        new._callables = [partial(cache._get, i, c)
+                          for i, c in enumerate(new._callables)]
+        new.cache = cache
+        return new
+
+    def cache_to_dir(self, path):
+        r"""
+        Create a new LazyList that persists the evaluated items of this list
+        in the directory at ``path``. Later accesses - including from other
+        processes and in later sessions - load the item from disk instead of
+        re-invoking the underlying callable. Large arrays (e.g. pixels) are
+        stored as ``.npy`` files and are memory-mapped (copy-on-write) when
+        loaded, so only the pages that are actually touched are read.
+
+        Each item is keyed on a fingerprint of its callable. For a list built
+        by the importers and :meth:`map`, this covers the path of the source
+        file (and its size and modification time) and the name, code and
+        arguments of every mapped function. Changing the pipeline or the
+        source file therefore results in a cache miss rather than a stale
+        item. Note that the fingerprint does **not** cover global state that
+        the functions read, and that callables whose arguments have no stable
+        representation (for instance, one that includes a memory address) are
+        not cached at all - they are re-evaluated on every access.
+
+        Parameters
+        ----------
+        path : `pathlib.Path` or `str`
+            The directory to store the cached items in. It will be created if
+            it does not exist.
+
+        Returns
+        -------
+        lazy : `LazyList`
+            A new LazyList that is backed by the on-disk cache.
+
+        Examples
+        --------
+        >>> from menpo.feature import hog
+        >>> images = menpo.io.import_images('./db/*').map(hog)
+        >>> images = images.cache_to_dir('~/.cache/db_hog')
+        >>> images[0]  # hog is computed and stored
+        >>> images[0]  # hog is loaded from disk
+        """
+        from menpo.io.utils import _norm_path
+        path = _norm_path(path)
+        if not path.is_dir():
+            path.mkdir(parents=True)
+        new = self.copy()
+        new._callables = [partial(_dir_cached, path, c)
+                          for c in new._callables]
+        return new
+
+    def iter_batches(self, batch_size, as_array=True, pixels=False, out=None,
+                     reuse_buffer=False, n_workers=None):
+        r"""
+        Iterate over this LazyList in batches of ``batch_size`` items. The
+        final batch may be smaller.
+
+        If ``as_array`` is ``True``, each batch is yielded as a single array
+        that the items are written straight into, rather than as a list of
+        items that would have to be stacked afterwards. By default, the items
+        must be :map:`Vectorizable` and each batch is a
+        ``(n_items, n_features)`` matrix built with
+        :func:`menpo.math.as_matrix`. If ``pixels`` is ``True``, the items must
+        be images of the same shape and each batch is a
+        ``(n_items, n_channels, height, width)`` block of their pixels.
+
+        Parameters
+        ----------
+        batch_size : `int`
+            The number of items per batch.
+        as_array : `bool`, optional
+            If ``False``, each batch is yielded as a `list` of items.
+        pixels : `bool`, optional
+            If ``True``, batches are blocks of image pixels rather than
+            matrices of vectors.
+        out : `ndarray`, optional
+            A buffer of at least ``batch_size`` rows that every batch is
+            written into. The yielded arrays are views onto ``out``.
+        reuse_buffer : `bool`, optional
+            If ``True`` and ``out`` is not provided, a buffer is allocated for
+            the first batch and reused for every following batch.
+        n_workers : `int`, optional
+            If not ``None``, the items are evaluated ahead of the batching by
+            ``n_workers`` threads (see :meth:`prefetch`).
+
+        Yields
+        ------
+        batch : `ndarray` or `list`
+            Each batch, in order. Note that if a buffer is reused (``out`` or
+            ``reuse_buffer``) every batch overwrites the previous one, so a
+            batch should be consumed (or copied) before requesting the next.
+
+        Raises
+        ------
+        ValueError
+            If ``batch_size`` is not positive or ``out`` has fewer than
+            ``batch_size`` rows.
+
+        Examples
+        --------
+        >>> images = menpo.io.import_images('./db/*').map(lambda x: x.resize((64, 64)))
+        >>> for block in images.iter_batches(32, pixels=True, reuse_buffer=True):
+        >>>     train_step(block)  # block is (32, 3, 64, 64) - allocated once
+        """
+        if batch_size <= 0:
+            raise ValueError('batch_size must be positive '
+                             '({} provided)'.format(batch_size))
+        if out is not None and out.shape[0] < batch_size:
+            raise ValueError('out must have at least batch_size ({}) rows '
+                             '({} provided)'.format(batch_size, out.shape[0]))
+        if n_workers is not None:
+            items = self.prefetch(n_workers=n_workers)
+        else:
+            items = iter(self)
+        return _iter_batches(items, batch_size, as_array, pixels, out,
+                             reuse_buffer)
+
     def copy(self):
         r"""
         Generate an efficient copy of this LazyList - copying the underlying
@@ -744,6 +971,349 @@ class LazyList(collections.Sequence, Copyable):
         return 'LazyList containing {} items'.format(len(self))
 
 
+def _invoke(c):
+    # Module level so that it can be sent to process pools
+    return c()
+
+
+def _iter_batches(items, batch_size, as_array, pixels, out, reuse_buffer):
+    r"""
+    Generator that groups ``items`` into batches. See
+    :meth:`LazyList.iter_batches`.
+    """
+    from itertools import islice
+    import numpy as np
+    from menpo.math import as_matrix
+    buffer = out
+    batch = list(islice(items, batch_size))
+    while batch:
+        n_items = len(batch)
+        if not as_array:
+            yield batch
+        elif pixels:
+            template = batch[0].pixels
+            if buffer is None and reuse_buffer:
+                buffer = np.empty((batch_size,) + template.shape,
+                                  dtype=template.dtype)
+            if buffer is None:
+                block = np.empty((n_items,) + template.shape,
+                                 dtype=template.dtype)
+            else:
+                block = buffer[:n_items]
+            for i, x in enumerate(batch):
+                if x.pixels.shape != template.shape:
+                    raise ValueError('All images must have the same pixels '
+                                     'shape to be batched - {} != {}'.format(
+                                         x.pixels.shape, template.shape))
+                block[i] = x.pixels
+            yield block
+        else:
+            if buffer is None and reuse_buffer:
+                template = batch[0].as_vector()
+                buffer = np.empty((batch_size, template.shape[0]),
+                                  dtype=template.dtype)
+            if buffer is None:
+                yield as_matrix(batch)
+            else:
+                yield as_matrix(batch, out=buffer[:n_items])
+        # Drop our references before evaluating the next batch
+        del batch
+        batch = list(islice(items, batch_size))
+
+
+def _update_fingerprint(h, x, seen):
+    r"""
+    Update the ``hashlib`` object ``h`` with a stable description of ``x``,
+    recursing through partials, functions (code, defaults and closures),
+    containers and object attributes. Paths to files additionally include the
+    size and modification time of the file.
+    """
+    import types
+    from pathlib import PurePath
+    import numpy as np
+    from menpo.compatibility import basestring
+
+    def update(s):
+        h.update(str(s).encode('utf-8'))
+
+    update(type(x).__name__)
+    if x is None or isinstance(x, (bool, int, float, complex,
+                                   basestring)):
+        update(repr(x))
+        return
+    if isinstance(x, PurePath):
+        update(str(x))
+        if os.path.isfile(str(x)):
+            stat = os.stat(str(x))
+            update((stat.st_size, stat.st_mtime))
+        return
+    if id(x) in seen:
+        update('<seen>')
+        return
+    seen.add(id(x))
+    if isinstance(x, partial):
+        _update_fingerprint(h, x.func, seen)
+        _update_fingerprint(h, x.args, seen)
+        _update_fingerprint(h, x.keywords or {}, seen)
+    elif isinstance(x, types.FunctionType):
+        update('{}.{}'.format(x.__module__, x.__name__))
+        _update_fingerprint(h, x.__code__, seen)
+        _update_fingerprint(h, x.__defaults__, seen)
+        if x.__closure__:
+            _update_fingerprint(h, [c.cell_contents for c in x.__closure__],
+                                seen)
+    elif isinstance(x, types.CodeType):
+        h.update(x.co_code)
+        _update_fingerprint(h, x.co_consts, seen)
+        _update_fingerprint(h, x.co_names, seen)
+    elif isinstance(x, types.MethodType):
+        _update_fingerprint(h, x.__self__, seen)
+        _update_fingerprint(h, x.__func__, seen)
+    elif isinstance(x, (type, types.ModuleType, types.BuiltinFunctionType)):
+        update('{}.{}'.format(getattr(x, '__module__', ''), x.__name__))
+    elif isinstance(x, dict):
+        for k in sorted(x, key=repr):
+            update(repr(k))
+            _update_fingerprint(h, x[k], seen)
+    elif isinstance(x, (list, tuple)):
+        update(len(x))
+        for v in x:
+            _update_fingerprint(h, v, seen)
+    elif isinstance(x, (set, frozenset)):
+        # The iteration order of a set depends on string hash randomisation,
+        # so describe it by the sorted fingerprints of its elements
+        import hashlib
+        digests = []
+        for v in x:
+            h_v = hashlib.sha1()
+            _update_fingerprint(h_v, v, set(seen))
+            digests.append(h_v.hexdigest())
+        update(len(x))
+        for d in sorted(digests):
+            update(d)
+    elif isinstance(x, (np.ndarray, np.generic)):
+        update((x.dtype, x.shape))
+        h.update(x.tobytes())
+    elif hasattr(type(x), '_fingerprint_state'):
+        # Objects that hold transient state (e.g. locks or lookup caches)
+        # describe themselves by the state that determines their results
+        _update_fingerprint(h, type(x), seen)
+        _update_fingerprint(h, x._fingerprint_state(), seen)
+    elif hasattr(x, '__dict__'):
+        _update_fingerprint(h, type(x), seen)
+        _update_fingerprint(h, x.__dict__, seen)
+    else:
+        r = repr(x)
+        if re.search(r' at 0x[0-9a-fA-F]+', r):
+            # The repr includes a memory address, and so would differ
+            # between processes
+            raise ValueError('{} has no stable representation to '
+                             'fingerprint'.format(r))
+        update(r)
+
+
+def _callable_fingerprint(c):
+    r"""
+    A hex digest that identifies the callable ``c`` (and hence the item it
+    produces) across processes and sessions.
+    """
+    import hashlib
+    h = hashlib.sha1()
+    _update_fingerprint(h, c, set())
+    return h.hexdigest()
+
+
+def _dir_cached(path, c):
+    # Module level so that it can be sent to process pools
+    from menpo.io.input.pickle import unpickle_arrays_out_of_band
+    from menpo.io.output.pickle import pickle_arrays_out_of_band
+    try:
+        fingerprint = _callable_fingerprint(c)
+    except ValueError:
+        # No stable key - the item can never be found again, so don't store
+        return c()
+    item_path = path / '{}.pkl'.format(fingerprint)
+    if item_path.is_file():
+        return unpickle_arrays_out_of_band(item_path)
+    x = c()
+    pickle_arrays_out_of_band(x, item_path)
+    return x
+
+
+def estimate_nbytes(obj):
+    r"""
+    Estimate the memory held by an object by summing the ``nbytes`` of all
+    the arrays (and the length of any `bytes`) that are reachable from it.
+    Containers (`dict`, `list`, `tuple`, `set`) and object attributes are
+    traversed, and each object is only counted once. Small scalar state is
+    ignored - objects that hold no arrays at all are sized with
+    ``sys.getsizeof``.
+
+    Parameters
+    ----------
+    obj : `object`
+        The object to size, e.g. an :map:`Image` or :map:`PointCloud`.
+
+    Returns
+    -------
+    n_bytes : `int`
+        The estimated number of bytes held by ``obj``.
+    """
+    import sys
+    from numbers import Integral
+    from types import ModuleType, FunctionType
+    n_bytes = 0
+    seen = set()
+    to_visit = [obj]
+    while to_visit:
+        x = to_visit.pop()
+        if id(x) in seen:
+            continue
+        seen.add(id(x))
+        x_nbytes = getattr(x, 'nbytes', None)
+        if isinstance(x_nbytes, Integral) and not isinstance(x, type):
+            # ndarrays (and anything else that reports its own size)
+            n_bytes += x_nbytes
+        elif isinstance(x, (type, ModuleType, FunctionType)):
+            # Shared program state rather than data held by the object
+            continue
+        elif isinstance(x, dict):
+            to_visit.extend(x.values())
+        elif isinstance(x, (list, tuple, set, frozenset)):
+            to_visit.extend(x)
+        elif isinstance(x, (bytes, bytearray)):
+            n_bytes += len(x)
+        elif hasattr(x, '__dict__'):
+            to_visit.extend(x.__dict__.values())
+    return n_bytes if n_bytes > 0 else sys.getsizeof(obj)
+
+
+class LazyListCache(object):
+    r"""
+    A thread-safe, byte-budgeted memo of evaluated :map:`LazyList` items.
+    Created by :meth:`LazyList.cached` - see there for details.
+
+    Parameters
+    ----------
+    max_bytes : `int`, optional
+        The memory budget of the cache, in bytes. If ``None``, the cache is
+        unbounded.
+    policy : ``{'lru', 'fifo'}``, optional
+        The eviction policy.
+
+    Raises
+    ------
+    ValueError
+        If the ``policy`` is unknown or ``max_bytes`` is negative.
+    """
+
+    def __init__(self, max_bytes=None, policy='lru'):
+        import threading
+        if policy not in ('lru', 'fifo'):
+            raise ValueError("policy must be one of 'lru' or 'fifo' "
+                             "({} provided)".format(policy))
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError('max_bytes must be non-negative '
+                             '({} provided)'.format(max_bytes))
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        r"""
+        Remove all items from the cache and reset the counters.
+        """
+        self._items = collections.OrderedDict()
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def n_items(self):
+        r"""The number of items currently cached.
+
+        :type: `int`
+        """
+        return len(self._items)
+
+    def _get(self, key, f):
+        with self._lock:
+            if key in self._items:
+                self.hits += 1
+                value, n_bytes = self._items[key]
+                if self.policy == 'lru':
+                    # Re-insert to mark as most recently used
+                    del self._items[key]
+                    self._items[key] = value, n_bytes
+                return value
+            self.misses += 1
+        # Evaluate outside of the lock so other items can be served meanwhile
+        value = f()
+        self._put(key, value)
+        return value
+
+    def _put(self, key, value):
+        n_bytes = estimate_nbytes(value)
+        with self._lock:
+            if self.max_bytes is not None and n_bytes > self.max_bytes:
+                return
+            if key in self._items:
+                # Another thread got here first
+                return
+            self._items[key] = value, n_bytes
+            self.n_bytes += n_bytes
+            while self.max_bytes is not None and self.n_bytes > self.max_bytes:
+                _, (_, evicted_n_bytes) = self._items.popitem(last=False)
+                self.n_bytes -= evicted_n_bytes
+                self.evictions += 1
+
+    def __getstate__(self):
+        # Locks can't be pickled (e.g. when prefetching with processes), and
+        # shipping the cached items around defeats the purpose - so send an
+        # empty cache with the same configuration.
+        return {'max_bytes': self.max_bytes, 'policy': self.policy}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __str__(self):
+        from menpo.visualize import bytes_str
+        return ('LazyListCache ({}) holding {} items ({}) - {} hits, '
+                '{} misses, {} evictions'.format(
+                    self.policy, self.n_items, bytes_str(self.n_bytes),
+                    self.hits, self.misses, self.evictions))
+
+
+def _prefetch_callables(callables, pool_cls, n_workers, read_ahead):
+    r"""
+    Generator that evaluates ``callables`` in a pool of ``n_workers`` whilst
+    never having more than ``read_ahead`` results pending or held by the
+    consumer. See :meth:`LazyList.prefetch`.
+    """
+    pool = pool_cls(min(n_workers, max(len(callables), 1)))
+    pending = collections.deque()
+    to_submit = iter(callables)
+    try:
+        for c in to_submit:
+            pending.append(pool.apply_async(_invoke, (c,)))
+            if len(pending) >= read_ahead:
+                break
+        while pending:
+            result = pending.popleft().get()
+            yield result
+            # Only top the window back up once the consumer has finished with
+            # the result, so that it counts towards the read-ahead window.
+            del result
+            for c in to_submit:
+                pending.append(pool.apply_async(_invoke, (c,)))
+                break
+    finally:
+        # Reached on exhaustion, on error or when the consumer stops early
+        pool.terminate()
+
+
 def partial_doc(func, *args, **kwargs):
     r"""
     Return a partial function but the __doc__ attached to the returned
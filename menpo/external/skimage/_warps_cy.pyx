@@ -20,7 +20,7 @@ ctypedef fused IMAGE_TYPES:
 
 
 cdef inline void _matrix_transform(double x, double y, double* H, double *x_,
-                                   double *y_):
+                                   double *y_) nogil:
     """Apply a homography to a coordinate.
 
     Parameters
@@ -95,7 +95,7 @@ def _warp_fast(IMAGE_TYPES[:, :] image, cnp.ndarray H, output_shape=None,
     cdef char mode_c = ord(mode[0].upper())
 
     cdef IMAGE_TYPES (*interp_func)(IMAGE_TYPES*, Py_ssize_t, Py_ssize_t,
-                                    double, double, char, double)
+                                    double, double, char, double) nogil
     if order == 0:
         interp_func = nearest_neighbour_interpolation
     elif order == 1:
@@ -129,3 +129,93 @@ def _warp_fast(IMAGE_TYPES[:, :] image, cnp.ndarray H, output_shape=None,
                                         mode_c, cval)
 
     return np.asarray(out, dtype=dtype)
+
+
+cdef void _warp_rows(IMAGE_TYPES[:, :, ::1] img, double* H,
+                     IMAGE_TYPES[:, :, ::1] out, Py_ssize_t row_start,
+                     Py_ssize_t row_stop, int order, char mode,
+                     double cval) nogil:
+    # Warps the output rows [row_start, row_stop) of every channel. The source
+    # coordinate is computed once per output pixel and shared by all channels.
+    cdef IMAGE_TYPES (*interp_func)(IMAGE_TYPES*, Py_ssize_t, Py_ssize_t,
+                                    double, double, char, double) nogil
+    if order == 0:
+        interp_func = nearest_neighbour_interpolation
+    elif order == 1:
+        interp_func = bilinear_interpolation
+    elif order == 2:
+        interp_func = biquadratic_interpolation
+    else:
+        interp_func = bicubic_interpolation
+
+    cdef Py_ssize_t tfr, tfc, ch
+    cdef double r, c
+    cdef Py_ssize_t n_channels = img.shape[0]
+    cdef Py_ssize_t rows = img.shape[1]
+    cdef Py_ssize_t cols = img.shape[2]
+    cdef Py_ssize_t out_c = out.shape[2]
+
+    for tfr in range(row_start, row_stop):
+        for tfc in range(out_c):
+            _matrix_transform(tfc, tfr, H, &c, &r)
+            for ch in range(n_channels):
+                out[ch, tfr, tfc] = interp_func(&img[ch, 0, 0], rows, cols,
+                                                r, c, mode, cval)
+
+
+def _warp_fast_multichannel(IMAGE_TYPES[:, :, ::1] image, cnp.ndarray H,
+                            IMAGE_TYPES[:, :, ::1] out, int order=1,
+                            mode='constant', double cval=0,
+                            Py_ssize_t row_start=0, row_stop=None):
+    """Projective transformation (homography) of a multichannel image.
+
+    As :func:`_warp_fast`, but every channel of ``image`` is warped in a
+    single pass, writing into the rows ``[row_start, row_stop)`` of the
+    preallocated ``out``. The GIL is released whilst warping, so that disjoint
+    row ranges can be warped concurrently from multiple threads.
+
+    Parameters
+    ----------
+    image : ``(n_channels, rows, cols)`` `ndarray`
+        Input image.
+    H : array of shape ``(3, 3)``
+        Transformation matrix H that defines the homography.
+    out : ``(n_channels, out_rows, out_cols)`` `ndarray`
+        The array that the warped image is written into. Must have the same
+        dtype as ``image``.
+    order : {0, 1, 2, 3}, optional
+        Order of interpolation.
+    mode : {'constant', 'reflect', 'wrap', 'nearest'}, optional
+        How to handle values outside the image borders (default is constant).
+    cval : string, optional (default 0)
+        Used in conjunction with mode 'C' (constant), the value
+        outside the image boundaries.
+    row_start : `int`, optional
+        The first output row to warp.
+    row_stop : `int`, optional
+        One past the last output row to warp. If ``None``, all remaining rows
+        are warped.
+    """
+    cdef double[:, ::1] M = np.ascontiguousarray(H, dtype=np.float64)
+
+    if mode not in ('constant', 'wrap', 'reflect', 'nearest'):
+        raise ValueError("Invalid mode specified.  Please use "
+                         "`constant`, `nearest`, `wrap` or `reflect`.")
+    cdef char mode_c = ord(mode[0].upper())
+    if order not in (0, 1, 2, 3):
+        raise ValueError('Order must be in the range [0, 3]')
+    if out.shape[0] != image.shape[0]:
+        raise ValueError('out must have the same number of channels as '
+                         'image ({} != {})'.format(out.shape[0],
+                                                   image.shape[0]))
+
+    cdef Py_ssize_t stop = out.shape[1] if row_stop is None else row_stop
+    if row_start < 0 or stop > out.shape[1] or row_start > stop:
+        raise ValueError('Invalid row range [{}, {}) for an output with {} '
+                         'rows'.format(row_start, stop, out.shape[1]))
+    if image.shape[1] == 0 or image.shape[2] == 0:
+        raise ValueError('Cannot warp an empty image')
+
+    with nogil:
+        _warp_rows(image, &M[0, 0], out, row_start, stop, order, mode_c,
+                   cval)
@@ -9,6 +9,12 @@ from ._gradient import gradient_cython
 from .windowiterator import WindowIterator, WindowIteratorResult
 
 
+def _float_dtype_like(dtype):
+    # Single precision inputs give single precision outputs - anything else
+    # is computed in double precision
+    return dtype if dtype == np.float32 else np.float64
+
+
 def _np_gradient(pixels):
     """
     This method is used in the case of multi-channel images (not 2D images).
@@ -267,8 +273,10 @@ def hog(pixels, mode='dense', algorithm='dalaltriggs', num_bins=9,
         if window_step_unit not in ['pixels', 'cells']:
             raise ValueError("Window step unit must be either pixels or cells")
 
-    # Correct input image_data
-    pixels = np.asfortranarray(pixels)
+    # Correct input image_data. The HOG kernel is double precision only, but
+    # the output keeps the precision of the input (e.g. float32).
+    input_dtype = pixels.dtype
+    pixels = np.asfortranarray(pixels, dtype=np.float64)
     pixels *= 255.
 
     # Dense case
@@ -321,7 +329,8 @@ def hog(pixels, mode='dense', algorithm='dalaltriggs', num_bins=9,
     # TODO: This is a temporal fix
     # flip axis
     hog_descriptor = WindowIteratorResult(
-        np.ascontiguousarray(np.rollaxis(hog_descriptor.pixels, -1)),
+        np.ascontiguousarray(np.rollaxis(hog_descriptor.pixels, -1),
+                             dtype=_float_dtype_like(input_dtype)),
         hog_descriptor.centres)
     return hog_descriptor
 
@@ -729,8 +738,10 @@ def lbp(pixels, radius=None, samples=None, mapping_type='riu2',
             raise ValueError("Window step unit must be either pixels or "
                              "window")
 
-    # Correct input image_data
-    pixels = np.asfortranarray(pixels)
+    # Correct input image_data. The LBP kernel is double precision only, but
+    # the output keeps the precision of the input (e.g. float32).
+    input_dtype = pixels.dtype
+    pixels = np.asfortranarray(pixels, dtype=np.float64)
 
     # Parse options
     radius = np.asfortranarray(radius)
@@ -765,7 +776,8 @@ def lbp(pixels, radius=None, samples=None, mapping_type='riu2',
     # TODO: This is a temporary fix
     # flip axis
     lbp_descriptor = WindowIteratorResult(
-        np.ascontiguousarray(np.rollaxis(lbp_descriptor.pixels, -1)),
+        np.ascontiguousarray(np.rollaxis(lbp_descriptor.pixels, -1),
+                             dtype=_float_dtype_like(input_dtype)),
         lbp_descriptor.centres)
     return lbp_descriptor
 
@@ -434,3 +434,22 @@ def test_normalize_0_variance_warning():
                               mode='per_channel')
     assert_allclose(new_image.pixels[0], [[-0.75, -0.25], [0.25, 0.75]])
     assert_allclose(new_image.pixels[1], [[-1.5, -0.5], [0.5, 1.5]])
+
+
+def test_hog_float32_stays_single_precision():
+    image = Image(np.random.rand(2, 40, 40))
+    image32 = Image(image.pixels.astype(np.float32))
+    hog_img = hog(image, cell_size=4, window_unit='pixels',
+                  window_height=16, window_width=16)
+    hog_img32 = hog(image32, cell_size=4, window_unit='pixels',
+                    window_height=16, window_width=16)
+    assert hog_img.pixels.dtype == np.float64
+    assert hog_img32.pixels.dtype == np.float32
+    assert_allclose(hog_img32.pixels, hog_img.pixels, rtol=1e-4, atol=1e-5)
+    # the input is not modified
+    assert np.all(image32.pixels == image.pixels.astype(np.float32))
+
+
+def test_lbp_float32_stays_single_precision():
+    image = Image(np.random.rand(1, 40, 40).astype(np.float32))
+    assert lbp(image).pixels.dtype == np.float32
@@ -1,3 +1,5 @@
 from .base import Image, ImageBoundaryError
 from .boolean import BooleanImage
 from .masked import MaskedImage, OutOfMaskSampleError
+from .pyramid import ImagePyramid
+from .warp import WarpPlan, warp_images
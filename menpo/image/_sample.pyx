@@ -0,0 +1,256 @@
+#cython: cdivision=True
+#cython: boundscheck=False
+#cython: nonecheck=False
+#cython: wraparound=False
+import numpy as np
+cimport numpy as cnp
+from libc.math cimport floor
+
+
+ctypedef fused IMAGE_TYPES:
+    float
+    double
+    cnp.uint8_t
+
+
+ctypedef fused OUTPUT_TYPES:
+    float
+    double
+    cnp.uint8_t
+
+
+# The boundary modes, named as in scipy.ndimage. The reflect mode is not
+# supported, as its behaviour at the image edge differs between versions of
+# scipy.
+cdef enum:
+    MODE_CONSTANT = 0
+    MODE_NEAREST = 1
+    MODE_MIRROR = 2
+    MODE_WRAP = 3
+
+MODES = {'constant': MODE_CONSTANT, 'nearest': MODE_NEAREST,
+         'mirror': MODE_MIRROR, 'wrap': MODE_WRAP}
+
+
+cdef inline double map_coordinate(double x, Py_ssize_t n, int mode) nogil:
+    # Maps a coordinate that lies outside of [0, n - 1] back inside, exactly
+    # as scipy.ndimage.map_coordinates does
+    cdef Py_ssize_t s2
+    if n <= 1:
+        return 0.0 if mode != MODE_CONSTANT or x == 0.0 else -1.0
+    if x < 0:
+        if mode == MODE_CONSTANT:
+            return -1.0
+        elif mode == MODE_NEAREST:
+            return 0.0
+        elif mode == MODE_MIRROR:
+            s2 = 2 * n - 2
+            x = s2 * <Py_ssize_t>(-x / s2) + x
+            return x + s2 if x <= 1 - n else -x
+        else:
+            s2 = n - 1
+            return x + s2 * (<Py_ssize_t>(-x / s2) + 1)
+    elif x > n - 1:
+        if mode == MODE_CONSTANT:
+            return -1.0
+        elif mode == MODE_NEAREST:
+            return n - 1
+        elif mode == MODE_MIRROR:
+            s2 = 2 * n - 2
+            x -= s2 * <Py_ssize_t>(x / s2)
+            return s2 - x if x >= n else x
+        else:
+            s2 = n - 1
+            return x - s2 * <Py_ssize_t>(x / s2)
+    return x
+
+
+cdef inline Py_ssize_t extend_index(Py_ssize_t i, Py_ssize_t n,
+                                    int mode) nogil:
+    # Maps the index of a neighbour that lies outside of the image back
+    # inside. The mirror mode leaves coordinates in (n - 1, n) unchanged, so
+    # their upper neighbour (which has a non-zero weight) is mirrored, as
+    # scipy.ndimage does. For the other modes this only happens for a
+    # neighbour with a zero weight.
+    cdef Py_ssize_t s2
+    if 0 <= i < n:
+        return i
+    if n <= 1:
+        return 0
+    if mode == MODE_MIRROR:
+        s2 = 2 * n - 2
+        if i < 0:
+            i = s2 * (-i / s2) + i
+            return i + s2 if i <= 1 - n else -i
+        i -= s2 * (i / s2)
+        return s2 - i if i >= n else i
+    elif mode == MODE_WRAP:
+        s2 = n - 1
+        if i < 0:
+            return i + s2 * ((-i - 1) / s2 + 1)
+        return i - s2 * (i / s2)
+    return 0 if i < 0 else n - 1
+
+
+cdef inline bint weights(double x, Py_ssize_t n, int order, int mode,
+                         Py_ssize_t* indices, double* w) nogil:
+    # Computes the indices and weights of the neighbours of x along one axis.
+    # Returns False if the point lies outside of the image for the constant
+    # mode.
+    cdef Py_ssize_t start
+    cdef double t
+    x = map_coordinate(x, n, mode)
+    if mode == MODE_CONSTANT and x < 0:
+        return False
+    if order == 0:
+        indices[0] = extend_index(<Py_ssize_t>floor(x + 0.5), n, mode)
+        w[0] = 1.0
+        return True
+    start = <Py_ssize_t>floor(x)
+    t = x - start
+    indices[0] = extend_index(start, n, mode)
+    indices[1] = extend_index(start + 1, n, mode)
+    w[0] = 1.0 - t
+    w[1] = t
+    return True
+
+
+cdef inline OUTPUT_TYPES cast_output(double v, OUTPUT_TYPES* _) nogil:
+    if OUTPUT_TYPES is cnp.uint8_t:
+        # Rounded and clipped, as scipy.ndimage does for integer outputs
+        if v <= 0.0:
+            return 0
+        elif v >= 255.0:
+            return 255
+        return <cnp.uint8_t>floor(v + 0.5)
+    else:
+        return <OUTPUT_TYPES>v
+
+
+def sample_points(IMAGE_TYPES[:, :, ::1] pixels, double[:, ::1] points,
+                  OUTPUT_TYPES[:, ::1] out, int order=1, int mode=0,
+                  double cval=0.0):
+    r"""
+    Samples every channel of ``pixels`` at each of the ``points``. The
+    interpolation indices and weights are computed once per point and then
+    applied to all of the channels. The GIL is released while sampling.
+
+    Parameters
+    ----------
+    pixels : ``(n_channels, n_rows, n_cols)`` `ndarray`
+        The image to sample from.
+    points : ``(n_points, 2)`` `float64 ndarray`
+        The points to sample at.
+    out : ``(n_channels, n_points)`` `ndarray`
+        The array that the sampled values are written into.
+    order : ``{0, 1}``, optional
+        The order of interpolation.
+    mode : `int`, optional
+        The boundary mode, one of the values of ``MODES``.
+    cval : `float`, optional
+        The value of points outside the image for the constant mode.
+    """
+    cdef:
+        Py_ssize_t n_channels = pixels.shape[0]
+        Py_ssize_t n_rows = pixels.shape[1]
+        Py_ssize_t n_cols = pixels.shape[2]
+        Py_ssize_t n_points = points.shape[0]
+        Py_ssize_t n_taps = order + 1
+        Py_ssize_t p, ch, i, j
+        Py_ssize_t r_idx[2]
+        Py_ssize_t c_idx[2]
+        double r_w[2]
+        double c_w[2]
+        double v
+        OUTPUT_TYPES cval_out = cast_output(cval, <OUTPUT_TYPES*>NULL)
+
+    if order not in (0, 1):
+        raise ValueError('Order must be 0 or 1 ({} provided)'.format(order))
+    if out.shape[0] != n_channels or out.shape[1] != n_points:
+        raise ValueError('out must have shape ({}, {})'.format(n_channels,
+                                                                n_points))
+
+    with nogil:
+        for p in range(n_points):
+            if not (weights(points[p, 0], n_rows, order, mode, r_idx, r_w)
+                    and weights(points[p, 1], n_cols, order, mode, c_idx,
+                                c_w)):
+                for ch in range(n_channels):
+                    out[ch, p] = cval_out
+                continue
+            for ch in range(n_channels):
+                v = 0.0
+                for i in range(n_taps):
+                    for j in range(n_taps):
+                        v += (r_w[i] * c_w[j] *
+                              pixels[ch, r_idx[i], c_idx[j]])
+                out[ch, p] = cast_output(v, <OUTPUT_TYPES*>NULL)
+
+
+def interpolation_weights(double[:, ::1] points, Py_ssize_t n_rows,
+                          Py_ssize_t n_cols, int order=1, int mode=0):
+    r"""
+    Computes the flat pixel indices and interpolation weights of the
+    neighbours of each of the ``points``, exactly as :func:`sample_points`
+    does internally. Sampling a ``(n_channels, n_rows * n_cols)`` image is
+    then a gather of ``indices`` followed by a weighted sum over the last
+    axis.
+
+    Parameters
+    ----------
+    points : ``(n_points, 2)`` `float64 ndarray`
+        The points to compute the weights for.
+    n_rows : `int`
+        The number of rows of the image that will be sampled.
+    n_cols : `int`
+        The number of columns of the image that will be sampled.
+    order : ``{0, 1}``, optional
+        The order of interpolation.
+    mode : `int`, optional
+        The boundary mode, one of the values of ``MODES``.
+
+    Returns
+    -------
+    indices : ``(n_points, n_taps)`` `int64 ndarray`
+        The flat index of each neighbour of each point, where ``n_taps`` is
+        ``1`` or ``4`` for orders ``0`` and ``1``.
+    weights : ``(n_points, n_taps)`` `float64 ndarray`
+        The weight of each neighbour of each point.
+    outside : ``(n_points,)`` `bool ndarray`
+        ``True`` for points that lie outside of the image for the constant
+        mode. Their indices and weights are ``0``.
+    """
+    if order not in (0, 1):
+        raise ValueError('Order must be 0 or 1 ({} provided)'.format(order))
+    cdef:
+        Py_ssize_t n_points = points.shape[0]
+        Py_ssize_t n_axis_taps = order + 1
+        Py_ssize_t n_taps = n_axis_taps * n_axis_taps
+        Py_ssize_t p, i, j
+        Py_ssize_t r_idx[2]
+        Py_ssize_t c_idx[2]
+        double r_w[2]
+        double c_w[2]
+        cnp.int64_t[:, ::1] indices
+        double[:, ::1] w
+        cnp.uint8_t[::1] outside
+
+    indices_arr = np.zeros((n_points, n_taps), dtype=np.int64)
+    weights_arr = np.zeros((n_points, n_taps), dtype=np.float64)
+    outside_arr = np.zeros(n_points, dtype=np.uint8)
+    indices, w, outside = indices_arr, weights_arr, outside_arr
+
+    with nogil:
+        for p in range(n_points):
+            if not (weights(points[p, 0], n_rows, order, mode, r_idx, r_w)
+                    and weights(points[p, 1], n_cols, order, mode, c_idx,
+                                c_w)):
+                outside[p] = 1
+                continue
+            for i in range(n_axis_taps):
+                for j in range(n_axis_taps):
+                    indices[p, i * n_axis_taps + j] = (r_idx[i] * n_cols +
+                                                       c_idx[j])
+                    w[p, i * n_axis_taps + j] = r_w[i] * c_w[j]
+
+    return indices_arr, weights_arr, outside_arr.view(np.bool)
@@ -11,11 +11,11 @@ from menpo.base import (Vectorizable, MenpoDeprecationWarning,
 from menpo.shape import PointCloud, bounding_box
 from menpo.landmark import Landmarkable
 from menpo.transform import (Translation, NonUniformScale, Rotation,
-                             AlignmentUniformScale, Affine, scale_about_centre,
-                             transform_about_centre)
+                             AlignmentUniformScale, Homogeneous,
+                             scale_about_centre, transform_about_centre)
 from menpo.visualize.base import ImageViewer, LandmarkableViewable, Viewable
 
-from .interpolation import scipy_interpolation, cython_interpolation
+from .interpolation import multichannel_interpolation, cython_interpolation
 from .patches import extract_patches, set_patches
 
 
@@ -68,7 +68,8 @@ def indices_for_image_of_shape(shape):
     return np.indices(shape).reshape([len(shape), -1]).T
 
 
-def normalize_pixels_range(pixels, error_on_unknown_type=True):
+def normalize_pixels_range(pixels, error_on_unknown_type=True,
+                           dtype=np.float64):
     r"""
     Normalize the given pixels to the Menpo valid floating point range, [0, 1].
     This is a single place to handle normalising pixels ranges. At the moment
@@ -82,6 +83,10 @@ def normalize_pixels_range(pixels, error_on_unknown_type=True):
         If ``True``, this method throws a ``ValueError`` if the given pixels
         array is an unknown type. If ``False``, this method performs no
         operation.
+    dtype : `numpy.dtype`, optional
+        The floating point dtype of the normalized pixels. Normalizing
+        straight to ``float32`` halves the memory of the result, without
+        an intermediate ``float64`` array.
 
     Returns
     -------
@@ -93,21 +98,21 @@ def normalize_pixels_range(pixels, error_on_unknown_type=True):
     ValueError
         If ``pixels`` is an unknown type and ``error_on_unknown_type==True``
     """
-    dtype = pixels.dtype
-    if dtype == np.uint8:
+    in_dtype = pixels.dtype
+    if in_dtype == np.uint8:
         max_range = 255.0
-    elif dtype == np.uint16:
+    elif in_dtype == np.uint16:
         max_range = 65535.0
     else:
         if error_on_unknown_type:
             raise ValueError('Unexpected dtype ({}) - normalisation range '
-                             'is unknown'.format(dtype))
+                             'is unknown'.format(in_dtype))
         else:
             # Do nothing
             return pixels
-    # This multiplication is quite a bit faster than just dividing - will
-    # automatically cast it up to float64
-    return pixels * (1.0 / max_range)
+    # This multiplication is quite a bit faster than just dividing - and
+    # casts straight to the requested dtype
+    return np.multiply(pixels, 1.0 / max_range, dtype=dtype)
 
 
 def denormalize_pixels_range(pixels, out_dtype):
@@ -1743,8 +1748,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         # 'special case' and not document the ndarray ability.
         if isinstance(points_to_sample, PointCloud):
             points_to_sample = points_to_sample.points
-        return scipy_interpolation(self.pixels, points_to_sample,
-                                   order=order,  mode=mode, cval=cval)
+        return multichannel_interpolation(self.pixels, points_to_sample,
+                                          order=order, mode=mode, cval=cval)
 
     def warp_to_shape(self, template_shape, transform, warp_landmarks=True,
                       order=1, mode='constant', cval=0.0, batch_size=None,
@@ -1804,7 +1809,7 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
             `return_transform` is ``True``.
         """
         template_shape = np.array(template_shape, dtype=np.int)
-        if (isinstance(transform, Affine) and order in range(4) and
+        if (isinstance(transform, Homogeneous) and order in range(4) and
             self.n_dims == 2):
 
             # we are going to be able to go fast.
@@ -1828,8 +1833,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
                     return self._build_warp_to_shape(warped_pixels, transform,
                                                      warp_landmarks,
                                                      return_transform)
-            # we couldn't do the crop, but skimage has an optimised Cython
-            # interpolation for 2D affine warps - let's use that
+            # we couldn't do the crop, but we have an optimised multichannel
+            # Cython interpolation for 2D homogeneous warps - let's use that
             sampled = cython_interpolation(self.pixels, template_shape,
                                            transform, order=order,
                                            mode=mode, cval=cval)
@@ -2447,7 +2452,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         r"""
         Return a rescaled pyramid of this image. The first image of the
         pyramid will be a copy of the original, unmodified, image, and counts
-        as level 1.
+        as level 1. Every level is recomputed on each call - see
+        :map:`ImagePyramid` for a pyramid that memoizes its levels.
 
         Parameters
         ----------
@@ -2472,7 +2478,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         r"""
         Return the gaussian pyramid of this image. The first image of the
         pyramid will be a copy of the original, unmodified, image, and counts
-        as level 1.
+        as level 1. Every level is recomputed on each call - see
+        :map:`ImagePyramid` for a pyramid that memoizes its levels.
 
         Parameters
         ----------
@@ -548,9 +548,10 @@ class BooleanImage(Image):
                                      warp_landmarks=warp_landmarks, order=0,
                                      mode=mode, cval=cval,
                                      batch_size=batch_size)
-        # unfortunately we can't escape copying here, let BooleanImage
-        # convert us to np.bool
-        boolean_image = BooleanImage(warped.pixels.reshape(template_shape))
+        # the warp preserves the bool dtype, so the freshly warped pixels can
+        # be adopted without a copy
+        boolean_image = BooleanImage(warped.pixels.reshape(template_shape),
+                                     copy=False)
         if warped.has_landmarks:
             boolean_image.landmarks = warped.landmarks
         if hasattr(warped, 'path'):
@@ -1,6 +1,8 @@
+import threading
+
 import numpy as np
 map_coordinates = None  # expensive, from scipy.ndimage
-from menpo.external.skimage._warps_cy import _warp_fast
+from menpo.external.skimage._warps_cy import _warp_fast_multichannel
 from menpo.transform import Homogeneous
 
 # Store out a transform that simply switches the x and y axis
@@ -54,12 +56,103 @@ def scipy_interpolation(pixels, points_to_sample, mode='constant', order=1,
     return np.concatenate(sampled_pixel_values, axis=0)
 
 
+def multichannel_interpolation(pixels, points_to_sample, mode='constant',
+                               order=1, cval=0.):
+    r"""
+    Interpolation utilizing menpo's native multichannel sampler. The
+    interpolation weights are computed once per point and all channels are
+    sampled in a single pass, rather than once per channel as in
+    :func:`scipy_interpolation`. The results match
+    ``scipy.ndimage.map_coordinates``.
+
+    2D images of type ``float32``, ``float64``, ``uint8`` (and ``bool`` for
+    ``order=0``) are sampled natively for orders ``0`` and ``1`` and the
+    ``constant``, ``nearest``, ``mirror`` and ``wrap`` modes. Any other input
+    (including all higher orders, which need the spline coefficients of the
+    image) falls back to :func:`scipy_interpolation`.
+
+    Parameters
+    ----------
+    pixels : ``(n_channels, M, N, ...)`` `ndarray`
+        The image to be sampled from, the first axis containing channel
+        information
+    points_to_sample : ``(n_points, n_dims)`` `ndarray`
+        The points which should be sampled from pixels
+    mode : ``{constant, nearest, reflect, mirror, wrap}``, optional
+        Points outside the boundaries of the input are filled according to the
+        given mode
+    order : `int,` optional
+        The order of the spline interpolation. The order has to be in the
+        range [0, 5].
+    cval : `float`, optional
+        The value that should be used for points that are sampled from
+        outside the image bounds if mode is ``constant``.
+
+    Returns
+    -------
+    sampled_image : ``(n_channels, n_points)`` `ndarray`
+        The pixel information sampled at each of the points, of the same
+        dtype as ``pixels``.
+    """
+    from ._sample import sample_points, MODES
+    is_bool = pixels.dtype == np.bool
+    if (pixels.ndim != 3 or order not in (0, 1) or mode not in MODES or
+            (is_bool and order != 0) or
+            pixels.dtype not in (np.float32, np.float64, np.uint8, np.bool)):
+        return scipy_interpolation(pixels, points_to_sample, mode=mode,
+                                   order=order, cval=cval)
+    points_to_sample = np.ascontiguousarray(points_to_sample,
+                                            dtype=np.float64)
+    sampled = np.empty((pixels.shape[0], points_to_sample.shape[0]),
+                       dtype=pixels.dtype)
+    if is_bool:
+        # Sampled as uint8 through views, so that nothing is copied
+        pixels, out = np.ascontiguousarray(pixels).view(np.uint8), \
+            sampled.view(np.uint8)
+        cval = float(bool(cval))
+    else:
+        out = sampled
+    sample_points(np.ascontiguousarray(pixels), points_to_sample, out,
+                  order=order, mode=MODES[mode], cval=cval)
+    return sampled
+
+
+# The minimum number of output pixels that each thread warps - smaller warps
+# are not worth the overhead of dispatching to a pool
+_MIN_PIXELS_PER_WORKER = 2 ** 14
+
+# The thread pool that warps are split across - created on first use and
+# shared by every warp, rather than paying for new threads per warp
+_warp_pool = None
+_warp_pool_lock = threading.Lock()
+
+
+def _get_warp_pool():
+    global _warp_pool
+    with _warp_pool_lock:
+        if _warp_pool is None:
+            from multiprocessing import cpu_count
+            from multiprocessing.pool import ThreadPool
+            _warp_pool = ThreadPool(cpu_count())
+        return _warp_pool
+
+
+def _in_main_thread():
+    return isinstance(threading.current_thread(), threading._MainThread)
+
+
 def cython_interpolation(pixels, template_shape, h_transform, mode='constant',
-                         order=1, cval=0.):
+                         order=1, cval=0., n_workers=None):
     r"""
-    Interpolation utilizing skimage fast cython warp function. This method
-    assumes that the warp takes the form of a homogeneous transform, and
-    thus is much faster for operations such as scaling.
+    Interpolation utilizing a fast multichannel cython warp function. This
+    method assumes that the warp takes the form of a homogeneous transform,
+    and thus is much faster for operations such as scaling.
+
+    All channels are warped in a single pass over the output pixels, and the
+    output rows are split across ``n_workers`` threads (the GIL is released
+    whilst warping). ``float32``, ``float64``, ``uint8``, ``uint16`` and
+    ``bool`` images are warped without being converted, and the result has
+    the same dtype as ``pixels``.
 
     Parameters
     ----------
@@ -77,34 +170,52 @@ def cython_interpolation(pixels, template_shape, h_transform, mode='constant',
     cval : `float`, optional
         The value that should be used for points that are sampled from
         outside the image bounds if mode is 'constant'
+    n_workers : `int`, optional
+        The number of parts to split the output rows into, which are warped
+        on a thread pool that is shared by all warps. If ``None``, chosen
+        from the number of CPUs and the size of the output - unless called
+        from a thread other than the main thread (e.g. whilst warping many
+        images in parallel), in which case the warp is single-threaded.
 
     Returns
     -------
-    sampled_image : `ndarray`
+    sampled_image : ``(n_channels, n_pixels)`` `ndarray`
         The pixel information sampled at each of the points.
     """
     # unfortunately they consider xy -> yx
     matrix = xy_yx.compose_before(h_transform).compose_before(xy_yx).h_matrix
-    warped_channels = []
-    # Unfortunately, Cython does not seem to support the boolean numpy type,
-    # so I think we need to do the cast here. If we don't we lose support
-    # for warping BooleanImage.
-    # TODO: Can Cython support bool types? If so, skip this
-    if pixels.dtype == np.bool:
-        in_pixels = pixels.astype(np.uint8)
+    template_shape = tuple(int(s) for s in template_shape)
+    in_pixels = np.ascontiguousarray(pixels)
+    is_bool = pixels.dtype == np.bool
+    if is_bool:
+        # Cython does not support the boolean numpy type, but a view as uint8
+        # can be warped without copying
+        in_pixels = in_pixels.view(np.uint8)
+    warped = np.empty((pixels.shape[0],) + template_shape,
+                      dtype=in_pixels.dtype)
+
+    n_rows = template_shape[0]
+    if n_workers is None:
+        if _in_main_thread():
+            from multiprocessing import cpu_count
+            n_workers = min(cpu_count(),
+                            warped.size // _MIN_PIXELS_PER_WORKER)
+        else:
+            # Already parallelised by the caller - more threads per warp
+            # would only oversubscribe the CPUs
+            n_workers = 1
+    n_workers = max(1, min(n_workers, n_rows))
+    if n_workers == 1:
+        _warp_fast_multichannel(in_pixels, matrix, warped, order=order,
+                                mode=mode, cval=cval)
     else:
-        in_pixels = pixels
-    # Loop over every channel in image - we know last axis is always channels
-    # Note that map_coordinates uses the opposite (dims, points) convention
-    # to us so we transpose
-    for i in range(pixels.shape[0]):
-        warped_channels.append(_warp_fast(in_pixels[i], matrix,
-                                          output_shape=template_shape,
-                                          mode=mode, order=order, cval=cval))
-    warped_channels = [v.reshape([1, -1]) for v in warped_channels]
-
-    result = np.concatenate(warped_channels, axis=0)
-    # As above, we need to convert the uint8 back to bool
-    if pixels.dtype == np.bool:
-        result = result.astype(np.bool)
+        bounds = np.linspace(0, n_rows, n_workers + 1).astype(np.int)
+        _get_warp_pool().map(lambda b: _warp_fast_multichannel(
+            in_pixels, matrix, warped, order=order, mode=mode, cval=cval,
+            row_start=b[0], row_stop=b[1]), zip(bounds[:-1], bounds[1:]))
+
+    result = warped.reshape([pixels.shape[0], -1])
+    # As above, the uint8 view needs to be returned as bool
+    if is_bool:
+        result = result.view(np.bool)
     return result
@@ -0,0 +1,209 @@
+import numpy as np
+
+from menpo.transform import Affine, UniformScale
+
+
+class ImagePyramid(object):
+    r"""
+    A multi-level pyramid of an image, whose levels are computed lazily on
+    first access and then memoized. Unlike the :meth:`Image.pyramid` and
+    :meth:`Image.gaussian_pyramid` generators, building several passes over
+    the same pyramid (as multi-scale fitting does) computes every level only
+    once. The first level is the original image itself - it is **not**
+    copied, and so shares its pixels with the image passed in.
+
+    Every other level is filtered and stored in ``dtype`` (``float32`` by
+    default). If the pyramid is gaussian and ``downscale`` is an integer
+    (e.g. the default of ``2``), each level is downsampled by simply taking
+    every ``downscale``'th pixel of the filtered previous level, rather than
+    by interpolating. Otherwise levels are built with :meth:`Image.rescale`.
+
+    The transform between the first level and each level is recorded, so
+    that shapes can be moved between levels with :meth:`to_level` without
+    re-warping any image.
+
+    Parameters
+    ----------
+    image : :map:`Image` or subclass
+        The image at the base of the pyramid.
+    n_levels : `int`, optional
+        Total number of levels in the pyramid, including the original
+        unmodified image.
+    downscale : `float`, optional
+        Downscale factor between consecutive levels.
+    sigma : `float`, optional
+        Sigma for the gaussian filter. Default is ``downscale / 3.`` which
+        corresponds to a filter mask twice the size of the scale factor
+        that covers more than 99% of the gaussian distribution.
+    gaussian : `bool`, optional
+        If ``True``, each level is gaussian filtered before being
+        downscaled, as in :meth:`Image.gaussian_pyramid`. Otherwise, levels
+        are simply rescaled, as in :meth:`Image.pyramid`.
+    dtype : `numpy.dtype`, optional
+        The dtype that levels are filtered and stored in.
+
+    Raises
+    ------
+    ValueError
+        If ``n_levels`` is not positive or ``downscale`` is not greater than
+        ``1``.
+    """
+    def __init__(self, image, n_levels=3, downscale=2, sigma=None,
+                 gaussian=True, dtype=np.float32):
+        if n_levels < 1:
+            raise ValueError('n_levels must be positive ({} '
+                             'provided)'.format(n_levels))
+        if downscale <= 1:
+            raise ValueError('downscale must be greater than 1 ({} '
+                             'provided)'.format(downscale))
+        if sigma is None:
+            sigma = downscale / 3.
+        self.n_levels = n_levels
+        self.downscale = downscale
+        self.sigma = sigma
+        self.gaussian = gaussian
+        self.dtype = np.dtype(dtype)
+        self._levels = [image] + [None] * (n_levels - 1)
+        self._transforms = ([Affine.init_identity(image.n_dims)] +
+                            [None] * (n_levels - 1))
+
+    def __len__(self):
+        return self.n_levels
+
+    def __iter__(self):
+        for level in range(self.n_levels):
+            yield self[level]
+
+    def __getitem__(self, level):
+        level = self._check_level(level)
+        if self._levels[level] is None:
+            # Levels are built from the previous one, which is memoized too
+            prev = self[level - 1]
+            self._levels[level], step = self._downscale_level(prev)
+            self._transforms[level] = self._transforms[level - 1]\
+                .compose_before(step)
+        return self._levels[level]
+
+    def _check_level(self, level):
+        if level < 0:
+            level += self.n_levels
+        if not 0 <= level < self.n_levels:
+            raise IndexError('level {} is out of range for a pyramid of {} '
+                             'levels'.format(level, self.n_levels))
+        return level
+
+    @property
+    def has_integer_downscale(self):
+        r"""
+        Whether levels are downsampled by taking every ``downscale``'th
+        pixel, rather than by interpolating.
+
+        :type: `bool`
+        """
+        return self.gaussian and float(self.downscale).is_integer()
+
+    def _downscale_level(self, prev):
+        # Returns the next level after prev, and the transform from the
+        # coordinates of prev to those of the new level
+        from menpo.feature import gaussian_filter
+        from menpo.feature.base import rebuild_feature_image
+        pixels = prev.pixels.astype(self.dtype, copy=False)
+        if self.gaussian:
+            pixels = gaussian_filter(pixels, self.sigma)
+        if self.has_integer_downscale:
+            factor = int(self.downscale)
+            step = UniformScale(1.0 / factor, prev.n_dims)
+            stride = (slice(None, None, factor),) * prev.n_dims
+            level = self._build_strided_level(prev, pixels, stride, step)
+        else:
+            filtered = rebuild_feature_image(prev, pixels)
+            level, inverse = filtered.rescale(1.0 / self.downscale,
+                                              return_transform=True)
+            step = inverse.pseudoinverse()
+        if hasattr(prev, 'path'):
+            level.path = prev.path
+        return level, step
+
+    @staticmethod
+    def _build_strided_level(prev, pixels, stride, step):
+        from .base import Image
+        from .boolean import BooleanImage
+        from .masked import MaskedImage
+        level_pixels = np.ascontiguousarray(pixels[(slice(None),) + stride])
+        if isinstance(prev, MaskedImage):
+            mask = BooleanImage(
+                np.ascontiguousarray(prev.mask.pixels[0][stride]),
+                copy=False)
+            level = MaskedImage(level_pixels, mask=mask, copy=False)
+        else:
+            level = Image(level_pixels, copy=False)
+        if prev.has_landmarks:
+            level.landmarks = step.apply(prev.landmarks)
+        return level
+
+    def is_computed(self, level):
+        r"""
+        Whether the given level has already been computed.
+
+        Parameters
+        ----------
+        level : `int`
+            The level of the pyramid.
+
+        Returns
+        -------
+        is_computed : `bool`
+            ``True`` if the level is memoized.
+        """
+        return self._levels[self._check_level(level)] is not None
+
+    def clear(self):
+        r"""
+        Forget every computed level (apart from the original image), freeing
+        their memory. They will be recomputed when next accessed.
+        """
+        self._levels[1:] = [None] * (self.n_levels - 1)
+        self._transforms[1:] = [None] * (self.n_levels - 1)
+
+    def transform(self, level):
+        r"""
+        The transform from the coordinates of the first level (the original
+        image) to the coordinates of the given level. The level is computed
+        if it has not been already.
+
+        Parameters
+        ----------
+        level : `int`
+            The level of the pyramid.
+
+        Returns
+        -------
+        transform : :map:`Homogeneous`
+            The transform from the first level to ``level``.
+        """
+        level = self._check_level(level)
+        self[level]
+        return self._transforms[level]
+
+    def to_level(self, shape, level, from_level=0):
+        r"""
+        Map a shape (for instance landmarks) from the coordinates of one level
+        of the pyramid to another.
+
+        Parameters
+        ----------
+        shape : :map:`Transformable`
+            The shape to map, in the coordinates of ``from_level``.
+        level : `int`
+            The level to map ``shape`` to.
+        from_level : `int`, optional
+            The level whose coordinates ``shape`` is in.
+
+        Returns
+        -------
+        mapped_shape : ``type(shape)``
+            A copy of ``shape`` in the coordinates of ``level``.
+        """
+        t = self.transform(from_level).pseudoinverse().compose_before(
+            self.transform(level))
+        return t.apply(shape)
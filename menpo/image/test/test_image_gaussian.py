@@ -1,3 +1,6 @@
+import numpy as np
+from numpy.testing import assert_allclose
+
 import menpo
 
 
@@ -33,3 +36,51 @@ def test_image_pyramid_shapes():
     shapes = [(512, 512), (128, 128), (32, 32)]
     for l, expected_shape in zip(lenna.pyramid(n_levels=3, downscale=4), shapes):
         assert l.shape == expected_shape
+
+
+def test_image_pyramid_object_shapes():
+    from menpo.image import ImagePyramid
+    lenna = menpo.io.import_builtin_asset.lenna_png()
+    pyramid = ImagePyramid(lenna, n_levels=4)
+    shapes = [(512, 512), (256, 256), (128, 128), (64, 64)]
+    assert len(pyramid) == 4
+    for l, expected_shape in zip(pyramid, shapes):
+        assert l.shape == expected_shape
+
+
+def test_image_pyramid_object_memoized():
+    from menpo.image import ImagePyramid
+    lenna = menpo.io.import_builtin_asset.lenna_png()
+    pyramid = ImagePyramid(lenna, n_levels=3)
+    assert pyramid[0] is lenna
+    assert not pyramid.is_computed(2)
+    level = pyramid[2]
+    assert pyramid.is_computed(1)
+    assert pyramid[2] is level
+    assert pyramid[-1] is level
+    assert level.pixels.dtype == np.float32
+    pyramid.clear()
+    assert not pyramid.is_computed(2)
+
+
+def test_image_pyramid_object_landmarks():
+    from menpo.image import ImagePyramid
+    lenna = menpo.io.import_builtin_asset.lenna_png()
+    pyramid = ImagePyramid(lenna, n_levels=3)
+    lms = lenna.landmarks['LJSON']
+    assert_allclose(pyramid[2].landmarks['LJSON'].points,
+                    lms.points / 4)
+    assert_allclose(pyramid.to_level(lms, 2).points, lms.points / 4)
+    assert_allclose(pyramid.to_level(pyramid.to_level(lms, 2), 0,
+                                     from_level=2).points, lms.points)
+
+
+def test_image_pyramid_object_non_integer_downscale():
+    from menpo.image import ImagePyramid
+    lenna = menpo.io.import_builtin_asset.lenna_png()
+    pyramid = ImagePyramid(lenna, n_levels=2, downscale=1.5)
+    assert not pyramid.has_integer_downscale
+    expected = list(lenna.gaussian_pyramid(n_levels=2, downscale=1.5))[1]
+    assert pyramid[1].shape == expected.shape
+    assert_allclose(pyramid.to_level(lenna.landmarks['LJSON'], 1).points,
+                    expected.landmarks['LJSON'].points)
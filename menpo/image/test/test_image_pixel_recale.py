@@ -48,3 +48,12 @@ def test_rescale_pixels_only_masked():
     assert img_rescaled.pixels[0, 0, 0] == 0
     assert img_rescaled.pixels[0, 1, 1] == 100
     assert np.all(img_rescaled.mask.pixels == img.mask.pixels)
+
+
+def test_normalize_pixels_range_dtype():
+    from menpo.image.base import normalize_pixels_range
+    pixels = np.array([0, 51, 255], dtype=np.uint8)
+    normalized = normalize_pixels_range(pixels, dtype=np.float32)
+    assert normalized.dtype == np.float32
+    assert np.allclose(normalized, [0, 0.2, 1])
+    assert normalize_pixels_range(pixels).dtype == np.float64
@@ -1,6 +1,7 @@
 import numpy as np
 import menpo
 from pytest import raises
+from mock import patch
 from numpy.testing import assert_allclose, assert_almost_equal
 from menpo.image import BooleanImage, Image, MaskedImage, OutOfMaskSampleError
 from menpo.shape import PointCloud, bounding_box
@@ -344,3 +345,94 @@ def test_maskedimage_retain_shape():
     rotated_img = image.rotate_ccw_about_centre(theta=77, retain_shape=True)
     assert(image.shape == rotated_img.shape)
     assert(type(rotated_img) == MaskedImage)
+
+
+def test_sample_multichannel_matches_scipy():
+    from menpo.image.interpolation import (multichannel_interpolation,
+                                           scipy_interpolation)
+    pixels = np.random.rand(5, 20, 30)
+    points = np.random.uniform(-5, 35, size=(100, 2))
+    # include points just beyond the last row and column, whose upper
+    # neighbour lies outside of the image
+    points = np.vstack([points, [[19.3, 29.7], [19.8, 5.5], [2.5, 29.2]]])
+    # the natively sampled orders and modes
+    for order in (0, 1):
+        for mode in ('constant', 'nearest', 'mirror', 'wrap'):
+            assert_allclose(
+                multichannel_interpolation(pixels, points, order=order,
+                                           mode=mode, cval=0.5),
+                scipy_interpolation(pixels, points, order=order, mode=mode,
+                                    cval=0.5))
+
+
+def test_sample_multichannel_falls_back_to_scipy():
+    from menpo.image.interpolation import (multichannel_interpolation,
+                                           scipy_interpolation)
+    pixels = np.random.rand(2, 20, 30)
+    points = np.random.uniform(0, 19, size=(50, 2))
+    for order, mode in ((3, 'constant'), (3, 'nearest'), (1, 'reflect')):
+        assert_allclose(
+            multichannel_interpolation(pixels, points, order=order,
+                                       mode=mode),
+            scipy_interpolation(pixels, points, order=order, mode=mode))
+
+
+def test_sample_multichannel_preserves_dtype():
+    from menpo.image.interpolation import (multichannel_interpolation,
+                                           scipy_interpolation)
+    points = np.random.uniform(0, 19, size=(50, 2))
+    for dtype in (np.float32, np.uint8):
+        pixels = (np.random.rand(3, 20, 20) * 255).astype(dtype)
+        sampled = multichannel_interpolation(pixels, points)
+        assert sampled.dtype == dtype
+        assert_allclose(sampled, scipy_interpolation(pixels, points),
+                        atol=1)
+
+
+def test_cython_interpolation_threads_match_single():
+    from menpo.image.interpolation import cython_interpolation
+    pixels = np.random.rand(3, 60, 80)
+    t = Rotation.init_from_2d_ccw_angle(30).compose_before(UniformScale(1.5,
+                                                                        2))
+    single = cython_interpolation(pixels, (90, 120), t, n_workers=1)
+    threaded = cython_interpolation(pixels, (90, 120), t, n_workers=4)
+    assert_allclose(single, threaded)
+
+
+def test_cython_interpolation_reuses_pool():
+    from menpo.image import interpolation
+    pixels = np.random.rand(1, 60, 80)
+    t = UniformScale(1.5, 2)
+    interpolation.cython_interpolation(pixels, (90, 120), t, n_workers=2)
+    pool = interpolation._warp_pool
+    interpolation.cython_interpolation(pixels, (90, 120), t, n_workers=2)
+    assert pool is not None
+    assert interpolation._warp_pool is pool
+
+
+def test_cython_interpolation_single_threaded_in_worker_thread():
+    import threading
+    from menpo.image import interpolation
+    pixels = np.random.rand(3, 300, 300)
+    t = UniformScale(2, 2)
+    with patch('menpo.image.interpolation._get_warp_pool') as get_pool:
+        thread = threading.Thread(target=interpolation.cython_interpolation,
+                                  args=(pixels, (600, 600), t))
+        thread.start()
+        thread.join()
+    assert not get_pool.called
+
+
+def test_cython_interpolation_preserves_dtype():
+    from menpo.image.interpolation import cython_interpolation
+    t = UniformScale(0.5, 2)
+    for dtype in (np.float32, np.uint8, np.bool):
+        pixels = (np.random.rand(2, 20, 20) > 0.5).astype(dtype)
+        warped = cython_interpolation(pixels, (40, 40), t, order=0)
+        assert warped.dtype == dtype
+        assert warped.shape == (2, 1600)
+
+
+def test_rescale_float32_image_stays_float32():
+    image = Image(np.random.rand(3, 20, 30).astype(np.float32))
+    assert image.rescale(1.5).pixels.dtype == np.float32
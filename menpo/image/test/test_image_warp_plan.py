@@ -0,0 +1,117 @@
+import numpy as np
+from numpy.testing import assert_allclose
+from pytest import raises
+
+from menpo.image import BooleanImage, Image, MaskedImage, WarpPlan
+from menpo.shape import PointCloud
+from menpo.transform import Affine, PiecewiseAffine
+
+
+image = Image(np.random.rand(3, 40, 50))
+affine = Affine.init_from_2d_shear(10, 5).compose_before(
+    Affine.init_identity(2).from_vector(np.array([0, 0, 0, 0, 5, 3])))
+template_mask = BooleanImage.init_blank((25, 30))
+template_mask.pixels[0, :5, :5] = False
+
+
+def test_warp_plan_matches_warp_to_mask():
+    for order in (0, 1, 2, 3):
+        plan = WarpPlan(template_mask, affine, order=order)
+        expected = image.warp_to_mask(template_mask, affine, order=order)
+        warped = plan.apply(image)
+        assert type(warped) == MaskedImage
+        assert_allclose(warped.pixels, expected.pixels)
+
+
+def test_warp_plan_matches_warp_to_shape():
+    plan = WarpPlan((25, 30), affine, mode='nearest')
+    expected = image.warp_to_shape((25, 30), affine, mode='nearest')
+    assert_allclose(plan.apply(image).pixels, expected.pixels)
+
+
+def test_warp_plan_reused_across_images():
+    plan = WarpPlan(template_mask, affine)
+    other = Image(np.random.rand(3, 40, 50))
+    assert_allclose(plan.apply(other).pixels,
+                    other.warp_to_mask(template_mask, affine).pixels)
+
+
+def test_warp_plan_masked_image_to_shape():
+    masked = MaskedImage(image.pixels)
+    plan = WarpPlan((25, 30), affine)
+    expected = masked.warp_to_shape((25, 30), affine)
+    warped = plan.apply(masked)
+    assert_allclose(warped.pixels, expected.pixels)
+    assert np.all(warped.mask.pixels == expected.mask.pixels)
+
+
+def test_warp_plan_pwa_update_target():
+    src = PointCloud(np.array([[0., 0.], [0., 29.], [24., 0.], [24., 29.]]))
+    tgt = PointCloud(src.points + np.array([5., 4.]))
+    pwa = PiecewiseAffine(src, tgt)
+    plan = WarpPlan((25, 30), pwa)
+    new_tgt = PointCloud(src.points * 1.2 + 2.)
+    plan.update_target(new_tgt)
+    expected = image.warp_to_shape((25, 30), PiecewiseAffine(src, new_tgt))
+    assert_allclose(plan.apply(image).pixels, expected.pixels)
+
+
+def test_warp_plan_unsupported_order():
+    with raises(ValueError):
+        WarpPlan(template_mask, affine, order=6)
+
+
+def test_warp_images_matches_warp_to_mask():
+    from menpo.image import warp_images
+    images = [Image(np.random.rand(3, 40, 50)) for _ in range(4)]
+    transforms = [affine] * 4
+    warped = warp_images(images, template_mask, transforms, n_workers=2)
+    assert warped.shape == (4, 3, template_mask.n_true())
+    for i, image in enumerate(images):
+        expected = image.warp_to_mask(template_mask, affine).as_vector()
+        assert_allclose(warped[i].ravel(), expected)
+
+
+def test_warp_images_mmap(tmpdir):
+    from menpo.image import warp_images
+    images = [Image(np.random.rand(2, 40, 50)) for _ in range(3)]
+    path = str(tmpdir.join('warped.npy'))
+    warped = warp_images(images, template_mask, [affine] * 3,
+                         mmap_path=path)
+    assert isinstance(warped, np.memmap)
+    assert_allclose(np.load(path, mmap_mode='r'), warped)
+
+
+def test_warp_images_wrong_number_of_transforms():
+    from menpo.image import warp_images
+    with raises(ValueError):
+        warp_images([image, image], template_mask, [affine])
+
+
+def test_warp_images_to_pca_model():
+    from menpo.image import warp_images
+    from menpo.model import PCAModel
+    images = [Image(np.random.rand(1, 40, 50)) for _ in range(5)]
+    warped = warp_images(images, template_mask, [affine] * 5)
+    template = MaskedImage.init_blank(template_mask.shape, n_channels=1,
+                                      mask=template_mask)
+    original = warped.copy()
+    model = PCAModel.init_from_data_matrix(warped, template)
+    assert model.n_samples == 5
+    assert model.mean().n_true_pixels() == template_mask.n_true()
+    # the warped pixels are not centred in place
+    assert_allclose(warped, original)
+
+
+def test_warp_images_uint8_to_pca_model():
+    from menpo.image import warp_images
+    from menpo.model import PCAModel
+    images = [Image((np.random.rand(1, 40, 50) * 255).astype(np.uint8))
+              for _ in range(5)]
+    warped = warp_images(images, template_mask, [affine] * 5)
+    assert warped.dtype == np.uint8
+    template = MaskedImage.init_blank(template_mask.shape, n_channels=1,
+                                      mask=template_mask)
+    model = PCAModel.init_from_data_matrix(warped, template, inplace=True)
+    assert_allclose(model.mean().as_vector(),
+                    warped.reshape([5, -1]).mean(axis=0))
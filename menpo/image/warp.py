@@ -0,0 +1,453 @@
+from functools import partial
+
+import numpy as np
+
+from menpo.transform.piecewiseaffine.base import AbstractPWA
+from .base import indices_for_image_of_shape
+from .interpolation import multichannel_interpolation, scipy_interpolation
+
+
+class WarpPlan(object):
+    r"""
+    A precomputed warp of images into a fixed template. Building the plan
+    computes the template points, applies the transform to them and computes
+    the integer neighbour indices and interpolation weights of every source
+    point once. Applying the plan to an image is then a single gather and
+    weighted sum over all of the channels, which makes it much cheaper than
+    repeatedly calling :meth:`Image.warp_to_mask` or
+    :meth:`Image.warp_to_shape` with the same template and transform (for
+    instance inside a fitting loop).
+
+    The weights depend on the shape of the image being warped, and are
+    recomputed (and cached) whenever an image of a new shape is provided.
+    Weights are only precomputed for orders ``0`` and ``1`` and the
+    ``constant``, ``nearest``, ``mirror`` and ``wrap`` modes - for any other
+    order or mode only the source points are precomputed, and the images are
+    sampled with ``scipy.ndimage.map_coordinates``. If the target of the
+    transform changes, call :meth:`update_target`. For
+    piecewise affine transforms only the per-triangle affine parameters are
+    refreshed, as the triangle containment and barycentric coordinates of the
+    template points are fixed.
+
+    The results match :meth:`Image.warp_to_mask` and
+    :meth:`Image.warp_to_shape` for 2D images.
+
+    Parameters
+    ----------
+    template : :map:`BooleanImage` or `tuple`
+        Either the mask that defines the shape of the result and which pixels
+        should be sampled (as in :meth:`Image.warp_to_mask`), or the shape of
+        the result (as in :meth:`Image.warp_to_shape`).
+    transform : :map:`Transform`
+        Transform **from the template space back to the image**. Defines, for
+        each pixel location on the template, which pixel location should be
+        sampled from on the image.
+    order : `int`, optional
+        The order of interpolation. The order has to be in the range [0,5]
+
+        ========= =====================
+        Order     Interpolation
+        ========= =====================
+        0         Nearest-neighbor
+        1         Bi-linear *(default)*
+        2         Bi-quadratic
+        3         Bi-cubic
+        4         Bi-quartic
+        5         Bi-quintic
+        ========= =====================
+
+    mode : ``{constant, nearest, reflect, mirror, wrap}``, optional
+        Points outside the boundaries of the input are filled according
+        to the given mode.
+    cval : `float`, optional
+        Used in conjunction with mode ``constant``, the value outside
+        the image boundaries.
+    batch_size : `int` or ``None``, optional
+        How many template points should be warped at a time by the transform.
+        If ``None``, all points are warped at once.
+
+    Raises
+    ------
+    ValueError
+        If the order is not in the range [0,5], or the template is not 2D.
+    """
+    def __init__(self, template, transform, order=1, mode='constant',
+                 cval=0.0, batch_size=None):
+        from .boolean import BooleanImage
+        if order not in range(6):
+            raise ValueError('order must be in the range [0,5] ({} '
+                             'provided)'.format(order))
+        if isinstance(template, BooleanImage):
+            self.template_mask = template
+            self.template_shape = template.shape
+            self.template_points = template.true_indices()
+        else:
+            self.template_mask = None
+            self.template_shape = tuple(int(s) for s in template)
+            self.template_points = indices_for_image_of_shape(
+                self.template_shape)
+        if len(self.template_shape) != 2:
+            raise ValueError('WarpPlan only supports 2D templates')
+        self.transform = transform
+        self.order = order
+        self.mode = mode
+        self.cval = cval
+        self.batch_size = batch_size
+        self._iab = None
+        self._weights_shape, self._weights = None, None
+        self._mask_plan = None
+        self._compute_source_points()
+
+    @property
+    def n_points(self):
+        r"""
+        The number of template points that are sampled.
+
+        :type: `int`
+        """
+        return self.template_points.shape[0]
+
+    def _compute_source_points(self):
+        if isinstance(self.transform, AbstractPWA):
+            # The triangle each template point lies in (and its barycentric
+            # coordinates) only depend on the source of the transform, so
+            # they are found once and reused whenever the target changes
+            if self._iab is None:
+                self._iab = self.transform.index_alpha_beta(
+                    self.template_points)
+            tri_index, alpha, beta = self._iab
+            t = self.transform
+            source_points = (t.ti[tri_index] +
+                             alpha[:, None] * t.tij[tri_index] +
+                             beta[:, None] * t.tik[tri_index])
+        else:
+            source_points = self.transform.apply(self.template_points,
+                                                 batch_size=self.batch_size)
+        self.source_points = np.ascontiguousarray(source_points,
+                                                  dtype=np.float64)
+        # Any cached weights are no longer valid
+        self._weights_shape, self._weights = None, None
+        if self._mask_plan is not None:
+            self._mask_plan.source_points = self.source_points
+            self._mask_plan._weights_shape = None
+            self._mask_plan._weights = None
+
+    def update_target(self, new_target):
+        r"""
+        Updates the target of the (alignment) transform of this plan and
+        recomputes the source points. For piecewise affine transforms only the
+        per-triangle affine parameters are refreshed.
+
+        Parameters
+        ----------
+        new_target : :map:`PointCloud`
+            The new target of the transform.
+        """
+        self.transform.set_target(new_target)
+        self._compute_source_points()
+
+    @property
+    def has_weights(self):
+        r"""
+        Whether the interpolation weights are precomputed for this plan's
+        order and mode (rather than only the source points).
+
+        :type: `bool`
+        """
+        from ._sample import MODES
+        return self.order in (0, 1) and self.mode in MODES
+
+    def weights(self, shape):
+        r"""
+        The flat neighbour indices, interpolation weights and out of bounds
+        mask of the source points for an image of the given shape.
+
+        Parameters
+        ----------
+        shape : `tuple`
+            The (spatial) shape of the image that will be sampled.
+
+        Returns
+        -------
+        indices : ``(n_points, n_taps)`` `int64 ndarray`
+            The flat index of each neighbour of each source point.
+        weights : ``(n_points, n_taps)`` `float64 ndarray`
+            The weight of each neighbour of each source point.
+        outside : ``(n_points,)`` `bool ndarray`
+            ``True`` for source points that lie outside of the image for the
+            constant mode.
+
+        Raises
+        ------
+        ValueError
+            If the weights are not supported for this plan's order and mode.
+        """
+        from ._sample import interpolation_weights, MODES
+        if not self.has_weights:
+            raise ValueError('Interpolation weights are only supported for '
+                             'orders 0 and 1 and the modes {}'.format(
+                                 sorted(MODES)))
+        shape = tuple(shape)
+        if self._weights_shape != shape:
+            n_rows, n_cols = shape
+            self._weights = interpolation_weights(
+                self.source_points, n_rows, n_cols, order=self.order,
+                mode=MODES[self.mode])
+            self._weights_shape = shape
+        return self._weights
+
+    def sample(self, pixels):
+        r"""
+        Samples every channel of the given pixels at the source points of
+        this plan.
+
+        Parameters
+        ----------
+        pixels : ``(n_channels, M, N)`` `ndarray`
+            The pixels to sample.
+
+        Returns
+        -------
+        sampled : ``(n_channels, n_points)`` `ndarray`
+            The sampled values, of the same dtype as ``pixels``.
+        """
+        if pixels.ndim != 3:
+            raise ValueError('WarpPlan only supports 2D images')
+        if not self.has_weights:
+            return scipy_interpolation(pixels, self.source_points,
+                                       order=self.order, mode=self.mode,
+                                       cval=self.cval)
+        indices, weights, outside = self.weights(pixels.shape[1:])
+        flat = pixels.reshape([pixels.shape[0], -1])
+        if self.order == 0:
+            sampled = flat[:, indices[:, 0]]
+        else:
+            sampled = flat[:, indices[:, 0]] * weights[:, 0]
+            for k in range(1, indices.shape[1]):
+                sampled += flat[:, indices[:, k]] * weights[:, k]
+            if pixels.dtype == np.uint8:
+                # Rounded and clipped, as scipy.ndimage does for integer
+                # outputs
+                sampled = np.clip(np.floor(sampled + 0.5), 0, 255)
+            sampled = sampled.astype(pixels.dtype, copy=False)
+        if np.any(outside):
+            sampled[:, outside] = self.cval
+        return sampled
+
+    def apply(self, image, warp_landmarks=False):
+        r"""
+        Warps the given image with this plan.
+
+        Parameters
+        ----------
+        image : :map:`Image`
+            The 2D image to warp. Its type decides the type of the result,
+            exactly as for :meth:`Image.warp_to_mask` and
+            :meth:`Image.warp_to_shape`.
+        warp_landmarks : `bool`, optional
+            If ``True``, result will have the same landmark dictionary
+            as ``image``, but with each landmark updated to the warped
+            position.
+
+        Returns
+        -------
+        warped_image : :map:`Image`
+            A copy of the image, warped.
+        """
+        from .base import Image
+        from .boolean import BooleanImage
+        from .masked import MaskedImage
+        if image.n_dims != 2:
+            raise ValueError('WarpPlan only supports 2D images')
+        sampled = self.sample(image.pixels)
+        if np.issubdtype(sampled.dtype, np.floating):
+            # set any nan values to 0
+            sampled[np.isnan(sampled)] = 0
+
+        if self.template_mask is not None:
+            warped_image = image._build_warp_to_mask(self.template_mask,
+                                                     sampled)
+            if isinstance(image, MaskedImage):
+                warped_image.mask = self.template_mask
+        else:
+            warped_pixels = sampled.reshape(
+                (image.n_channels,) + self.template_shape)
+            if isinstance(image, BooleanImage):
+                warped_image = BooleanImage(warped_pixels[0], copy=False)
+            else:
+                warped_image = Image(warped_pixels, copy=False)
+            if isinstance(image, MaskedImage):
+                warped_image = warped_image.as_masked(
+                    mask=self._nearest_plan().apply(image.mask), copy=False)
+
+        if warp_landmarks and image.has_landmarks:
+            warped_image.landmarks = image.landmarks
+            self.transform.pseudoinverse()._apply_inplace(
+                warped_image.landmarks)
+        if hasattr(image, 'path'):
+            warped_image.path = image.path
+        return warped_image
+
+    def _nearest_plan(self):
+        # A plan sharing our source points that samples with order 0, used
+        # for warping the masks of masked images
+        if self._mask_plan is None:
+            plan = WarpPlan.__new__(WarpPlan)
+            plan.__dict__.update(self.__dict__)
+            plan.order, plan.cval = 0, False
+            plan._weights_shape, plan._weights = None, None
+            plan._mask_plan = None
+            self._mask_plan = plan
+        return self._mask_plan
+
+
+def warp_images(images, template_mask, transforms, order=1, mode='constant',
+                cval=0.0, dtype=None, out=None, mmap_path=None, n_workers=None,
+                read_ahead=None, batch_size=None, verbose=False):
+    r"""
+    Warp many images into the same reference mask, writing the sampled
+    pixels straight into a single ``(n_images, n_channels, n_true_pixels)``
+    array. No intermediate :map:`MaskedImage` is built and the true indices
+    of the mask are only computed once. Images are loaded (if ``images`` is
+    a :map:`LazyList`) and warped in ``n_workers`` threads.
+
+    Row ``i`` of the result, reshaped to ``(n_images, -1)``, is exactly
+    ``images[i].warp_to_mask(template_mask, transforms[i]).as_vector()``, and
+    so the result can be handed straight to :map:`PCAVectorModel`, or to
+    :meth:`PCAModel.init_from_data_matrix` with a template image on
+    ``template_mask``. Note that building a model with ``inplace=True``
+    centres the result in place - including the file at ``mmap_path``.
+
+    Parameters
+    ----------
+    images : `list` or :map:`LazyList` of :map:`Image`
+        The 2D images to warp. They must all have the same number of
+        channels.
+    template_mask : :map:`BooleanImage`
+        Defines which pixels of the reference frame are sampled.
+    transforms : `list` of :map:`Transform`
+        One transform per image, **from the template space back to the
+        image**.
+    order : `int`, optional
+        The order of interpolation. The order has to be in the range [0,5].
+        See :meth:`Image.warp_to_mask` for more information.
+    mode : ``{constant, nearest, reflect, wrap}``, optional
+        Points outside the boundaries of the input are filled according
+        to the given mode.
+    cval : `float`, optional
+        Used in conjunction with mode ``constant``, the value outside
+        the image boundaries.
+    dtype : `numpy.dtype`, optional
+        The dtype of the result. If ``None``, the dtype of the pixels of the
+        first image is used. Ignored if ``out`` is provided.
+    out : ``(n_images, n_channels, n_true_pixels)`` `ndarray`, optional
+        If provided, the warped pixels are written into ``out`` rather than
+        into a newly allocated array.
+    mmap_path : `str` or `pathlib.Path`, optional
+        If provided (and ``out`` is not), the result is a memory-mapped
+        ``.npy`` file created at this path, so that it does not need to fit
+        in memory. It can be reopened with ``np.load(mmap_path,
+        mmap_mode='r')``.
+    n_workers : `int`, optional
+        The number of threads that images are warped in. If ``None``, the
+        number of CPUs on the machine is used.
+    read_ahead : `int`, optional
+        The maximum number of images that are loaded (or being warped) at
+        once. If ``None``, twice the number of workers is used.
+    batch_size : `int` or ``None``, optional
+        How many template points should be warped at a time by each
+        transform. If ``None``, all points are warped at once.
+    verbose : `bool`, optional
+        If ``True``, print the progress of the warping.
+
+    Returns
+    -------
+    warped : ``(n_images, n_channels, n_true_pixels)`` `ndarray`
+        The warped pixels of every image. If ``out`` was provided, this is
+        ``out``.
+
+    Raises
+    ------
+    ValueError
+        If the number of images and transforms differ, if ``out`` has the
+        wrong shape, or if the images do not all have the same number of
+        channels.
+
+    Examples
+    --------
+    Build an appearance model without building a warped image per sample
+
+    >>> from menpo.image import MaskedImage, warp_images
+    >>> from menpo.model import PCAModel
+    >>> warped = warp_images(images, template_mask, transforms, n_workers=8)
+    >>> template = MaskedImage.init_blank(template_mask.shape,
+    >>>                                   n_channels=warped.shape[1],
+    >>>                                   mask=template_mask)
+    >>> model = PCAModel.init_from_data_matrix(warped, template)
+    """
+    from menpo.base import LazyList
+    from menpo.visualize import print_progress
+
+    n_images = len(images)
+    if len(transforms) != n_images:
+        raise ValueError('There must be one transform per image ({} images '
+                         'and {} transforms provided)'.format(
+                             n_images, len(transforms)))
+    if n_images == 0:
+        raise ValueError('At least one image must be provided')
+    if not isinstance(images, LazyList):
+        images = LazyList.init_from_iterable(images)
+    template_points = template_mask.true_indices()
+
+    # The first image decides the shape (and dtype) of the result
+    first = _sample_for_warp(template_points, transforms[0], order, mode,
+                             cval, batch_size, images[0])
+    shape = (n_images,) + first.shape
+    if out is None:
+        dtype = first.dtype if dtype is None else dtype
+        if mmap_path is not None:
+            from numpy.lib.format import open_memmap
+            out = open_memmap(str(mmap_path), mode='w+', dtype=dtype,
+                              shape=shape)
+        else:
+            out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape:
+        raise ValueError('out must have shape {} ({} provided)'.format(
+            shape, out.shape))
+    out[0] = first
+
+    warp_f = partial(_warp_one_into, template_points, out, order, mode, cval,
+                     batch_size)
+    rest = images[1:].map([partial(warp_f, i, transforms[i])
+                           for i in range(1, n_images)])
+    done = rest.prefetch(n_workers=n_workers, read_ahead=read_ahead)
+    if verbose:
+        done = print_progress(done, prefix='Warping images',
+                              n_items=n_images - 1)
+    for _ in done:
+        pass
+    return out
+
+
+def _sample_for_warp(template_points, transform, order, mode, cval,
+                     batch_size, image):
+    if image.n_dims != 2:
+        raise ValueError('Only 2D images can be warped with warp_images')
+    points_to_sample = transform.apply(template_points, batch_size=batch_size)
+    sampled = multichannel_interpolation(image.pixels, points_to_sample,
+                                         order=order, mode=mode, cval=cval)
+    if np.issubdtype(sampled.dtype, np.floating):
+        # set any nan values to 0
+        sampled[np.isnan(sampled)] = 0
+    return sampled
+
+
+def _warp_one_into(template_points, out, order, mode, cval, batch_size, i,
+                   transform, image):
+    sampled = _sample_for_warp(template_points, transform, order, mode, cval,
+                               batch_size, image)
+    if sampled.shape != out.shape[1:]:
+        raise ValueError('Image {} has {} channels, but the first image has '
+                         '{}'.format(i, sampled.shape[0], out.shape[1]))
+    out[i] = sampled
+    return i
@@ -0,0 +1,94 @@
+import io
+from functools import partial
+
+from .pickle import (pickle, _IndexedDirectory,
+                     _unpickle_with_persistent_load)
+from ..output.archive import (ARRAYS_FILENAME, CHUNKS_FILENAME,
+                              INDEX_FILENAME, ARCHIVE_VERSION)
+
+
+class PickleArchive(_IndexedDirectory):
+    r"""
+    An archive directory written by
+    :func:`menpo.io.output.archive.pack_archive`. Any object can be unpickled
+    without reading the rest of the archive - only the chunk holding it is
+    decompressed. The out-of-band arrays are memory-mapped, so that unpickling
+    an object only creates views into them.
+
+    Parameters
+    ----------
+    path : `Path`
+        The archive directory.
+    mmap_mode : ``{'r', 'r+', 'c'}``, optional
+        The mode used to memory-map the arrays, see ``numpy.memmap``. By
+        default the arrays are copy-on-write - the unpickled objects can be
+        modified in memory without altering the files on disk.
+
+    Raises
+    ------
+    ValueError
+        If ``path`` does not contain a complete archive.
+    """
+    _index_filename = INDEX_FILENAME
+    _version = ARCHIVE_VERSION
+    _description = 'pickle archive'
+
+    def _init_from_index(self, index):
+        import numpy as np
+        self._compression = index['compression']
+        self._chunk_offsets = index['chunk_offsets']
+        self._item_offsets = index['item_offsets']
+        self._arrays = self._memmap(ARRAYS_FILENAME, np.uint8)
+        self._chunks = self._memmap(CHUNKS_FILENAME, np.uint8, mode='r')
+        # The last decompressed chunk, so that iterating over the objects
+        # of a chunk only decompresses it once
+        self._last_chunk = (None, None)
+
+    def __len__(self):
+        return len(self._item_offsets)
+
+    def _chunk(self, c):
+        import zlib
+        last_c, data = self._last_chunk
+        if last_c != c:
+            start, end = self._chunk_offsets[c]
+            data = self._chunks[start:end].tobytes()
+            if self._compression == 'zlib':
+                data = zlib.decompress(data)
+            # Swapped in a single assignment, so this is safe across threads
+            self._last_chunk = (c, data)
+        return data
+
+    def _persistent_load(self, loaded, pid):
+        import numpy as np
+        kind, offset, dtype, shape = pid
+        if kind != 'ndarray':
+            raise pickle.UnpicklingError('Unknown persistent id: '
+                                         '{}'.format(pid))
+        # Shared arrays are only stored once - so only map them once
+        if offset not in loaded:
+            dtype = np.dtype(dtype)
+            n_bytes = int(np.prod(shape)) * dtype.itemsize
+            loaded[offset] = self._arrays[offset:offset + n_bytes].view(
+                dtype).reshape(shape)
+        return loaded[offset]
+
+    def item(self, i):
+        r"""
+        Unpickle the object at index ``i``.
+
+        Parameters
+        ----------
+        i : `int`
+            The index of the object.
+
+        Returns
+        -------
+        object : `object`
+            The object, with any out-of-band arrays as views into the
+            memory-mapped buffer.
+        """
+        c, start, end = self._item_offsets[i]
+        return _unpickle_with_persistent_load(
+            io.BytesIO(self._chunk(c)[start:end]),
+            partial(self._persistent_load, {}))
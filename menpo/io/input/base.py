@@ -6,6 +6,8 @@ from functools import partial
 import os
 from pathlib import Path
 import random
+import threading
+from timeit import default_timer
 
 from menpo.base import (menpo_src_dir_path, LazyList, partial_doc,
                         MenpoDeprecationWarning)
@@ -15,7 +17,9 @@ from menpo.visualize import print_progress
 from ..utils import (_norm_path, _possible_extensions_from_filepath,
                      _normalize_extension)
 from .extensions import (image_landmark_types, image_types, pickle_types,
-                         ffmpeg_video_types)
+                         ffmpeg_video_types, image_landmark_points_types)
+from .image import pillow_importer
+from .video import ffmpeg_importer
 
 
 # TODO: Remove once deprecated
@@ -251,6 +255,133 @@ def same_name_video(path, frame_number,
     return merge_all_dicts(lmarks)
 
 
+class LandmarkFileIndex(object):
+    r"""
+    An index of the landmark files in each directory, which provides drop-in
+    replacements for the :func:`same_name` and :func:`same_name_video`
+    landmark resolvers.
+
+    The default resolvers glob the directory of every asset they are asked
+    about. Instead, the first lookup in a directory lists it once and indexes
+    every landmark file by each of its possible stems, so that all further
+    lookups in that directory are a dictionary access. This is used
+    automatically when importing many assets with the default resolvers.
+
+    Note that the index is not refreshed - landmark files that are created
+    in a directory after it was first indexed will not be found.
+
+    Parameters
+    ----------
+    extensions_map : `dict` {`str`: `callable`}, optional
+        The landmark extensions to index. By default, every landmark type
+        that Menpo can import.
+
+    Examples
+    --------
+    ::
+
+        index = menpo.io.input.LandmarkFileIndex()
+        images = menpo.io.import_images('./massive_image_db/*',
+                                        landmark_resolver=index.same_name)
+    """
+
+    def __init__(self, extensions_map=None):
+        if extensions_map is None:
+            extensions_map = image_landmark_types
+        self.extensions_map = extensions_map
+        self._lock = threading.Lock()
+        self._index = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _fingerprint_state(self):
+        # The lock and the index don't change what is resolved - so lists
+        # imported from the same files share their LazyList.cache_to_dir keys
+        return self.extensions_map
+
+    def _index_dir(self, directory):
+        stems_to_paths = {}
+        for name in _list_files(directory):
+            path = directory / name
+            possible_exts = _possible_extensions_from_filepath(path)
+            if not any(ext in self.extensions_map for ext in possible_exts):
+                continue
+            # A glob for 'stem.*' matches every name that starts with
+            # 'stem.' - so register the file under each possible stem
+            i = name.find('.', 1)
+            while i != -1:
+                stems_to_paths.setdefault(name[:i], []).append(path)
+                i = name.find('.', i + 1)
+        for paths in stems_to_paths.values():
+            paths.sort()
+        return stems_to_paths
+
+    def paths(self, directory, stem):
+        r"""
+        The landmark files in ``directory`` matching the glob ``stem.*``.
+
+        Parameters
+        ----------
+        directory : `pathlib.Path`
+            The directory to look in.
+        stem : `str`
+            The stem of the landmark files.
+
+        Returns
+        -------
+        paths : `list` of `pathlib.Path`
+            The sorted paths of the landmark files.
+        """
+        key = str(directory)
+        with self._lock:
+            stems_to_paths = self._index.get(key)
+        if stems_to_paths is None:
+            # List outside of the lock - worst case two threads index the
+            # same directory at once
+            stems_to_paths = self._index_dir(directory)
+            with self._lock:
+                self._index[key] = stems_to_paths
+        return stems_to_paths.get(stem, [])
+
+    def same_name(self, path):
+        r"""
+        Indexed equivalent of :func:`same_name`. Returns all landmarks found
+        to have the same stem as the asset.
+        """
+        return merge_all_dicts([import_landmark_file(p)
+                                for p in self.paths(path.parent, path.stem)])
+
+    def same_name_video(self, path, frame_number):
+        r"""
+        Indexed equivalent of :func:`same_name_video`. Returns all landmarks
+        found to have the same stem as the asset, appended with
+        '_{frame_number}'.
+        """
+        stem = '{}_{}'.format(path.stem, frame_number)
+        return merge_all_dicts([import_landmark_file(p)
+                                for p in self.paths(path.parent, stem)])
+
+
+def _list_files(directory):
+    r"""
+    The names of the files (including symlinks to files) in ``directory``.
+    """
+    try:
+        scandir = os.scandir
+    except AttributeError:
+        # Python < 3.5
+        return [name for name in os.listdir(str(directory))
+                if os.path.isfile(os.path.join(str(directory), name))]
+    return [e.name for e in scandir(str(directory)) if e.is_file()]
+
+
 def resolve_from_paths(names_to_path):
     r"""Landmark Resolver
 
@@ -303,7 +434,7 @@ def resolve_from_paths(names_to_path):
 
 
 def import_image(filepath, landmark_resolver=same_name, normalize=None,
-                 normalise=None):
+                 normalise=None, max_shape=None, scale_hint=None, dtype=None):
     r"""Single image (and associated landmarks) importer.
 
     If an image file is found at `filepath`, returns an :map:`Image` or
@@ -333,6 +464,24 @@ def import_image(filepath, landmark_resolver=same_name, normalize=None,
         useful to save on memory usage if you only wish to view or crop images.
     normalise: `bool`, optional
         Deprecated version of normalize. Please use the normalize arg.
+    max_shape : `tuple` of `int`, optional
+        If not ``None``, the image is decoded at a reduced resolution - the
+        largest power of two reduction that keeps it at least as large as
+        it would be if rescaled to fit within ``max_shape``. Images that
+        already fit are decoded at full resolution. JPEGs are decoded
+        straight to the reduced resolution, which is several times faster
+        and uses much less memory than decoding at full resolution and then
+        rescaling. The landmarks are rescaled to match. Rescale the image
+        afterwards to reach an exact shape.
+    scale_hint : `float`, optional
+        If not ``None``, the image is decoded at a reduced resolution - the
+        largest power of two reduction that keeps it at least ``scale_hint``
+        times its full resolution (see ``max_shape``).
+    dtype : `numpy.dtype`, optional
+        The floating point dtype of normalized pixels. If ``None``,
+        ``float64``. Importing as ``np.float32`` halves the memory of the
+        pixels, and warping, rescaling and feature extraction then all stay
+        in single precision. Ignored if ``normalize`` is ``False``.
 
     Returns
     -------
@@ -340,7 +489,7 @@ def import_image(filepath, landmark_resolver=same_name, normalize=None,
         An instantiated :map:`Image` or subclass thereof or a list of images.
     """
     normalize = _parse_deprecated_normalise(normalise, normalize)
-    kwargs = {'normalize': normalize}
+    kwargs = _image_importer_kwargs(normalize, max_shape, scale_hint, dtype)
     return _import(filepath, image_types,
                    landmark_ext_map=image_landmark_types,
                    landmark_resolver=landmark_resolver,
@@ -348,9 +497,23 @@ def import_image(filepath, landmark_resolver=same_name, normalize=None,
                    importer_kwargs=kwargs)
 
 
+def _image_importer_kwargs(normalize, max_shape, scale_hint, dtype):
+    kwargs = {'normalize': normalize}
+    # Only passed when set, as only some importers support them
+    if max_shape is not None:
+        kwargs['max_shape'] = max_shape
+    if scale_hint is not None:
+        kwargs['scale_hint'] = scale_hint
+    if dtype is not None:
+        kwargs['dtype'] = dtype
+    return kwargs
+
+
 def import_video(filepath, landmark_resolver=same_name_video, normalize=None,
                  normalise=None, importer_method='ffmpeg',
-                 exact_frame_count=True):
+                 exact_frame_count=True, keyframe_index=None,
+                 cache_bytes=None, shape=None, greyscale=False, crop=None,
+                 read_ahead=None):
     r"""Single video (and associated landmarks) importer.
 
     If a video file is found at `filepath`, returns an :map:`LazyList` wrapping
@@ -397,6 +560,32 @@ def import_video(filepath, landmark_resolver=same_name_video, normalize=None,
     exact_frame_count: `bool`, optional
         If ``True``, the import fails if ffprobe is not available
         (reading from ffmpeg's output returns inexact frame count)
+    keyframe_index : `bool` or `pathlib.Path` or `str`, optional
+        If ``True``, the keyframes of the video are found with ffprobe so that
+        random access restarts decoding from the cheapest point rather than
+        decoding every frame in between. If a path, the keyframes are also
+        stored in (and reused from) that file until the video changes.
+    cache_bytes : `int`, optional
+        If not ``None``, the memory budget (in bytes) of an LRU cache of the
+        decoded frames. Combined with ``keyframe_index``, shuffled access to
+        the frames costs roughly one group of pictures of decoding per miss.
+    shape : ``(height, width)`` `tuple`, optional
+        If not ``None``, the frames are scaled to this shape by ffmpeg whilst
+        decoding. This is much cheaper than rescaling the imported frames.
+    greyscale : `bool`, optional
+        If ``True``, the frames are converted to a single greyscale channel by
+        ffmpeg whilst decoding.
+    crop : ``(min_indices, max_indices)`` `tuple`, optional
+        If not ``None``, the frames are cropped by ffmpeg whilst decoding to
+        the pixels from ``min_indices`` (inclusive) to ``max_indices``
+        (exclusive), both ``(y, x)``. The crop is applied before scaling to
+        ``shape``. Any imported landmarks are moved onto the cropped and
+        scaled frames.
+    read_ahead : `int`, optional
+        If not ``None``, whenever the frames are accessed in order (e.g. when
+        iterating over the video) a background thread reads up to
+        ``read_ahead`` frames ahead, so that decoding overlaps with processing
+        the frames.
 
     Returns
     -------
@@ -410,10 +599,35 @@ def import_video(filepath, landmark_resolver=same_name_video, normalize=None,
     >>> video = menpo.io.import_video('video.avi')
     >>> # Lazily load the 100th frame without reading the entire video
     >>> frame100 = video[100]
+
+    Randomly access the frames of a video, keeping up to 1GB of decoded frames:
+
+    >>> video = menpo.io.import_video('video.avi', keyframe_index=True,
+    >>>                               cache_bytes=2 ** 30)
+    >>> frames = [video[i] for i in np.random.permutation(len(video))]
+
+    Import the frames as 64x64 greyscale images, cropped to a region of
+    interest by ffmpeg:
+
+    >>> video = menpo.io.import_video('video.avi', crop=((0, 280), (720, 1000)),
+    >>>                               shape=(64, 64), greyscale=True)
     """
     normalize = _parse_deprecated_normalise(normalise, normalize)
 
     kwargs = {'normalize': normalize, 'exact_frame_count': exact_frame_count}
+    # Only passed when set so that custom importers need not support them
+    if keyframe_index is not None:
+        kwargs['keyframe_index'] = keyframe_index
+    if cache_bytes is not None:
+        kwargs['cache_bytes'] = cache_bytes
+    if shape is not None:
+        kwargs['shape'] = shape
+    if greyscale:
+        kwargs['greyscale'] = greyscale
+    if crop is not None:
+        kwargs['crop'] = crop
+    if read_ahead is not None:
+        kwargs['read_ahead'] = read_ahead
 
     video_importer_methods = {'ffmpeg': ffmpeg_video_types}
     if importer_method not in video_importer_methods:
@@ -485,7 +699,8 @@ def import_pickle(filepath, **kwargs):
 
 
 def import_pickles(pattern, max_pickles=None, shuffle=False,
-                   as_generator=False, verbose=False, **kwargs):
+                   as_generator=False, verbose=False, n_workers=None,
+                   manifest=None, **kwargs):
     r"""Multiple pickle importer.
 
     Menpo unambiguously uses ``.pkl`` as it's choice of extension for Pickle
@@ -519,6 +734,18 @@ def import_pickles(pattern, max_pickles=None, shuffle=False,
     verbose : `bool`, optional
         If ``True`` progress of the importing will be dynamically reported with
         a progress bar.
+    n_workers : `int`, optional
+        If not ``None``, the pickles are imported ahead of the consumer by
+        ``n_workers`` threads, which requires ``as_generator`` to be
+        ``True``. The pickles are still yielded in order. If ``verbose`` is
+        also ``True``, the time spent importing is reported at the end.
+    manifest : `pathlib.Path` or `str`, optional
+        If not ``None``, the path of a manifest file that caches the sorted
+        list of pickles found by the glob. If neither the pattern nor the
+        modification times of the searched directories have changed since
+        the manifest was written, the directories are not walked again.
+        Otherwise the manifest is (re)written.
+        ``shuffle`` and ``max_pickles`` are applied to the cached list.
 
     Returns
     -------
@@ -531,19 +758,26 @@ def import_pickles(pattern, max_pickles=None, shuffle=False,
     ------
     ValueError
         If no pickles are found at the provided glob.
+    ValueError
+        If ``n_workers`` is not ``None`` but ``as_generator`` is ``False`` -
+        call ``prefetch`` on the returned :map:`LazyList` instead.
     """
     return _import_glob_lazy_list(
         pattern, pickle_types,
         max_assets=max_pickles, shuffle=shuffle,
         as_generator=as_generator,
         verbose=verbose,
-        importer_kwargs=kwargs
+        importer_kwargs=kwargs,
+        n_workers=n_workers,
+        manifest=manifest
     )
 
 
 def import_images(pattern, max_images=None, shuffle=False,
                   landmark_resolver=same_name, normalize=None,
-                  normalise=None, as_generator=False, verbose=False):
+                  normalise=None, as_generator=False, verbose=False,
+                  n_workers=None, manifest=None, max_shape=None,
+                  scale_hint=None, dtype=None):
     r"""Multiple image (and associated landmarks) importer.
 
     For each image found creates an importer than returns a :map:`Image` or
@@ -593,6 +827,41 @@ def import_images(pattern, max_images=None, shuffle=False,
     verbose : `bool`, optional
         If ``True`` progress of the importing will be dynamically reported with
         a progress bar.
+    n_workers : `int`, optional
+        If not ``None``, the images are imported ahead of the consumer by
+        ``n_workers`` threads (see :meth:`LazyList.prefetch`), which
+        requires ``as_generator`` to be ``True``. Reading and decoding an
+        image and importing its landmarks are separate tasks, so they
+        overlap with each other. The images are still yielded in order, and
+        any error is raised when the failing image is reached. If
+        ``verbose`` is also ``True``, the time spent in each stage is
+        reported at the end. To prefetch from the returned :map:`LazyList`
+        instead, call its ``prefetch`` method.
+    manifest : `pathlib.Path` or `str`, optional
+        If not ``None``, the path of a manifest file that caches the sorted
+        list of images found by the glob. If neither the pattern nor the
+        modification times of the searched directories have changed since
+        the manifest was written, the directories are not walked again.
+        Otherwise the manifest is (re)written.
+        ``shuffle`` and ``max_images`` are applied to the cached list.
+    max_shape : `tuple` of `int`, optional
+        If not ``None``, each image is decoded at a reduced resolution - the
+        largest power of two reduction that keeps the image at least as
+        large as it would be if rescaled to fit within ``max_shape``. Images
+        that already fit are decoded at full resolution. JPEGs are decoded
+        straight to the reduced resolution, which is several times faster
+        and uses much less memory than decoding at full resolution and then
+        rescaling. The landmarks are rescaled to match. Rescale the images
+        afterwards to reach an exact shape.
+    scale_hint : `float`, optional
+        If not ``None``, each image is decoded at a reduced resolution - the
+        largest power of two reduction that keeps the image at least
+        ``scale_hint`` times its full resolution (see ``max_shape``).
+    dtype : `numpy.dtype`, optional
+        The floating point dtype of normalized pixels. If ``None``,
+        ``float64``. Importing as ``np.float32`` halves the memory of the
+        pixels, and warping, rescaling and feature extraction then all stay
+        in single precision. Ignored if ``normalize`` is ``False``.
 
     Returns
     -------
@@ -604,6 +873,9 @@ def import_images(pattern, max_images=None, shuffle=False,
     ------
     ValueError
         If no images are found at the provided glob.
+    ValueError
+        If ``n_workers`` is not ``None`` but ``as_generator`` is ``False`` -
+        call ``prefetch`` on the returned :map:`LazyList` instead.
 
     Examples
     --------
@@ -616,7 +888,7 @@ def import_images(pattern, max_images=None, shuffle=False,
     """
     normalize = _parse_deprecated_normalise(normalise, normalize)
 
-    kwargs = {'normalize': normalize}
+    kwargs = _image_importer_kwargs(normalize, max_shape, scale_hint, dtype)
     return _import_glob_lazy_list(
         pattern, image_types,
         max_assets=max_images, shuffle=shuffle,
@@ -625,14 +897,17 @@ def import_images(pattern, max_images=None, shuffle=False,
         landmark_attach_func=_import_object_attach_landmarks,
         as_generator=as_generator,
         verbose=verbose,
-        importer_kwargs=kwargs
+        importer_kwargs=kwargs,
+        n_workers=n_workers,
+        manifest=manifest
     )
 
 
 def import_videos(pattern, max_videos=None, shuffle=False,
                   landmark_resolver=same_name_video, normalize=None,
                   normalise=None, importer_method='ffmpeg',
-                  exact_frame_count=True, as_generator=False, verbose=False):
+                  exact_frame_count=True, as_generator=False, verbose=False,
+                  manifest=None, n_workers=None, read_ahead=None):
     r"""Multiple video (and associated landmarks) importer.
 
     For each video found yields a :map:`LazyList`. By default, landmark files
@@ -698,6 +973,24 @@ def import_videos(pattern, max_videos=None, shuffle=False,
     verbose : `bool`, optional
         If ``True`` progress of the importing will be dynamically reported with
         a progress bar.
+    manifest : `pathlib.Path` or `str`, optional
+        If not ``None``, the path of a manifest file that caches the sorted
+        list of videos found by the glob. If neither the pattern nor the
+        modification times of the searched directories have changed since
+        the manifest was written, the directories are not walked again.
+        Otherwise the manifest is (re)written.
+        ``shuffle`` and ``max_videos`` are applied to the cached list.
+    n_workers : `int`, optional
+        If not ``None``, the videos are opened (which, with
+        ``exact_frame_count``, decodes them to count their frames) ahead of
+        the consumer by ``n_workers`` threads, which requires
+        ``as_generator`` to be ``True``. The videos are still yielded in
+        order.
+    read_ahead : `int`, optional
+        If not ``None``, the frames of each video are read ahead in a
+        background thread whenever they are accessed in order, see
+        :map:`import_video`. The number of threads reading frames at once is
+        limited to the number of CPUs, however many videos are being read.
 
     Returns
     -------
@@ -709,6 +1002,9 @@ def import_videos(pattern, max_videos=None, shuffle=False,
     ------
     ValueError
         If no videos are found at the provided glob.
+    ValueError
+        If ``n_workers`` is not ``None`` but ``as_generator`` is ``False`` -
+        call ``prefetch`` on the returned :map:`LazyList` instead.
 
     Examples
     --------
@@ -725,6 +1021,8 @@ def import_videos(pattern, max_videos=None, shuffle=False,
     normalize = _parse_deprecated_normalise(normalise, normalize)
 
     kwargs = {'normalize': normalize, 'exact_frame_count':exact_frame_count}
+    if read_ahead is not None:
+        kwargs['read_ahead'] = read_ahead
     video_importer_methods = {'ffmpeg': ffmpeg_video_types}
     if importer_method not in video_importer_methods:
         raise ValueError('Unsupported importer method requested. Valid values '
@@ -738,12 +1036,15 @@ def import_videos(pattern, max_videos=None, shuffle=False,
         landmark_attach_func=_import_lazylist_attach_landmarks,
         as_generator=as_generator,
         verbose=verbose,
-        importer_kwargs=kwargs
+        importer_kwargs=kwargs,
+        manifest=manifest,
+        n_workers=n_workers
     )
 
 
 def import_landmark_files(pattern, max_landmarks=None, shuffle=False,
-                          as_generator=False, verbose=False):
+                          as_generator=False, verbose=False, n_workers=None,
+                          manifest=None, as_array=False):
     r"""Import Multiple landmark files.
 
     For each landmark file found returns an importer then
@@ -773,6 +1074,25 @@ def import_landmark_files(pattern, max_landmarks=None, shuffle=False,
         one after another when the generator is iterated over.
     verbose : `bool`, optional
         If ``True`` progress of the importing will be dynamically reported.
+    n_workers : `int`, optional
+        If not ``None``, the landmark files are imported ahead of the
+        consumer by ``n_workers`` threads, which requires ``as_generator`` or
+        ``as_array`` to be ``True``. The landmarks are still yielded in
+        order. If ``verbose`` is also ``True``, the time spent importing is
+        reported at the end.
+    manifest : `pathlib.Path` or `str`, optional
+        If not ``None``, the path of a manifest file that caches the sorted
+        list of landmark files found by the glob. If neither the pattern nor
+        the modification times of the searched directories have changed
+        since the manifest was written, the directories are not walked again.
+        Otherwise the manifest is (re)written.
+        ``shuffle`` and ``max_landmarks`` are applied to the cached list.
+    as_array : `bool`, optional
+        If ``True``, the points of the first landmark group of every file are
+        imported immediately into a single array, rather than returning
+        a :map:`LazyList`. Only the points are parsed - no labels or
+        connectivity are built - so this is much faster for large numbers of
+        files. Every file must have the same number of points.
 
     Returns
     -------
@@ -780,24 +1100,265 @@ def import_landmark_files(pattern, max_landmarks=None, shuffle=False,
         A :map:`LazyList` or generator yielding :map:`PointCloud` or
         :map:`LabelledPointUndirectedGraph` instances found to match the glob
         pattern provided.
+    (points, filepaths) : `tuple`
+        If ``as_array`` is ``True``, a ``(n_files, n_points, n_dims)``
+        `ndarray` of the points of every file and the `list` of the
+        `pathlib.Path` that each row of points was imported from.
 
     Raises
     ------
     ValueError
         If no landmarks are found at the provided glob.
+    ValueError
+        If ``as_array`` is ``True`` and the files have different numbers of
+        points, or ``as_generator`` is also ``True``.
+    ValueError
+        If ``n_workers`` is not ``None`` but neither ``as_generator`` nor
+        ``as_array`` are ``True``.
     """
+    if as_array:
+        if as_generator:
+            raise ValueError('as_array and as_generator cannot both be True')
+        filepaths = _glob_filepaths(pattern, image_landmark_types,
+                                    max_assets=max_landmarks, shuffle=shuffle,
+                                    manifest=manifest)
+        return _import_landmark_points(filepaths, n_workers=n_workers,
+                                       verbose=verbose), filepaths
     return _import_glob_lazy_list(pattern, image_landmark_types,
                                   max_assets=max_landmarks, shuffle=shuffle,
-                                  as_generator=as_generator, verbose=verbose)
+                                  as_generator=as_generator, verbose=verbose,
+                                  n_workers=n_workers, manifest=manifest)
 
 
-def _import_glob_lazy_list(pattern, extension_map, max_assets=None,
-                           landmark_resolver=same_name, shuffle=False,
-                           as_generator=False, landmark_ext_map=None,
-                           landmark_attach_func=None, importer_kwargs=None,
-                           verbose=False):
-    filepaths = list(glob_with_suffix(pattern, extension_map,
-                                      sort=(not shuffle)))
+def _import_landmark_points(filepaths, n_workers=None, verbose=False):
+    r"""
+    Import the points of the first landmark group of each file in
+    ``filepaths`` into a single ``(n_files, n_points, n_dims)`` array.
+    """
+    import numpy as np
+    points = LazyList([partial(_import_landmark_points_file, f)
+                       for f in filepaths])
+    if n_workers is not None:
+        points = points.prefetch(n_workers=n_workers)
+    if verbose:
+        points = print_progress(points, prefix='Importing landmarks',
+                                n_items=len(filepaths))
+    array = None
+    for i, (filepath, p) in enumerate(zip(filepaths, points)):
+        if array is None:
+            array = np.empty((len(filepaths),) + p.shape)
+        elif p.shape != array.shape[1:]:
+            raise ValueError('{} has points of shape {} but {} has points '
+                             'of shape {}'.format(filepath, p.shape,
+                                                  filepaths[0],
+                                                  array.shape[1:]))
+        array[i] = p
+    return array
+
+
+def _import_landmark_points_file(filepath):
+    try:
+        importer = importer_for_filepath(filepath,
+                                         image_landmark_points_types)
+    except ValueError:
+        # No points-only importer - fall back to the full importer
+        lmarks = _import(filepath, image_landmark_types)
+        return next(iter(lmarks.values())).points
+    return importer(filepath)
+
+
+def image_metadata(pattern, max_images=None, shuffle=False, landmarks=True,
+                   normalize=False, n_workers=None, chunk_size=256,
+                   verbose=False, manifest=None):
+    r"""Read the metadata of many images, without decoding any pixels.
+
+    Only the header of each image is read, which is orders of magnitude
+    faster than importing the image. The headers are read in a pool of
+    ``n_workers`` threads, so that millions of files can be triaged (e.g.
+    filtered by resolution) before any of them are imported.
+
+    Only images that are imported with Pillow are found by the glob.
+
+    Parameters
+    ----------
+    pattern : `str`
+        A glob path pattern to search for images. See :map:`image_paths`.
+    max_images : positive `int`, optional
+        If not ``None``, only read the first ``max_images`` found. Else,
+        read all.
+    shuffle : `bool`, optional
+        If ``True``, the order of the returned images will be randomised. If
+        ``False``, the order of the returned images will be alphanumerically
+        ordered.
+    landmarks : `bool`, optional
+        If ``True``, the paths of the landmark files that would be imported
+        with each image (by the default landmark resolver) are found too.
+        The landmark files are not parsed.
+    normalize : `bool`, optional
+        Whether the ``n_channels`` and ``dtype`` fields describe the images
+        as imported with or without normalisation (see :map:`import_image`).
+    n_workers : `int`, optional
+        The number of threads the headers are read in. If ``None``, the
+        number of CPUs on the machine is used.
+    chunk_size : `int`, optional
+        The number of headers each thread reads at once.
+    verbose : `bool`, optional
+        If ``True`` progress will be dynamically reported with a progress
+        bar.
+    manifest : `pathlib.Path` or `str`, optional
+        If not ``None``, the path of a manifest file that caches the glob
+        (see :map:`import_images`).
+
+    Returns
+    -------
+    metadata : ``(n_images,)`` structured `ndarray`
+        A table with a row per image, in the order they were found, with the
+        fields:
+
+        ================== ============================================
+        Field              Description
+        ================== ============================================
+        ``path``           The `pathlib.Path` of the image
+        ``shape``          The ``(height, width)`` of the image
+        ``n_channels``     The number of channels of the imported image
+        ``mode``           The PIL mode of the image, e.g. ``'RGB'``
+        ``dtype``          The `numpy.dtype` of the pixels of the
+                           imported image
+        ``landmark_paths`` A `list` of the landmark file paths of the
+                           image (empty if ``landmarks`` is ``False``)
+        ================== ============================================
+
+    Raises
+    ------
+    ValueError
+        If no images are found at the provided glob.
+    ValueError
+        If an image has a PIL mode that can't be imported.
+
+    Examples
+    --------
+    Import only the images that are at least 512 pixels high:
+
+    >>> metadata = menpo.io.image_metadata('./massive_image_db/*')
+    >>> large = metadata[metadata['shape'][:, 0] >= 512]
+    >>> images = [menpo.io.import_image(p) for p in large['path']]
+    """
+    import numpy as np
+    from .image import pillow_importer
+    pillow_types = dict((ext, importer)
+                        for ext, importer in image_types.items()
+                        if importer is pillow_importer)
+    filepaths = _glob_filepaths(pattern, pillow_types, max_assets=max_images,
+                                shuffle=shuffle, manifest=manifest)
+    index = LandmarkFileIndex() if landmarks else None
+    chunks = [filepaths[i:i + chunk_size]
+              for i in range(0, len(filepaths), chunk_size)]
+    rows = LazyList([partial(_read_image_metadata, c, index,
+                             normalize=normalize)
+                     for c in chunks]).prefetch(n_workers=n_workers)
+    if verbose:
+        rows = print_progress(rows, prefix='Reading image headers',
+                              n_items=len(chunks))
+
+    metadata = np.empty(len(filepaths),
+                        dtype=[('path', object), ('shape', np.int64, (2,)),
+                               ('n_channels', np.int64), ('mode', object),
+                               ('dtype', object), ('landmark_paths', object)])
+    i = 0
+    for chunk_rows in rows:
+        for row in chunk_rows:
+            metadata[i] = row
+            i += 1
+    return metadata
+
+
+def _read_image_metadata(filepaths, landmark_index=None, normalize=False):
+    from .image import pillow_header
+    rows = []
+    for path in filepaths:
+        shape, n_channels, mode, dtype = pillow_header(path,
+                                                       normalize=normalize)
+        landmark_paths = []
+        if landmark_index is not None:
+            landmark_paths = landmark_index.paths(path.parent, path.stem)
+        rows.append((path, shape, n_channels, mode, dtype, landmark_paths))
+    return rows
+
+
+def import_dataset(path, mmap_mode='c'):
+    r"""Import a dataset that was packed with :func:`export_dataset`.
+
+    The pixels and landmark points of the dataset are memory-mapped, so the
+    returned :map:`LazyList` is created immediately and indexing into it only
+    creates views into the mapped files - no image or landmark file is
+    decoded.
+
+    Parameters
+    ----------
+    path : `pathlib.Path` or `str`
+        The dataset directory.
+    mmap_mode : ``{'r', 'r+', 'c'}``, optional
+        The mode used to memory-map the dataset, see ``numpy.memmap``. By
+        default the mapping is copy-on-write - the imported images can be
+        modified in memory without altering the dataset on disk.
+
+    Returns
+    -------
+    lazy_list : :map:`LazyList`
+        A :map:`LazyList` of the images in the dataset, in the order they
+        were exported.
+
+    Raises
+    ------
+    ValueError
+        If ``path`` does not contain a complete packed dataset.
+    """
+    from .dataset import PackedDataset
+    dataset = PackedDataset(_norm_path(path), mmap_mode=mmap_mode)
+    return LazyList([partial(dataset.item, i) for i in range(len(dataset))])
+
+
+def import_archive(path, mmap_mode='c'):
+    r"""Import a pickle archive that was exported with :func:`export_archive`.
+
+    The returned :map:`LazyList` is created immediately. Indexing into it
+    only decompresses and unpickles the chunk of the archive holding the
+    requested object, and the arrays that were stored outside of the pickles
+    are memory-mapped rather than read into memory.
+
+    Parameters
+    ----------
+    path : `pathlib.Path` or `str`
+        The archive directory.
+    mmap_mode : ``{'r', 'r+', 'c'}``, optional
+        The mode used to memory-map the arrays, see ``numpy.memmap``. By
+        default the mapping is copy-on-write - the imported objects can be
+        modified in memory without altering the archive on disk.
+
+    Returns
+    -------
+    lazy_list : :map:`LazyList`
+        A :map:`LazyList` of the objects in the archive, in the order they
+        were exported.
+
+    Raises
+    ------
+    ValueError
+        If ``path`` does not contain a complete pickle archive.
+    """
+    from .archive import PickleArchive
+    archive = PickleArchive(_norm_path(path), mmap_mode=mmap_mode)
+    return LazyList([partial(archive.item, i) for i in range(len(archive))])
+
+
+def _glob_filepaths(pattern, extension_map, max_assets=None, shuffle=False,
+                    manifest=None):
+    if manifest is not None:
+        filepaths = glob_with_suffix_manifest(pattern, extension_map,
+                                              _norm_path(manifest))
+    else:
+        filepaths = list(glob_with_suffix(pattern, extension_map,
+                                          sort=(not shuffle)))
     if shuffle:
         random.shuffle(filepaths)
     if (max_assets is not None) and max_assets <= 0:
@@ -806,9 +1367,31 @@ def _import_glob_lazy_list(pattern, extension_map, max_assets=None,
     elif max_assets:
         filepaths = filepaths[:max_assets]
 
-    n_files = len(filepaths)
-    if n_files == 0:
+    if len(filepaths) == 0:
         raise ValueError('The glob {} yields no assets'.format(pattern))
+    return filepaths
+
+
+def _import_glob_lazy_list(pattern, extension_map, max_assets=None,
+                           landmark_resolver=same_name, shuffle=False,
+                           as_generator=False, landmark_ext_map=None,
+                           landmark_attach_func=None, importer_kwargs=None,
+                           verbose=False, n_workers=None, manifest=None):
+    if n_workers is not None and not as_generator:
+        # A LazyList is indexed in any order, so can't be imported ahead
+        raise ValueError('n_workers requires as_generator=True - to import '
+                         'a LazyList in parallel, call its prefetch method')
+    filepaths = _glob_filepaths(pattern, extension_map,
+                                max_assets=max_assets, shuffle=shuffle,
+                                manifest=manifest)
+    n_files = len(filepaths)
+
+    # The default resolvers would glob once per asset - share an index
+    # instead so that each directory is only listed once.
+    if landmark_resolver is same_name:
+        landmark_resolver = LandmarkFileIndex().same_name
+    elif landmark_resolver is same_name_video:
+        landmark_resolver = LandmarkFileIndex().same_name_video
 
     lazy_list = LazyList([partial(_import, f, extension_map,
                                   landmark_resolver=landmark_resolver,
@@ -817,10 +1400,23 @@ def _import_glob_lazy_list(pattern, extension_map, max_assets=None,
                                   importer_kwargs=importer_kwargs)
                           for f in filepaths])
 
+    timer = None
+    if as_generator and n_workers is not None:
+        # import upcoming assets in the background - still in order
+        timer = _StageTimer() if verbose else None
+        lazy_list = _threaded_import(
+            filepaths, extension_map, n_workers,
+            landmark_resolver=landmark_resolver,
+            landmark_ext_map=landmark_ext_map,
+            landmark_attach_func=landmark_attach_func,
+            importer_kwargs=importer_kwargs, timer=timer)
+
     if verbose and as_generator:
         # wrap the generator with the progress reporter
         lazy_list = print_progress(lazy_list, prefix='Importing assets',
                                    n_items=n_files)
+        if timer is not None:
+            lazy_list = timer.report_after(lazy_list)
     elif verbose:
         print('Found {} assets, index the returned LazyList to import.'.format(
             n_files))
@@ -831,8 +1427,88 @@ def _import_glob_lazy_list(pattern, extension_map, max_assets=None,
         return lazy_list
 
 
+class _StageTimer(object):
+    r"""
+    Thread-safe accumulator of the time spent in each stage of importing.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.totals = OrderedDict()
+
+    def wrap(self, stage, f):
+        return partial(self._run, stage, f)
+
+    def _run(self, stage, f):
+        start = default_timer()
+        try:
+            return f()
+        finally:
+            elapsed = default_timer() - start
+            with self._lock:
+                self.totals[stage] = self.totals.get(stage, 0) + elapsed
+
+    def report_after(self, iterable):
+        start = default_timer()
+        for x in iterable:
+            yield x
+        wall = default_timer() - start
+        stages = ', '.join('{} {:.2f}s'.format(k, v)
+                           for k, v in self.totals.items())
+        print('Time per stage (summed over workers): {} - '
+              'wall time {:.2f}s'.format(stages, wall))
+
+
+def _threaded_import(filepaths, extension_map, n_workers,
+                     landmark_resolver=same_name, landmark_ext_map=None,
+                     landmark_attach_func=None, importer_kwargs=None,
+                     timer=None):
+    r"""
+    Generator that imports ``filepaths`` in order using a pool of
+    ``n_workers`` threads.
+
+    Landmarks of single-object assets (i.e. images) are resolved as separate
+    tasks from the import of the asset itself, so reading and decoding an
+    asset overlaps with parsing its landmarks.
+    """
+    split_landmarks = (landmark_attach_func is _import_object_attach_landmarks
+                       and landmark_resolver is not None
+                       and landmark_ext_map is not None)
+    wrap = timer.wrap if timer is not None else lambda stage, f: f
+    callables = []
+    for f in filepaths:
+        if split_landmarks:
+            callables.append(wrap('import', partial(
+                _import_built_objects, f, extension_map,
+                importer_kwargs=importer_kwargs)))
+            # resolvers are given the same normalized path that _import
+            # attaches to the asset
+            callables.append(wrap('landmarks',
+                                  partial(landmark_resolver, _norm_path(f))))
+        else:
+            callables.append(wrap('import', partial(
+                _import, f, extension_map,
+                landmark_resolver=landmark_resolver,
+                landmark_ext_map=landmark_ext_map,
+                landmark_attach_func=landmark_attach_func,
+                importer_kwargs=importer_kwargs)))
+
+    results = LazyList(callables).prefetch(n_workers=n_workers)
+    for asset in results:
+        if split_landmarks:
+            lm_dict = next(results)
+            built_objects, transform = asset
+            landmark_attach_func(built_objects, lambda path: lm_dict,
+                                 landmark_ext_map=landmark_ext_map,
+                                 landmark_transform=transform)
+            asset = (built_objects[0] if len(built_objects) == 1
+                     else built_objects)
+        yield asset
+
+
 def _import_object_attach_landmarks(built_objects, landmark_resolver,
-                                    landmark_ext_map=None):
+                                    landmark_ext_map=None,
+                                    landmark_transform=None):
     # handle landmarks
     if landmark_ext_map is not None and landmark_resolver is not None:
         for x in built_objects:
@@ -841,11 +1517,15 @@ def _import_object_attach_landmarks(built_objects, landmark_resolver,
                 continue
             for group_name, lm_obj in lm_dict.items():
                 if x.n_dims == lm_obj.n_dims:
+                    if landmark_transform is not None:
+                        # e.g. the image was decoded at a reduced resolution
+                        lm_obj = landmark_transform.apply(lm_obj)
                     x.landmarks[group_name] = lm_obj
 
 
 def _import_lazylist_attach_landmarks(built_objects, landmark_resolver,
-                                      landmark_ext_map=None):
+                                      landmark_ext_map=None,
+                                      landmark_transform=None):
     # handle landmarks
     if landmark_ext_map is not None and landmark_resolver is not None:
         for k, x in enumerate(built_objects):
@@ -860,6 +1540,10 @@ def _import_lazylist_attach_landmarks(built_objects, landmark_resolver,
                 if lm_dict is not None:
                     for group_name, lm_obj in lm_dict.items():
                         if obj.n_dims == lm_obj.n_dims:
+                            if landmark_transform is not None:
+                                # e.g. the frames were cropped or scaled
+                                # whilst decoding
+                                lm_obj = landmark_transform.apply(lm_obj)
                             obj.landmarks[group_name] = lm_obj
                 return obj
 
@@ -907,6 +1591,36 @@ def _import(filepath, extensions_map, landmark_resolver=same_name,
     assets : asset or list of assets
         The loaded asset or list of assets.
     """
+    built_objects, transform = _import_built_objects(
+        filepath, extensions_map, asset=asset,
+        importer_kwargs=importer_kwargs)
+
+    if landmark_attach_func is not None and landmark_resolver is not None:
+        landmark_attach_func(built_objects, landmark_resolver,
+                             landmark_ext_map=landmark_ext_map,
+                             landmark_transform=transform)
+
+    if len(built_objects) == 1:
+        built_objects = built_objects[0]
+
+    return built_objects
+
+
+# Importers that can decode an asset into different coordinates to those of
+# its file (e.g. at a reduced resolution). Called with return_transform=True,
+# they also return the transform between the two, which is applied to the
+# landmarks of the asset.
+_TRANSFORMING_IMPORTERS = (pillow_importer, ffmpeg_importer)
+
+
+def _import_built_objects(filepath, extensions_map, asset=None,
+                          importer_kwargs=None):
+    r"""
+    The first half of :func:`_import` - returns the `list` of objects built by
+    the importer (with their paths attached) and the transform from the
+    coordinates of the file to those of the objects, or ``None``. Landmarks
+    are not attached.
+    """
     path = _norm_path(filepath)
     if not path.is_file():
         raise ValueError("{} is not a file".format(path))
@@ -915,7 +1629,13 @@ def _import(filepath, extensions_map, landmark_resolver=same_name,
     importer_callable = importer_for_filepath(path, extensions_map)
     if importer_kwargs is None:
         importer_kwargs = {}
-    built_objects = importer_callable(path, asset=asset, **importer_kwargs)
+    transform = None
+    if importer_callable in _TRANSFORMING_IMPORTERS:
+        built_objects, transform = importer_callable(
+            path, asset=asset, return_transform=True, **importer_kwargs)
+    else:
+        built_objects = importer_callable(path, asset=asset,
+                                          **importer_kwargs)
 
     # landmarks are iterable so check for list precisely
     if not isinstance(built_objects, list):
@@ -940,14 +1660,7 @@ def _import(filepath, extensions_map, landmark_resolver=same_name,
         else:
             attach_path(x)
 
-    if landmark_attach_func is not None and landmark_resolver is not None:
-        landmark_attach_func(built_objects, landmark_resolver,
-                             landmark_ext_map=landmark_ext_map)
-
-    if len(built_objects) == 1:
-        built_objects = built_objects[0]
-
-    return built_objects
+    return built_objects, transform
 
 
 def _pathlib_glob_for_pattern(pattern, sort=True):
@@ -974,6 +1687,19 @@ def _pathlib_glob_for_pattern(pattern, sort=True):
     ValueError
         If the pattern doesn't contain a '*' wildcard and is not a directory
     """
+    preglob, pattern = _split_glob_pattern(pattern)
+    p = Path(preglob)
+    paths = p.glob(str(pattern))
+    if sort:
+        paths = sorted(paths)
+    return paths
+
+
+def _split_glob_pattern(pattern):
+    r"""
+    Split ``pattern`` into the longest directory without wildcards and the
+    glob pattern relative to that directory.
+    """
     pattern = _norm_path(pattern)
     pattern_str = str(pattern)
     gsplit = pattern_str.split('*', 1)
@@ -993,11 +1719,7 @@ def _pathlib_glob_for_pattern(pattern, sort=True):
         # to the nearest dir and add the reminder to the pattern
         preglob, pattern_prefix = os.path.split(preglob)
         pattern = pattern_prefix + pattern
-    p = Path(preglob)
-    paths = p.glob(str(pattern))
-    if sort:
-        paths = sorted(paths)
-    return paths
+    return preglob, pattern
 
 
 def glob_with_suffix(pattern, extensions_map, sort=True):
@@ -1028,6 +1750,123 @@ def glob_with_suffix(pattern, extensions_map, sort=True):
             yield path
 
 
+def _glob_dirs(preglob, pattern):
+    r"""
+    The directories whose contents determine the result of globbing
+    ``pattern`` from the directory ``preglob``.
+    """
+    if '**' not in pattern and '/' not in pattern and os.sep not in pattern:
+        return [os.path.normpath(preglob)]
+    return [os.path.normpath(d) for d, _, _ in os.walk(preglob)]
+
+
+def _dir_mtimes(dirs):
+    return dict((d, os.stat(d).st_mtime) for d in dirs)
+
+
+def _same_mtime(stat_a, stat_b):
+    # Compare in nanoseconds where possible - float times lose precision
+    return (getattr(stat_a, 'st_mtime_ns', stat_a.st_mtime) ==
+            getattr(stat_b, 'st_mtime_ns', stat_b.st_mtime))
+
+
+def _copy_mtime(src, dst):
+    stat = os.stat(src)
+    if hasattr(stat, 'st_mtime_ns'):
+        os.utime(dst, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    else:
+        os.utime(dst, (stat.st_atime, stat.st_mtime))
+
+
+def _manifest_is_current(manifest, manifest_path, pattern, extensions):
+    if (manifest.get('pattern') != pattern or
+            manifest.get('extensions') != extensions):
+        return False
+    for d, mtime in manifest['dir_mtimes'].items():
+        try:
+            if mtime is None:
+                # The directory holding the manifest was last modified by
+                # writing the manifest, which was given the same time
+                if not _same_mtime(os.stat(d), os.stat(str(manifest_path))):
+                    return False
+            elif os.stat(d).st_mtime != mtime:
+                return False
+        except OSError:
+            # The directory was removed
+            return False
+    return True
+
+
+def glob_with_suffix_manifest(pattern, extensions_map, manifest_path):
+    r"""
+    Sorted equivalent of :func:`glob_with_suffix` that is cached in a
+    manifest file.
+
+    The manifest stores the pattern, the matching paths along with their
+    sizes in bytes, and the modification times of all the directories that
+    were searched. If the pattern and the modification times are unchanged,
+    the paths are read from the manifest rather than walking the directories
+    again. Otherwise the glob is performed and the manifest is rewritten.
+
+    Note that only adding, removing or renaming files changes the
+    modification time of a directory - files that are modified in place
+    will not update the stored sizes.
+
+    Parameters
+    ----------
+    pattern : `str`
+        A UNIX style glob pattern to match against.
+    extensions_map : `dict` {`str`: `callable`}
+        A map from extensions to importers.
+    manifest_path : `pathlib.Path`
+        The path of the manifest file.
+
+    Returns
+    -------
+    filepaths : `list` of `pathlib.Path`
+        The sorted filepaths that have valid extensions.
+    """
+    from menpo.io.input.pickle import pickle
+    from menpo.io.output.pickle import _atomic_write
+    pattern_str = str(_norm_path(pattern))
+    extensions = sorted(extensions_map)
+    if manifest_path.is_file():
+        try:
+            with open(str(manifest_path), 'rb') as f:
+                manifest = pickle.load(f)
+        except Exception:
+            # Treat an unreadable manifest as stale
+            manifest = {}
+        if _manifest_is_current(manifest, manifest_path, pattern_str,
+                                extensions):
+            return [Path(p) for p in manifest['paths']]
+
+    preglob, glob_pattern = _split_glob_pattern(pattern)
+    # Record the directories before walking them, so that any change made
+    # during the walk invalidates the manifest
+    dir_mtimes = _dir_mtimes(_glob_dirs(preglob, glob_pattern))
+    filepaths = list(glob_with_suffix(pattern, extensions_map))
+    manifest = {'pattern': pattern_str,
+                'extensions': extensions,
+                'dir_mtimes': dir_mtimes,
+                'paths': [str(p) for p in filepaths],
+                'sizes': [p.stat().st_size for p in filepaths]}
+
+    manifest_dir = str(manifest_path.parent)
+    unchanged = (manifest_dir in dir_mtimes and
+                 os.stat(manifest_dir).st_mtime == dir_mtimes[manifest_dir])
+    if unchanged:
+        # The manifest lives in a searched directory, and writing it will
+        # change the modification time of the directory. Instead, the
+        # manifest is given the new time of the directory to compare against.
+        dir_mtimes[manifest_dir] = None
+    _atomic_write(manifest_path,
+                  lambda f: pickle.dump(manifest, f, protocol=2))
+    if unchanged:
+        _copy_mtime(manifest_dir, str(manifest_path))
+    return filepaths
+
+
 def importer_for_filepath(filepath, extensions_map):
     r"""
     Given a filepath, return the appropriate importer as mapped by the
@@ -0,0 +1,71 @@
+import io
+
+from .pickle import _IndexedDirectory, _unpickle_with_persistent_load
+from ..output.dataset import (PIXELS_FILENAME, POINTS_FILENAME,
+                              INDEX_FILENAME, DATASET_VERSION)
+
+
+class PackedDataset(_IndexedDirectory):
+    r"""
+    A dataset directory written by
+    :func:`menpo.io.output.dataset.pack_dataset`. The pixel and point buffers
+    are memory-mapped, so that unpacking an item only creates views into them.
+
+    Parameters
+    ----------
+    path : `Path`
+        The dataset directory.
+    mmap_mode : ``{'r', 'r+', 'c'}``, optional
+        The mode used to memory-map the buffers, see ``numpy.memmap``. By
+        default the buffers are copy-on-write - the unpacked items can be
+        modified in memory without altering the files on disk.
+
+    Raises
+    ------
+    ValueError
+        If ``path`` does not contain a complete packed dataset.
+    """
+    _index_filename = INDEX_FILENAME
+    _version = DATASET_VERSION
+    _description = 'packed dataset'
+
+    def _init_from_index(self, index):
+        import numpy as np
+        self._records = index['records']
+        self._pixels_dtype = index['pixels_dtype']
+        self._pixels = self._memmap(PIXELS_FILENAME, self._pixels_dtype)
+        self._points = self._memmap(POINTS_FILENAME, np.float64)
+
+    def __len__(self):
+        return len(self._records)
+
+    def _persistent_load(self, pid):
+        import numpy as np
+        kind, offset, shape = pid
+        if kind == 'pixels':
+            buffer, dtype = self._pixels, self._pixels_dtype
+        else:
+            buffer, dtype = self._points, np.float64
+        size = int(np.prod(shape))
+        if size == 0:
+            # empty buffers are not memory-mapped
+            return np.empty(shape, dtype=dtype)
+        return buffer[offset:offset + size].reshape(shape)
+
+    def item(self, i):
+        r"""
+        Unpack the item at index ``i``.
+
+        Parameters
+        ----------
+        i : `int`
+            The index of the item.
+
+        Returns
+        -------
+        item : :map:`Image`
+            The item, with its pixels and landmark points as views into the
+            memory-mapped buffers.
+        """
+        return _unpickle_with_persistent_load(io.BytesIO(self._records[i]),
+                                              self._persistent_load)
@@ -1,7 +1,8 @@
-from .landmark import lm2_importer, ljson_importer
+from .landmark import lm2_importer, ljson_importer, ljson_points_importer
 from .image import pillow_importer, abs_importer, flo_importer
 from .video import ffmpeg_types, ffmpeg_importer
-from .landmark_image import asf_image_importer, pts_image_importer
+from .landmark_image import (asf_image_importer, pts_image_importer,
+                             pts_image_points_importer)
 from .pickle import pickle_importer, pickle_gzip_importer
 
 
@@ -41,5 +42,11 @@ image_landmark_types = {'.asf': asf_image_importer,
                         '.ptsx': pts_image_importer,
                         '.ljson': ljson_importer}
 
+# Importers of just the points of a landmark file, for bulk importing. Types
+# that are missing fall back to the full importer in image_landmark_types.
+image_landmark_points_types = {'.pts': pts_image_points_importer,
+                               '.ptsx': pts_image_points_importer,
+                               '.ljson': ljson_points_importer}
+
 pickle_types = {'.pkl': pickle_importer,
                 '.pkl.gz': pickle_gzip_importer}
@@ -1,23 +1,141 @@
+from __future__ import division
 from functools import partial
 
 import numpy as np
 from pathlib import Path
 
 from menpo.base import LazyList
-from menpo.image import Image, MaskedImage, BooleanImage
-from menpo.image.base import normalize_pixels_range, channels_to_front
 
 
-def _pil_to_numpy(pil_image, normalize, convert=None):
+def _pil_to_numpy(pil_image, normalize, convert=None, dtype=None):
+    from menpo.image.base import normalize_pixels_range
     p = pil_image.convert(convert) if convert else pil_image
     p = np.asarray(p)
     if normalize:
-        return normalize_pixels_range(p)
+        return normalize_pixels_range(p, dtype=dtype or np.float64)
     else:
         return p
 
 
-def pillow_importer(filepath, asset=None, normalize=True, **kwargs):
+# Modes that can be reduced by averaging blocks of pixels
+_REDUCIBLE_PIL_MODES = {'L', 'I', 'F', 'RGB', 'RGBA'}
+
+
+def _decode_reduction_factor(shape, max_shape=None, scale_hint=None):
+    r"""
+    The largest power of two that an image of ``shape`` can be reduced by
+    whilst remaining at least ``scale_hint`` times its size and at least as
+    large as it would be if rescaled to fit within ``max_shape``.
+    """
+    scale = 1.0
+    if scale_hint is not None:
+        if scale_hint <= 0:
+            raise ValueError('scale_hint must be positive, not '
+                             '{}'.format(scale_hint))
+        scale = min(scale, scale_hint)
+    if max_shape is not None:
+        scale = min([scale] + [m / s for m, s in zip(max_shape, shape)])
+    factor = 1
+    while factor * 2 * scale <= 1:
+        factor *= 2
+    return factor
+
+
+def _pil_reduce(pil_image, factor):
+    r"""
+    Reduce ``pil_image`` by ``factor`` in each dimension, to the size
+    ``ceil(size / factor)``. JPEGs are decoded at the reduced size directly
+    (by scaling the DCT) as far as the decoder supports.
+    """
+    import PIL.Image as PILImage
+    w, h = pil_image.size
+    if pil_image.format == 'JPEG':
+        # draft picks the largest DCT scale (up to 1/8) that keeps the image
+        # at least as large as the requested size
+        pil_image.draft(pil_image.mode, (max(w // factor, 1),
+                                         max(h // factor, 1)))
+        for achieved in (8, 4, 2, 1):
+            if pil_image.size == (-(-w // achieved), -(-h // achieved)):
+                factor //= achieved
+                break
+    if factor > 1:
+        if hasattr(pil_image, 'reduce'):
+            pil_image = pil_image.reduce(factor)
+        else:
+            # Pillow < 7.0 - box filtering is equivalent to reduce
+            size = (-(-pil_image.size[0] // factor),
+                    -(-pil_image.size[1] // factor))
+            pil_image = pil_image.resize(size, PILImage.BOX)
+    return pil_image
+
+
+# The number of channels of the image imported from each PIL mode, see
+# pillow_importer. Normalized RGBA images keep their alpha as a mask instead.
+_PIL_MODE_N_CHANNELS = {'1': 1, 'L': 1, 'I': 1, 'F': 1, 'P': 3, 'RGB': 3,
+                        'RGBA': 4}
+
+# The dtype of the pixels of each PIL mode, when imported without
+# normalisation
+_PIL_MODE_DTYPES = {'1': np.bool_,
+                    'I': np.int32,
+                    'F': np.float32}
+
+# Modes whose pixels are not normalized, as their range is unknown
+_UNNORMALIZED_PIL_MODES = {'1', 'F'}
+
+
+def pillow_header(filepath, normalize=False):
+    r"""
+    Reads the header of an image using PIL/pillow, without decoding the
+    pixels. The number of channels and dtype are those of the image that
+    :func:`pillow_importer` would import.
+
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute filepath of image
+    normalize : `bool`, optional
+        Whether the image would be imported with normalisation, which changes
+        the dtype of the pixels and removes the alpha channel of RGBA images.
+
+    Returns
+    -------
+    shape : `tuple` of `int`
+        The shape of the image, ``(height, width)``.
+    n_channels : `int`
+        The number of channels of the imported image.
+    mode : `str`
+        The PIL mode of the image, e.g. ``'RGB'``.
+    dtype : `numpy.dtype`
+        The dtype of the pixels of the imported image.
+
+    Raises
+    ------
+    ValueError
+        If the mode of the image is not supported by :func:`pillow_importer`.
+    """
+    import PIL.Image as PILImage
+    pil_image = PILImage.open(str(filepath))
+    try:
+        mode = pil_image.mode
+        shape = pil_image.size[::-1]
+    finally:
+        pil_image.close()
+    if mode not in _PIL_MODE_N_CHANNELS:
+        raise ValueError('Unexpected mode for PIL: {}'.format(mode))
+    n_channels = _PIL_MODE_N_CHANNELS[mode]
+    if normalize and mode not in _UNNORMALIZED_PIL_MODES:
+        if mode == 'RGBA':
+            n_channels = 3
+        dtype = np.float64
+    else:
+        dtype = _PIL_MODE_DTYPES.get(mode, np.uint8)
+    return shape, n_channels, mode, np.dtype(dtype)
+
+
+def pillow_importer(filepath, asset=None, normalize=True, max_shape=None,
+                    scale_hint=None, dtype=None, return_transform=False,
+                    **kwargs):
     r"""
     Imports an image using PIL/pillow.
 
@@ -44,6 +162,21 @@ def pillow_importer(filepath, asset=None, normalize=True, **kwargs):
         If ``True``, normalize between 0.0 and 1.0 and convert to float. If
         ``False`` just pass whatever PIL imports back (according
         to types rules outlined in constructor).
+    max_shape : `tuple` of `int`, optional
+        If not ``None``, the image is decoded at a reduced resolution, by the
+        largest power of two that keeps it at least as large as it would be
+        if rescaled to fit within ``max_shape``. JPEGs are decoded at the
+        reduced resolution directly.
+    scale_hint : `float`, optional
+        If not ``None``, the image is decoded at a reduced resolution, by the
+        largest power of two that keeps it at least ``scale_hint`` times its
+        size.
+    dtype : `numpy.dtype`, optional
+        The floating point dtype of normalized pixels. If ``None``,
+        ``float64``.
+    return_transform : `bool`, optional
+        If ``True``, then the transform from the coordinates of the image file
+        to those of the imported image is also returned.
     \**kwargs : `dict`, optional
         Any other keyword arguments.
 
@@ -51,19 +184,34 @@ def pillow_importer(filepath, asset=None, normalize=True, **kwargs):
     -------
     image : :map:`Image` or subclass
         The imported image.
+    transform : :map:`NonUniformScale` or ``None``
+        The transform from the coordinates of the image file to those of
+        ``image``, or ``None`` if the image was not decoded at a reduced
+        resolution. Only returned if ``return_transform`` is ``True``.
     """
     import PIL.Image as PILImage
+    from menpo.image import Image, MaskedImage, BooleanImage
     if isinstance(filepath, Path):
         filepath = str(filepath)
     pil_image = PILImage.open(filepath)
     mode = pil_image.mode
+    decode_scale = None
+    if ((max_shape is not None or scale_hint is not None) and
+            mode in _REDUCIBLE_PIL_MODES):
+        shape = pil_image.size[::-1]
+        factor = _decode_reduction_factor(shape, max_shape=max_shape,
+                                          scale_hint=scale_hint)
+        if factor > 1:
+            pil_image = _pil_reduce(pil_image, factor)
+            decode_scale = np.array(pil_image.size[::-1]) / shape
     if mode == 'RGBA':
         # If normalize is False, then we return the alpha as an extra
         # channel, which can be useful if the alpha channel has semantic
         # meanings!
         if normalize:
             alpha = np.array(pil_image)[..., 3].astype(np.bool)
-            image_pixels = _pil_to_numpy(pil_image, True, convert='RGB')
+            image_pixels = _pil_to_numpy(pil_image, True, convert='RGB',
+                                         dtype=dtype)
             image = MaskedImage.init_from_channels_at_back(image_pixels,
                                                            mask=alpha)
         else:
@@ -73,7 +221,7 @@ def pillow_importer(filepath, asset=None, normalize=True, **kwargs):
     elif mode in ['L', 'I', 'RGB']:
         # Greyscale, Integer and RGB images
         image = Image.init_from_channels_at_back(
-            _pil_to_numpy(pil_image, normalize))
+            _pil_to_numpy(pil_image, normalize, dtype=dtype))
     elif mode == '1':
         # Convert to 'L' type (http://stackoverflow.com/a/4114122/1716869).
         # Can't normalize a binary image
@@ -82,13 +230,19 @@ def pillow_importer(filepath, asset=None, normalize=True, **kwargs):
     elif mode == 'P':
         # Convert pallete images to RGB
         image = Image.init_from_channels_at_back(
-            _pil_to_numpy(pil_image, normalize, convert='RGB'))
+            _pil_to_numpy(pil_image, normalize, convert='RGB', dtype=dtype))
     elif mode == 'F':  # Floating point images
         # Don't normalize as we don't know the scale
         image = Image.init_from_channels_at_back(
             _pil_to_numpy(pil_image, False))
     else:
         raise ValueError('Unexpected mode for PIL: {}'.format(mode))
+    if return_transform:
+        transform = None
+        if decode_scale is not None:
+            from menpo.transform import NonUniformScale
+            transform = NonUniformScale(decode_scale)
+        return image, transform
     return image
 
 
@@ -114,6 +268,7 @@ def abs_importer(filepath, asset=None, **kwargs):
         The imported image.
     """
     import re
+    from menpo.image import MaskedImage
 
     with open(str(filepath), 'r') as f:
         # Currently these are unused, but they are in the format
@@ -158,6 +313,7 @@ def flo_importer(filepath, asset=None, **kwargs):
     image : :map:`Image` or subclass
         The imported image.
     """
+    from menpo.image import Image
     with open(str(filepath), 'rb') as f:
         fingerprint = f.read(4)
         if fingerprint != b'PIEH':
@@ -201,6 +357,8 @@ def imageio_importer(filepath, asset=None, normalize=True, **kwargs):
         The imported image.
     """
     import imageio
+    from menpo.image import Image, MaskedImage
+    from menpo.image.base import normalize_pixels_range, channels_to_front
 
     pixels = imageio.imread(str(filepath))
     pixels = channels_to_front(pixels)
@@ -250,6 +408,8 @@ def imageio_gif_importer(filepath, asset=None, normalize=True, **kwargs):
         of the GIF.
     """
     import imageio
+    from menpo.image import Image, MaskedImage
+    from menpo.image.base import normalize_pixels_range, channels_to_front
 
     reader = imageio.get_reader(str(filepath), format='gif', mode='I')
 
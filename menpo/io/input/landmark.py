@@ -4,10 +4,6 @@ import warnings
 import itertools
 
 import numpy as np
-from scipy.sparse import csr_matrix
-
-from menpo.shape import PointCloud, LabelledPointUndirectedGraph
-from menpo.transform import Scale
 
 
 ASFPath = namedtuple('ASFPath', ['path_num', 'path_type', 'xpos', 'ypos',
@@ -50,6 +46,8 @@ def asf_importer(filepath, asset=None, **kwargs):
     ----------
     .. [1] http://www2.imm.dtu.dk/~aam/datasets/datasets.html
     """
+    from menpo.shape import LabelledPointUndirectedGraph
+    from menpo.transform import Scale
     with filepath.open('r') as f:
         landmarks = f.read()
 
@@ -144,31 +142,58 @@ def pts_importer(filepath, image_origin=True, **kwargs):
     landmarks : `dict` {`str`: :map:`PointCloud`}
         Dictionary mapping landmark groups to menpo shapes
     """
+    from menpo.shape import PointCloud
     with filepath.open('r') as f:
-        lines = [l.strip() for l in f.readlines()]
+        text = f.read()
+    return {'PTS': PointCloud(_parse_pts(text, image_origin=image_origin),
+                              copy=False)}
 
-    line = lines[0]
-    while not line.startswith('{'):
-        line = lines.pop(0)
 
-    xs = []
-    ys = []
-    for line in lines:
-        if not line.strip().startswith('}'):
-            xpos, ypos = line.split()[:2]
-            xs.append(xpos)
-            ys.append(ypos)
+def pts_points_importer(filepath, image_origin=True, **kwargs):
+    r"""
+    Importer for just the points of a PTS file, see :func:`pts_importer`.
 
-    xs = np.array(xs, dtype=np.float).reshape((-1, 1))
-    ys = np.array(ys, dtype=np.float).reshape((-1, 1))
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute filepath of the file.
+    image_origin : `bool`, optional
+        If ``True``, assume that the landmarks exist within an image and thus
+        the origin is the image origin.
+    \**kwargs : `dict`, optional
+        Any other keyword arguments.
+
+    Returns
+    -------
+    points : ``(n_points, 2)`` `ndarray`
+        The points of the file.
+    """
+    with filepath.open('r') as f:
+        text = f.read()
+    return _parse_pts(text, image_origin=image_origin)
+
+
+def _parse_pts(text, image_origin=True):
+    # The points are the rows of whitespace separated values between braces
+    start = text.index('{') + 1
+    end = text.find('}', start)
+    body = text[start:] if end == -1 else text[start:end]
+    rows = body.strip().splitlines()
+    tokens = body.split()
+    n_cols = len(rows[0].split()) if rows else 2
+    if len(tokens) == len(rows) * n_cols and n_cols >= 2:
+        # Every row has the same number of values - convert them all at once
+        points = np.array(tokens, dtype=np.float64).reshape([-1, n_cols])
+    else:
+        points = np.array([r.split()[:2] for r in rows if r.strip()],
+                          dtype=np.float64).reshape([-1, 2])
+    points = points[:, :2]
 
     # PTS landmarks are 1-based, need to convert to 0-based (subtract 1)
     if image_origin:
-        points = np.hstack([ys - 1, xs - 1])
+        return points[:, ::-1] - 1
     else:
-        points = np.hstack([xs - 1, ys - 1])
-
-    return {'PTS': PointCloud(points, copy=False)}
+        return points - 1
 
 
 def lm2_importer(filepath, **kwargs):
@@ -269,19 +294,21 @@ def lm2_importer(filepath, **kwargs):
     masks = [np.squeeze(m) for m in masks]
     labels_to_masks = OrderedDict(zip(labels, masks))
 
+    from scipy.sparse import csr_matrix
+    from menpo.shape import LabelledPointUndirectedGraph
     empty_adj_matrix = csr_matrix((num_points, num_points))
     return {'LM2': LabelledPointUndirectedGraph(points, empty_adj_matrix,
                                                 labels_to_masks)}
 
 
 def _ljson_parse_null_values(points_list):
-    filtered_points = [np.nan if x is None else x
-                       for x in itertools.chain(*points_list)]
-    return np.array(filtered_points,
-                    dtype=np.float).reshape([-1, len(points_list[0])])
+    # null values (None) become nan when cast to float
+    return np.array(points_list,
+                    dtype=np.float64).reshape([-1, len(points_list[0])])
 
 
 def _parse_ljson_v1(lms_dict):
+    from menpo.shape import LabelledPointUndirectedGraph
     all_points = []
     labels = []  # label per group
     labels_slices = []  # slices into the full pointcloud per label
@@ -318,6 +345,7 @@ def _parse_ljson_v1(lms_dict):
 
 
 def _parse_ljson_v2(lms_dict):
+    from menpo.shape import PointCloud, LabelledPointUndirectedGraph
     points = _ljson_parse_null_values(lms_dict['landmarks']['points'])
     connectivity = lms_dict['landmarks'].get('connectivity')
 
@@ -339,6 +367,7 @@ def _parse_ljson_v2(lms_dict):
 
 
 def _parse_ljson_v3(lms_dict):
+    from menpo.shape import PointCloud, LabelledPointUndirectedGraph
     all_lms = {}
     for key, lms_dict_group in lms_dict['groups'].items():
         points = _ljson_parse_null_values(lms_dict_group['landmarks']['points'])
@@ -391,12 +420,60 @@ def ljson_importer(filepath, **kwargs):
     landmarks : `dict` {`str`: :map:`PointCloud`}
         Dictionary mapping landmark groups to menpo shapes
     """
+    lms_dict, version = _load_ljson(filepath)
+    return _ljson_parser_for_version[version](lms_dict)
+
+
+def _ljson_points_v1(lms_dict):
+    return [p['point'] for group in lms_dict['groups']
+            for p in group['landmarks']]
+
+
+def _ljson_points_v2(lms_dict):
+    return lms_dict['landmarks']['points']
+
+
+def _ljson_points_v3(lms_dict):
+    # The first group, as ordered in the file
+    group = next(iter(lms_dict['groups'].values()))
+    return group['landmarks']['points']
+
+
+_ljson_points_for_version = {
+    1: _ljson_points_v1,
+    2: _ljson_points_v2,
+    3: _ljson_points_v3
+}
+
+
+def ljson_points_importer(filepath, **kwargs):
+    r"""
+    Importer for just the points of the first landmark group of a Menpo JSON
+    file, see :func:`ljson_importer`. No labels or connectivity are built.
+
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute filepath of the file.
+    \**kwargs : `dict`, optional
+        Any other keyword arguments.
+
+    Returns
+    -------
+    points : ``(n_points, n_dims)`` `ndarray`
+        The points of the first landmark group.
+    """
+    lms_dict, version = _load_ljson(filepath)
+    points_list = _ljson_points_for_version[version](lms_dict)
+    return _ljson_parse_null_values(points_list)
+
+
+def _load_ljson(filepath):
     with filepath.open('r') as f:
         lms_dict = json.load(f, object_pairs_hook=OrderedDict)
     version = lms_dict.get('version')
-    parser = _ljson_parser_for_version.get(version)
 
-    if parser is None:
+    if version not in _ljson_parser_for_version:
         raise ValueError("{} has unknown version {} - must be "
                          "1, or 2 or 3.".format(filepath, version))
     if version != 3:
@@ -406,5 +483,4 @@ def ljson_importer(filepath, **kwargs):
                       'files to v3 by importing into Menpo and re-exporting to '
                       'overwrite the files.'.format(version),
                       MenpoDeprecationWarning)
-
-    return parser(lms_dict)
+    return lms_dict, version
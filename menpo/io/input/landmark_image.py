@@ -1,8 +1,11 @@
 from menpo.base import partial_doc
 
-from .landmark import asf_importer, pts_importer
+from .landmark import asf_importer, pts_importer, pts_points_importer
 
 
 asf_image_importer = partial_doc(asf_importer, image_origin=True)
 
 pts_image_importer = partial_doc(pts_importer, image_origin=True)
+
+pts_image_points_importer = partial_doc(pts_points_importer,
+                                        image_origin=True)
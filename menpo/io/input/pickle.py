@@ -58,3 +58,102 @@ def pickle_gzip_importer(filepath, asset=None, **kwargs):
     with gzip.open(str(filepath), 'rb') as f:
         x = _unpickle_with_encoding(f, encoding=kwargs.get('encoding'))
     return x
+
+
+def unpickle_arrays_out_of_band(filepath, mmap_mode='c'):
+    r"""Import a pickle file that was exported with
+    :func:`menpo.io.output.pickle.pickle_arrays_out_of_band`. The arrays that
+    were stored out-of-band are memory-mapped rather than read into memory.
+
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute filepath of the pickle file.
+    mmap_mode : ``{None, 'r', 'r+', 'c'}``, optional
+        The mode used to memory-map the arrays, see ``numpy.load``. By default
+        the arrays are copy-on-write - they can be modified in memory without
+        altering the files on disk.
+
+    Returns
+    -------
+    object : `object`
+        The pickled objects.
+    """
+    import numpy as np
+    filepath = str(filepath)
+    # Shared arrays are only stored once - so only map them once
+    loaded = {}
+
+    def persistent_load(pid):
+        if isinstance(pid, bytes):
+            pid = pid.decode()
+        kind, i = pid.split(':')
+        if kind != 'ndarray':
+            raise pickle.UnpicklingError('Unknown persistent id: '
+                                         '{}'.format(pid))
+        if i not in loaded:
+            loaded[i] = np.load('{}.{}.npy'.format(filepath, i),
+                                mmap_mode=mmap_mode)
+        return loaded[i]
+
+    with open(filepath, 'rb') as f:
+        return _unpickle_with_persistent_load(f, persistent_load)
+
+
+def _unpickle_with_persistent_load(f, persistent_load):
+    # The inverse of menpo.io.output.pickle._pickle_with_persistent_id
+    unpickler = pickle.Unpickler(f)
+    unpickler.persistent_load = persistent_load
+    return unpickler.load()
+
+
+class _IndexedDirectory(object):
+    r"""
+    Base class for the directories of memory-mapped buffers that are
+    described by a pickled index, as written by ``pack_archive`` and
+    ``pack_dataset``. The index is written last, so a directory without one
+    is incomplete.
+
+    Subclasses set ``_index_filename``, ``_version`` and ``_description``, and
+    implement ``_init_from_index`` to open their buffers.
+    """
+
+    def __init__(self, path, mmap_mode='c'):
+        self.path = path
+        self.mmap_mode = mmap_mode
+        self._open()
+
+    def _open(self):
+        index_path = self.path / self._index_filename
+        if not index_path.is_file():
+            raise ValueError('{} is not a (complete) {} - no {} was '
+                             'found'.format(self.path, self._description,
+                                            self._index_filename))
+        with open(str(index_path), 'rb') as f:
+            index = pickle.load(f)
+        if index['version'] > self._version:
+            raise ValueError('The {} {} has version {}, which is newer than '
+                             'the supported version '
+                             '{}'.format(self._description, self.path,
+                                         index['version'], self._version))
+        self._init_from_index(index)
+
+    def _init_from_index(self, index):
+        raise NotImplementedError()
+
+    def _memmap(self, filename, dtype, mode=None):
+        # numpy can't memory-map empty files
+        import numpy as np
+        path = self.path / filename
+        if path.stat().st_size == 0:
+            return None
+        return np.memmap(str(path), dtype=dtype,
+                         mode=self.mmap_mode if mode is None else mode)
+
+    def __getstate__(self):
+        # Reopen the buffers rather than copying them into the pickle
+        return {'path': self.path, 'mmap_mode': self.mmap_mode}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
@@ -1,22 +1,35 @@
 import warnings
 import os
+from functools import partial
+from multiprocessing import cpu_count
+import threading
+import weakref
 import numpy as np
 import subprocess as sp
 import re
 from pathlib import Path
 
-from menpo.image.base import normalize_pixels_range, channels_to_front
-from menpo.image import Image
-from menpo.base import LazyList
+from menpo.base import LazyList, LazyListCache
 
-from ..utils import DEVNULL, _call_subprocess
+from ..utils import DEVNULL, _call_subprocess, _norm_path
 
 
 _FFMPEG_CMD = lambda: str(Path(os.environ.get('MENPO_FFMPEG_CMD', 'ffmpeg')))
 _FFPROBE_CMD = lambda: str(Path(os.environ.get('MENPO_FFPROBE_CMD', 'ffprobe')))
 
+# The estimated cost of reopening the pipe (spawning ffmpeg and seeking in the
+# file), measured in the number of frames that could be decoded instead
+_REOPEN_COST_IN_FRAMES = 15
 
-def ffmpeg_importer(filepath, normalize=True, exact_frame_count=True, **kwargs):
+# Limits the number of background threads (over all videos) that are reading
+# frames at any one time
+_READ_AHEAD_SLOTS = threading.BoundedSemaphore(cpu_count())
+
+
+def ffmpeg_importer(filepath, normalize=True, exact_frame_count=True,
+                    keyframe_index=None, cache_bytes=None, shape=None,
+                    greyscale=False, crop=None, read_ahead=None,
+                    return_transform=False, **kwargs):
     r"""
     Imports videos by streaming frames from a pipe using FFMPEG. Returns a
     :map:`LazyList` that gives lazy access to the video on a per-frame basis.
@@ -41,6 +54,21 @@ def ffmpeg_importer(filepath, normalize=True, exact_frame_count=True, **kwargs):
     exact_frame_count: `bool`, optional
         If ``True``, the import fails if ffprobe is not available
         (reading from ffmpeg's output returns inexact frame count)
+    keyframe_index : `bool` or `Path`, optional
+        See :map:`FFMpegVideoReader`.
+    cache_bytes : `int`, optional
+        See :map:`FFMpegVideoReader`.
+    shape : ``(height, width)`` `tuple`, optional
+        See :map:`FFMpegVideoReader`.
+    greyscale : `bool`, optional
+        See :map:`FFMpegVideoReader`.
+    crop : ``(min_indices, max_indices)`` `tuple`, optional
+        See :map:`FFMpegVideoReader`.
+    read_ahead : `int`, optional
+        See :map:`FFMpegVideoReader`.
+    return_transform : `bool`, optional
+        If ``True``, then the transform from the coordinates of the frames of
+        the video file to those of the imported frames is also returned.
     \**kwargs : `dict`, optional
         Any other keyword arguments.
 
@@ -49,11 +77,23 @@ def ffmpeg_importer(filepath, normalize=True, exact_frame_count=True, **kwargs):
     image : :map:`LazyList`
         A :map:`LazyList` containing :map:`Image` or subclasses per frame
         of the video.
+    transform : :map:`Affine` or ``None``
+        The effect of ``crop`` and ``shape`` on the coordinates of the
+        frames, see :meth:`FFMpegVideoReader.decode_transform`. Only returned
+        if ``return_transform`` is ``True``.
     """
-    reader = FFMpegVideoReader(filepath, normalize=normalize, exact_frame_count=exact_frame_count)
+    from menpo.image import Image
+    reader = FFMpegVideoReader(filepath, normalize=normalize,
+                               exact_frame_count=exact_frame_count,
+                               keyframe_index=keyframe_index,
+                               cache_bytes=cache_bytes, shape=shape,
+                               greyscale=greyscale, crop=crop,
+                               read_ahead=read_ahead)
     ll = LazyList.init_from_index_callable(lambda x: Image.init_from_channels_at_back(reader[x]), len(reader))
     ll.fps = reader.fps
 
+    if return_transform:
+        return ll, reader.decode_transform()
     return ll
 
 
@@ -84,8 +124,46 @@ class FFMpegVideoReader(object):
     exact_frame_count : `bool`, optional
         If True, the import fails if ffmprobe is not available
         (reading from ffmpeg's output returns inexact frame count)
+    keyframe_index : `bool` or `Path`, optional
+        If ``True``, the keyframes of the video are found with ffprobe so that
+        each seek restarts decoding from the cheapest point - a forward seek
+        past a keyframe reopens the video rather than decoding every frame in
+        between. If a `Path`, the keyframes are also stored in (and reused
+        from) that file, until the video changes. If ``None``, every
+        backward seek reopens the video and every forward seek decodes all of
+        the frames in between.
+    cache_bytes : `int`, optional
+        If not ``None``, the memory budget (in bytes) of an LRU cache of
+        decoded frames. Every frame that is decoded, including those decoded
+        whilst seeking, is cached. Combined with ``keyframe_index``, a seek
+        restarts at the keyframe before the frame so that random access to
+        nearby frames costs about one group of pictures of decoding.
+    shape : ``(height, width)`` `tuple`, optional
+        If not ``None``, ffmpeg scales the (cropped) frames to this shape
+        whilst decoding.
+    greyscale : `bool`, optional
+        If ``True``, ffmpeg converts the frames to a single greyscale channel
+        whilst decoding.
+    crop : ``(min_indices, max_indices)`` `tuple`, optional
+        If not ``None``, ffmpeg crops the frames to the pixels from
+        ``min_indices`` (inclusive) to ``max_indices`` (exclusive), both
+        ``(y, x)``, whilst decoding, before any scaling.
+    read_ahead : `int`, optional
+        If not ``None``, consecutive frames are read by a background thread
+        into a queue of up to ``read_ahead`` frames as soon as frames are
+        accessed in order, so that reading the video overlaps with processing
+        the frames. Any other access stops the thread. The number of threads
+        reading frames at once, over all videos, is limited to the number of
+        CPUs.
+
+    Raises
+    ------
+    ValueError
+        If ``crop`` is not within the frames of the video.
     """
-    def __init__(self, filepath, normalize=False, exact_frame_count=True):
+    def __init__(self, filepath, normalize=False, exact_frame_count=True,
+                 keyframe_index=None, cache_bytes=None, shape=None,
+                 greyscale=False, crop=None, read_ahead=None):
         self.filepath = filepath
         self.normalize = normalize
         self.exact_frame_count = exact_frame_count
@@ -106,6 +184,29 @@ class FFMpegVideoReader(object):
         self.height = infos['height']
         self.n_frames = infos['n_frames']
         self.fps = infos['fps']
+        self.shape = shape
+        self.greyscale = greyscale
+        self.crop = crop
+        if crop is not None:
+            min_indices, max_indices = np.array(crop[0]), np.array(crop[1])
+            if (np.any(min_indices < 0) or np.any(max_indices <= min_indices) or
+                    np.any(max_indices > [self.height, self.width])):
+                raise ValueError('Invalid crop {} for frames of shape '
+                                 '{}'.format(crop, (self.height, self.width)))
+            self.crop = (tuple(int(i) for i in min_indices),
+                         tuple(int(i) for i in max_indices))
+        self.keyframes = None
+        if keyframe_index is not None and keyframe_index is not False:
+            self.keyframes = _load_keyframe_index(self.filepath, self.fps,
+                                                  keyframe_index)
+        self.cache = None
+        if cache_bytes is not None:
+            self.cache = LazyListCache(max_bytes=cache_bytes)
+        if read_ahead is not None and read_ahead <= 0:
+            raise ValueError('read_ahead must be positive '
+                             '({} provided)'.format(read_ahead))
+        self.read_ahead = read_ahead
+        self._read_ahead_thread = None
         # contains the index of the last read frame
         # the index is updated in _open_pipe, _read_one_frame and _trash_frames
         self.index = -1
@@ -124,8 +225,15 @@ class FFMpegVideoReader(object):
         r"""
         Close the pipe if open.
         """
+        self._stop_read_ahead()
         self._shutdown_pipe()
 
+    def _stop_read_ahead(self):
+        read_ahead_thread = getattr(self, '_read_ahead_thread', None)
+        if read_ahead_thread is not None:
+            read_ahead_thread.stop()
+            self._read_ahead_thread = None
+
     def __len__(self):
         return self.n_frames
 
@@ -143,21 +251,19 @@ class FFMpegVideoReader(object):
         ----
         Since v.2.1 of ffmpeg, this is frame-accurate
         """
+        pix_fmt = 'gray' if self.greyscale else 'rgb24'
         if frame is not None and frame > 0:
             time = str(frame / float(self.fps))
             command = [_FFMPEG_CMD(),
                        '-ss', time,
-                       '-i', str(self.filepath),
-                       '-f', 'image2pipe',
-                       '-pix_fmt', 'rgb24',
-                       '-vcodec', 'rawvideo', '-']
+                       '-i', str(self.filepath)]
         else:
             command = [_FFMPEG_CMD(),
-                       '-i', str(self.filepath),
-                       '-f', 'image2pipe',
-                       '-pix_fmt', 'rgb24',
-                       '-vcodec', 'rawvideo', '-']
+                       '-i', str(self.filepath)]
             frame = 0
+        command += self._filter_args() + ['-f', 'image2pipe',
+                                          '-pix_fmt', pix_fmt,
+                                          '-vcodec', 'rawvideo', '-']
 
         self._shutdown_pipe()
         self._pipe = sp.Popen(command, stdout=sp.PIPE, stdin=DEVNULL,
@@ -172,7 +278,6 @@ class FFMpegVideoReader(object):
 
         Only opens the pipe once at the beginning
         """
-        self.index = 0
         for index in range(self.n_frames):
             yield self[index]
 
@@ -180,46 +285,419 @@ class FFMpegVideoReader(object):
         r"""
         Get a specific frame from the video
         """
-        # If the user is reading consecutive frames, or a frame later in the
-        # video, do not reopen a pipe
-        if self._pipe is None or self._pipe.poll() is not None or index <= self.index:
-            self._open_pipe(frame=index)
+        if self.cache is None:
+            if self.read_ahead is None:
+                self._seek(index)
+                return self._read_one_frame()
+            # A freshly read frame that is not shared with anything else
+            frame = self._read_raw_frame_at(index)
         else:
+            frame = self.cache._get(index,
+                                    partial(self._read_raw_frame_at, index))
+        if self.normalize:
+            from menpo.image.base import normalize_pixels_range
+            return normalize_pixels_range(frame)
+        elif self.cache is None:
+            return frame
+        # The cached frame must not be altered by the caller
+        return frame.copy()
+
+    def _seek(self, index):
+        r"""
+        Position the pipe so that the next frame read is frame ``index``.
+        """
+        # If the user is reading consecutive frames, or a frame later in the
+        # video, do not reopen a pipe - unless restarting from a keyframe
+        # is cheaper than decoding all of the frames in between.
+        to_trash = index - self.index - 1
+        if (self._pipe is None or self._pipe.poll() is not None or
+                to_trash < 0 or self._cheaper_to_reopen(index)):
+            self._open_pipe(frame=self._restart_frame(index))
             to_trash = index - self.index - 1
-            if to_trash > 0:
-                self._trash_frames(to_trash)
+        if to_trash > 0:
+            self._trash_frames(to_trash)
+
+    def _keyframe_before(self, index):
+        i = np.searchsorted(self.keyframes, index, side='right') - 1
+        return int(self.keyframes[i]) if i >= 0 else 0
+
+    def _cheaper_to_reopen(self, index):
+        if self.keyframes is None:
+            return False
+        # A reopened pipe only has to decode from the keyframe before index
+        return (self._keyframe_before(index) - (self.index + 1) >
+                _REOPEN_COST_IN_FRAMES)
+
+    def _restart_frame(self, index):
+        if self.keyframes is None or self.cache is None:
+            # ffmpeg decodes up to the frame without piping the frames out
+            return index
+        # Restart at the keyframe so that the whole group of pictures before
+        # the frame is decoded into the cache
+        return self._keyframe_before(index)
+
+    @property
+    def _frame_shape(self):
+        if self.shape is not None:
+            shape = tuple(self.shape)
+        elif self.crop is not None:
+            shape = tuple(np.subtract(self.crop[1], self.crop[0]))
+        else:
+            shape = self.height, self.width
+        return shape + (1 if self.greyscale else 3,)
+
+    @property
+    def _frame_nbytes(self):
+        return int(np.prod(self._frame_shape))
 
-        return self._read_one_frame()
+    def _filter_args(self):
+        r"""
+        The ffmpeg arguments that crop and scale the frames whilst decoding.
+        """
+        filters = []
+        if self.crop is not None:
+            (min_y, min_x), (max_y, max_x) = self.crop
+            filters.append('crop={}:{}:{}:{}'.format(max_x - min_x,
+                                                     max_y - min_y,
+                                                     min_x, min_y))
+        if self.shape is not None:
+            filters.append('scale={}:{}'.format(self.shape[1], self.shape[0]))
+        return ['-vf', ','.join(filters)] if filters else []
+
+    def decode_transform(self):
+        r"""
+        The transform mapping points on the frames of the video file to the
+        frames returned by this reader, i.e. the effect of ``crop`` and
+        ``shape``.
+
+        Returns
+        -------
+        transform : :map:`Affine` or ``None``
+            The transform, or ``None`` if the frames are neither cropped nor
+            scaled.
+        """
+        from menpo.transform import Translation, NonUniformScale
+        if self.crop is None and self.shape is None:
+            return None
+        min_indices = np.zeros(2)
+        source_shape = np.array([self.height, self.width])
+        if self.crop is not None:
+            min_indices = np.array(self.crop[0])
+            source_shape = np.subtract(self.crop[1], self.crop[0])
+        scale = np.array(self._frame_shape[:2]) / source_shape.astype(float)
+        return Translation(-min_indices).compose_before(NonUniformScale(scale))
+
+    def _readinto(self, buffer):
+        r"""
+        Fill ``buffer`` (any object supporting the writable buffer protocol)
+        from the pipe without any intermediate copies.
+        """
+        if isinstance(buffer, np.ndarray):
+            # A flat byte view of the (contiguous) array
+            buffer = buffer.reshape(-1).view(np.uint8)
+        view = memoryview(buffer)
+        n_bytes = len(view)
+        offset = 0
+        # A pipe may return less than was asked for, so keep reading until
+        # the buffer is full
+        while offset < n_bytes:
+            n_read = self._pipe.stdout.readinto(view[offset:])
+            if not n_read:
+                raise ValueError('Unexpected end of the video {} whilst '
+                                 'reading frame {}'.format(self.filepath,
+                                                           self.index + 1))
+            offset += n_read
 
     def _trash_frames(self, n_frames):
         r"""
         Reads and trashes the data corresponding to ``n_frames``
         """
-        _ = self._pipe.stdout.read(self.height*self.width*3*n_frames)
-        self._pipe.stdout.flush()
-        self.index += n_frames
-
-    def _read_one_frame(self):
+        if self.cache is not None:
+            for _ in range(n_frames):
+                frame = self._read_raw_frame()
+                self.cache._put(self.index, frame)
+            return
+        # The same frame sized buffer is reused for every skipped frame
+        if getattr(self, '_trash_buffer', None) is None or \
+                len(self._trash_buffer) != self._frame_nbytes:
+            self._trash_buffer = bytearray(self._frame_nbytes)
+        for _ in range(n_frames):
+            self._readinto(self._trash_buffer)
+            self.index += 1
+
+    def _read_one_frame(self, out=None):
         r"""
-        Reads one frame from the opened ``self._pipe`` and converts it to
-        a numpy array
+        Reads one frame from the opened ``self._pipe`` directly into a numpy
+        array
+
+        Parameters
+        ----------
+        out : ``(height, width, n_channels)`` `uint8 ndarray`, optional
+            The array to read the frame into. If ``None``, a new array is
+            allocated. Ignored if ``self.normalize`` is ``True``.
 
         Returns
         -------
-        image : :map:`Image`
-            Image of shape ``(self.height, self.width, 3)``
+        frame : ``(height, width, n_channels)`` `ndarray`
+            The frame, normalized if ``self.normalize`` is ``True``.
         """
-        raw_data = self._pipe.stdout.read(self.height*self.width*3)
-        frame = np.fromstring(raw_data, dtype=np.uint8)
-        frame = frame.reshape((self.height, self.width, 3))
-        self._pipe.stdout.flush()
-        self.index += 1
+        if self.normalize:
+            out = None
+        frame = self._read_raw_frame(out=out)
 
         if self.normalize:
+            from menpo.image.base import normalize_pixels_range
             frame = normalize_pixels_range(frame)
 
         return frame
 
+    def _read_raw_frame(self, out=None):
+        if out is None:
+            out = np.empty(self._frame_shape, dtype=np.uint8)
+        self._readinto(out)
+        self.index += 1
+        return out
+
+    def _read_raw_frame_at(self, index):
+        if self.read_ahead is not None:
+            read_ahead_thread = self._read_ahead_thread
+            if (read_ahead_thread is None or
+                    read_ahead_thread.next_index != index):
+                # Not the next frame - (re)start reading from this one
+                self._stop_read_ahead()
+                read_ahead_thread = _ReadAheadThread(self, index,
+                                                     self.read_ahead)
+                self._read_ahead_thread = read_ahead_thread
+            return read_ahead_thread.get()
+        self._seek(index)
+        return self._read_raw_frame()
+
+    def read_range(self, start, stop, out=None):
+        r"""
+        Read the consecutive frames ``[start, stop)`` from the video into a
+        single block, with one read from the pipe.
+
+        Parameters
+        ----------
+        start : `int`
+            The index of the first frame to read.
+        stop : `int`
+            The index after the last frame to read.
+        out : ``(stop - start, height, width, n_channels)`` `ndarray`, optional
+            The C-contiguous array to read the frames into, e.g. a buffer that
+            is reused between calls. It must be ``uint8`` unless
+            ``self.normalize`` is ``True``, in which case it must be a float
+            array that the normalized frames are written to. If ``None``, a
+            new array is allocated.
+
+        Returns
+        -------
+        frames : ``(stop - start, height, width, n_channels)`` `ndarray`
+            The frames, normalized if ``self.normalize`` is ``True``.
+
+        Raises
+        ------
+        ValueError
+            If the range is not within the video, or ``out`` has the wrong
+            shape or dtype or is not C-contiguous.
+        """
+        if not 0 <= start < stop <= self.n_frames:
+            raise ValueError('Invalid range [{}, {}) for a video of {} '
+                             'frames'.format(start, stop, self.n_frames))
+        shape = (stop - start,) + self._frame_shape
+        if out is not None:
+            if out.shape != shape or not out.flags.c_contiguous:
+                raise ValueError('out must be a C-contiguous array of shape '
+                                 '{} ({} provided)'.format(shape, out.shape))
+            if self.normalize:
+                valid_dtype = np.issubdtype(out.dtype, np.floating)
+            else:
+                valid_dtype = out.dtype == np.uint8
+            if not valid_dtype:
+                raise ValueError('out must be a {} array ({} '
+                                 'provided)'.format('float' if self.normalize
+                                                    else 'uint8', out.dtype))
+        if out is None or self.normalize:
+            frames = np.empty(shape, dtype=np.uint8)
+        else:
+            frames = out
+
+        self._stop_read_ahead()
+        self._seek(start)
+        self._readinto(frames)
+        self.index = stop - 1
+
+        if self.normalize:
+            from menpo.image.base import normalize_pixels_range
+            if out is None:
+                out = normalize_pixels_range(frames)
+            else:
+                np.multiply(frames, 1.0 / np.iinfo(np.uint8).max, out=out)
+            return out
+        return frames
+
+
+class _ReadAheadThread(object):
+    r"""
+    Reads the consecutive frames of ``reader`` from frame ``start`` in a
+    background thread, into a queue of at most ``read_ahead`` frames.
+
+    Whilst running, the thread owns the pipe of the reader - it must be
+    stopped before the reader is used in any other way.
+    """
+
+    def __init__(self, reader, start, read_ahead):
+        try:
+            from queue import Queue
+        except ImportError:  # Py2
+            from Queue import Queue
+        self.next_index = start
+        self._queue = Queue(maxsize=read_ahead)
+        self._stop = threading.Event()
+        # Only a weak reference, so an abandoned reader can still be collected
+        self._thread = threading.Thread(
+            target=_read_ahead, args=(weakref.ref(reader), start,
+                                      self._queue, self._stop))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def get(self):
+        frame, error = self._queue.get()
+        if error is not None:
+            self._stop.set()
+            raise error
+        self.next_index += 1
+        return frame
+
+    def stop(self):
+        try:
+            from queue import Empty
+        except ImportError:  # Py2
+            from Queue import Empty
+        self._stop.set()
+        if threading.current_thread() is self._thread:
+            # The reader was collected by the thread itself, which will exit
+            return
+        # Unblock the thread if it is waiting for space in the queue
+        while self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.01)
+            except Empty:
+                pass
+        self._thread.join()
+
+
+def _read_ahead(reader_ref, start, queue, stop):
+    try:
+        from queue import Full
+    except ImportError:  # Py2
+        from Queue import Full
+    index = start
+    while not stop.is_set():
+        reader = reader_ref()
+        if reader is None:
+            return
+        error = None
+        with _READ_AHEAD_SLOTS:
+            try:
+                if index >= reader.n_frames:
+                    raise ValueError('Frame {} is beyond the end of the '
+                                     'video'.format(index))
+                if index == start:
+                    reader._seek(index)
+                frame = reader._read_raw_frame()
+            except Exception as e:
+                frame, error = None, e
+        del reader
+        while not stop.is_set():
+            try:
+                queue.put((frame, error), timeout=0.1)
+                break
+            except Full:
+                if reader_ref() is None:
+                    return
+        if error is not None:
+            return
+        index += 1
+
+
+def video_keyframes_ffprobe(filepath, fps):
+    r"""
+    Find the keyframes of a video using ffprobe. Only the packet headers of
+    the video are read - no frame is decoded.
+
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute path to the video file.
+    fps : `float`
+        The frame rate of the video, used to convert the timestamps of the
+        keyframes into frame indices.
+
+    Returns
+    -------
+    keyframes : ``(n_keyframes,)`` `ndarray`
+        The sorted indices of the keyframes.
+
+    Raises
+    ------
+    ValueError
+        If no keyframes are found.
+    """
+    p = sp.Popen(
+        [_FFPROBE_CMD(), '-v', 'quiet',
+         '-select_streams', 'v:0',              # Only show the first stream
+         '-show_entries', 'packet=pts_time,flags',
+         '-of', 'csv=print_section=0',          # Output format is pts,flags
+         str(filepath)],
+        stdin=sp.PIPE,
+        stdout=sp.PIPE,
+        stderr=sp.PIPE,
+    )
+    with _call_subprocess(p) as pipe:
+        stdout_output = pipe.stdout.readlines()
+    del p
+
+    times, keyframe_times = [], []
+    for line in stdout_output:
+        values = line.decode().strip().split(',')
+        if len(values) < 2 or values[0] == 'N/A':
+            continue
+        time = float(values[0])
+        times.append(time)
+        if 'K' in values[1]:
+            keyframe_times.append(time)
+    if not keyframe_times:
+        raise ValueError('Unable to find the keyframes of {}'.format(filepath))
+    # Timestamps are relative to the start of the stream
+    keyframe_times = np.array(keyframe_times) - min(times)
+    return np.unique(np.round(keyframe_times * fps).astype(np.int64))
+
+
+def _load_keyframe_index(filepath, fps, keyframe_index):
+    r"""
+    Find the keyframes of the video at ``filepath``. If ``keyframe_index`` is
+    a path, the keyframes are read from there if that file is up to date with
+    the video, else they are found with ffprobe and stored there.
+    """
+    if keyframe_index is True:
+        return video_keyframes_ffprobe(filepath, fps)
+    from .pickle import pickle
+    from ..output.pickle import _atomic_write
+
+    index_path = _norm_path(keyframe_index)
+    stat = Path(str(filepath)).stat()
+    video = (stat.st_size, stat.st_mtime)
+    if index_path.is_file():
+        with open(str(index_path), 'rb') as f:
+            index = pickle.load(f)
+        if index.get('video') == video and index.get('fps') == fps:
+            return index['keyframes']
+    keyframes = video_keyframes_ffprobe(filepath, fps)
+    index = {'video': video, 'fps': fps, 'keyframes': keyframes}
+    _atomic_write(index_path, lambda f: pickle.dump(index, f, protocol=2))
+    return keyframes
+
 
 def video_infos_ffmpeg(filepath):
     r"""
@@ -1,2 +1,3 @@
-from .base import (export_landmark_file, export_image, export_pickle,
-                   export_video)
+from .base import (export_landmark_file, export_landmark_files,
+                   export_image, export_images, export_pickle,
+                   export_video, export_dataset, export_archive)
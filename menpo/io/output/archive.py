@@ -0,0 +1,119 @@
+import io
+
+from .pickle import (_pickle_with_persistent_id, _prepare_index_dir,
+                     _write_index)
+
+# The files making up a pickle archive directory
+ARRAYS_FILENAME = 'arrays.bin'
+CHUNKS_FILENAME = 'chunks.bin'
+INDEX_FILENAME = 'index.pkl'
+ARCHIVE_VERSION = 1
+COMPRESSIONS = (None, 'zlib')
+# Out-of-band arrays are aligned so that they can be used directly from a
+# memory map
+ARRAY_ALIGNMENT = 64
+
+
+def pack_archive(objs, path, chunk_size=1, compression='zlib',
+                 compresslevel=1, min_array_bytes=1024, protocol=2):
+    r"""
+    Pack ``objs`` into an archive directory at ``path`` that can be imported
+    with :func:`menpo.io.input.archive.PickleArchive`.
+
+    Every object is pickled separately. Arrays of at least
+    ``min_array_bytes`` are stored (uncompressed) in a single
+    ``arrays.bin`` buffer rather than in the pickle, so that they can be
+    memory-mapped on import. The pickles of ``chunk_size`` consecutive objects
+    are concatenated into a chunk which is compressed on its own and appended
+    to ``chunks.bin``. The offset of every chunk and of every object within
+    its (decompressed) chunk is stored in ``index.pkl``, which is written
+    last - its presence therefore marks a complete export.
+
+    Parameters
+    ----------
+    objs : `iterable` of `object`
+        The objects to pack.
+    path : `Path`
+        The directory to pack the objects into. It is created if it doesn't
+        exist.
+    chunk_size : `int`, optional
+        The number of objects that are compressed together.
+    compression : ``{'zlib', None}``, optional
+        The compression applied to each chunk.
+    compresslevel : `int`, optional
+        The zlib compression level, from ``1`` (fastest) to ``9`` (smallest).
+    min_array_bytes : `int`, optional
+        The minimum size of an array that is stored out-of-band.
+    protocol : `int`, optional
+        The Pickle protocol used to serialize the objects.
+
+    Raises
+    ------
+    ValueError
+        If ``chunk_size`` is not positive or ``compression`` is unknown.
+    """
+    if chunk_size <= 0:
+        raise ValueError('chunk_size must be positive '
+                         '({} provided)'.format(chunk_size))
+    if compression not in COMPRESSIONS:
+        raise ValueError('compression must be one of {} ({} '
+                         'provided)'.format(COMPRESSIONS, compression))
+    index_path = _prepare_index_dir(path, INDEX_FILENAME)
+
+    # (start, end) of each chunk in chunks.bin
+    chunk_offsets = []
+    # (chunk, start, end) of each object within its decompressed chunk
+    item_offsets = []
+    with open(str(path / ARRAYS_FILENAME), 'wb') as arrays_f, \
+            open(str(path / CHUNKS_FILENAME), 'wb') as chunks_f:
+        chunk = io.BytesIO()
+        for obj in objs:
+            start = chunk.tell()
+            _pickle_with_arrays_out_of_band(obj, chunk, arrays_f,
+                                            min_array_bytes, protocol)
+            item_offsets.append((len(chunk_offsets), start, chunk.tell()))
+            if len(item_offsets) % chunk_size == 0:
+                _write_chunk(chunk, chunks_f, chunk_offsets, compression,
+                             compresslevel)
+                chunk = io.BytesIO()
+        if len(item_offsets) % chunk_size != 0:
+            _write_chunk(chunk, chunks_f, chunk_offsets, compression,
+                         compresslevel)
+
+    index = {'version': ARCHIVE_VERSION,
+             'compression': compression,
+             'chunk_offsets': chunk_offsets,
+             'item_offsets': item_offsets}
+    _write_index(index_path, index, protocol)
+
+
+def _write_chunk(chunk, chunks_f, chunk_offsets, compression, compresslevel):
+    import zlib
+    data = chunk.getvalue()
+    if compression == 'zlib':
+        data = zlib.compress(data, compresslevel)
+    start = chunks_f.tell()
+    chunks_f.write(data)
+    chunk_offsets.append((start, chunks_f.tell()))
+
+
+def _pickle_with_arrays_out_of_band(obj, f, arrays_f, min_array_bytes,
+                                    protocol):
+    import numpy as np
+    # Arrays are only shared within an object - the ids of arrays belonging
+    # to previous objects may have been reused already
+    array_ids = {}
+
+    def persistent_id(x):
+        if (isinstance(x, np.ndarray) and not x.dtype.hasobject and
+                x.nbytes >= min_array_bytes):
+            if id(x) not in array_ids:
+                padding = -arrays_f.tell() % ARRAY_ALIGNMENT
+                arrays_f.write(b'\0' * padding)
+                offset = arrays_f.tell()
+                arrays_f.write(np.ascontiguousarray(x).tobytes())
+                array_ids[id(x)] = ('ndarray', offset, x.dtype.str, x.shape)
+            return array_ids[id(x)]
+        return None
+
+    _pickle_with_persistent_id(obj, f, persistent_id, protocol)
@@ -56,7 +56,11 @@ def export_landmark_file(landmarks_object, fp, extension=None, overwrite=False):
         The provided type for landmarks_object is not supported.
     """
     extension = _normalize_extension(extension)
+    _validate_landmarks_object(landmarks_object, fp, extension)
+    _export(landmarks_object, fp, landmark_types, extension, overwrite)
+
 
+def _validate_landmarks_object(landmarks_object, fp, extension):
     try:
         landmarks_object.n_points
     except AttributeError:
@@ -69,7 +73,6 @@ def export_landmark_file(landmarks_object, fp, extension=None, overwrite=False):
                   'case your input should be a PointCloud or '
                   'subclass.')
             raise ValueError(m1)
-    _export(landmarks_object, fp, landmark_types, extension, overwrite)
 
 
 def export_image(image, fp, extension=None, overwrite=False):
@@ -227,6 +230,302 @@ def export_pickle(obj, fp, overwrite=False, protocol=2):
                 exporter_kwargs=exporter_kwargs)
 
 
+def export_dataset(images, path, overwrite=False, dtype=None, verbose=False):
+    r"""
+    Packs a collection of images, along with their landmarks, into a single
+    dataset directory that can be imported with :func:`import_dataset`.
+
+    The pixels of all the images are stored contiguously in one file, as are
+    the points of all the landmark groups. Importing the dataset memory-maps
+    these files, so accessing an image costs a page fault rather than
+    decoding an image file and parsing its landmark files.
+
+    Parameters
+    ----------
+    images : `iterable` of :map:`Image`
+        The images to export, e.g. a :map:`LazyList` returned by
+        :func:`import_images`.
+    path : `Path`
+        The directory to save the dataset in.
+    overwrite : `bool`, optional
+        Whether or not to overwrite the dataset if it already exists.
+    dtype : `numpy.dtype`, optional
+        The dtype the pixels are stored with. If ``None``, floating point
+        pixels are stored as ``float32`` and all other pixels keep their
+        dtype. To store ``uint8`` pixels, import the images with
+        ``normalize=False``. Floating point and integer pixels can't be
+        mixed, as they are on different scales.
+    verbose : `bool`, optional
+        If ``True``, print the progress of the export.
+
+    Raises
+    ------
+    OverwriteError
+        The dataset already exists and ``overwrite`` != ``True``
+    ValueError
+        The pixels of an image cannot be safely cast to ``dtype``, or only
+        one of the pixels and ``dtype`` are floating point.
+    """
+    from .dataset import pack_dataset
+
+    path = _validate_filepath(path, overwrite)
+    if verbose:
+        images = _export_progress(images, 'Exporting dataset')
+    pack_dataset(images, path, dtype=dtype)
+
+
+def export_archive(objs, path, overwrite=False, chunk_size=1,
+                   compression='zlib', compresslevel=1, min_array_bytes=1024,
+                   protocol=2, verbose=False):
+    r"""
+    Exports a collection of Python objects as a pickle archive that can be
+    imported with :func:`import_archive`.
+
+    Unlike :func:`export_pickle`, each object is pickled (and compressed)
+    separately and the offset of each is stored in an index. Any one object
+    can therefore be imported without reading the rest of the archive.
+    Arrays of at least ``min_array_bytes`` are stored uncompressed outside
+    of the pickles, so that they can be memory-mapped on import.
+
+    Parameters
+    ----------
+    objs : `iterable` of `object`
+        The objects to export, e.g. a :map:`LazyList`.
+    path : `Path`
+        The directory to save the archive in.
+    overwrite : `bool`, optional
+        Whether or not to overwrite the archive if it already exists.
+    chunk_size : `int`, optional
+        The number of consecutive objects that are compressed together.
+        Larger chunks compress better, but importing any object requires
+        decompressing its whole chunk.
+    compression : ``{'zlib', None}``, optional
+        The compression applied to each chunk of objects.
+    compresslevel : `int`, optional
+        The zlib compression level, from ``1`` (fastest) to ``9`` (smallest).
+    min_array_bytes : `int`, optional
+        The minimum size (in bytes) of an array that is stored outside of the
+        pickles, uncompressed.
+    protocol : `int`, optional
+        The Pickle protocol used to serialize the objects. See
+        :func:`export_pickle`.
+    verbose : `bool`, optional
+        If ``True``, print the progress of the export.
+
+    Raises
+    ------
+    OverwriteError
+        The archive already exists and ``overwrite`` != ``True``
+    ValueError
+        If ``chunk_size`` is not positive or ``compression`` is unknown.
+    """
+    from .archive import pack_archive
+
+    path = _validate_filepath(path, overwrite)
+    if verbose:
+        objs = _export_progress(objs, 'Exporting archive')
+    pack_archive(objs, path, chunk_size=chunk_size, compression=compression,
+                 compresslevel=compresslevel, min_array_bytes=min_array_bytes,
+                 protocol=protocol)
+
+
+def _export_progress(objs, prefix):
+    r"""
+    Report the progress of exporting ``objs``. Generators have no length, so
+    for them only the number of exported objects is reported, at the end.
+    """
+    from menpo.visualize import print_progress
+    if hasattr(objs, '__len__'):
+        for x in print_progress(objs, prefix=prefix, n_items=len(objs)):
+            yield x
+    else:
+        n_items = 0
+        for x in objs:
+            yield x
+            n_items += 1
+        print('{}: {} items'.format(prefix, n_items))
+
+
+def export_images(images, path_template, extension=None, overwrite=False,
+                  n_workers=None, read_ahead=None, atomic=True, verbose=False):
+    r"""
+    Exports a collection of images, encoding and writing them in a pool of
+    ``n_workers`` threads.
+
+    The path of each image is found by formatting ``path_template`` with the
+    index of the image, ``i``, and the image itself, ``image``, e.g.
+    ``'./crops/{i:06d}.png'`` or ``'./crops/{image.path.stem}.png'``. Any
+    missing directories are created.
+
+    If ``images`` is a :map:`LazyList`, the images are also loaded in the
+    pool. At most ``read_ahead`` images are ever loaded but not yet written,
+    so memory usage is bounded however many images are exported.
+
+    Parameters
+    ----------
+    images : `list` or :map:`LazyList` of :map:`Image`
+        The images to export.
+    path_template : `str`
+        The template of the path of each image, formatted with ``i`` and
+        ``image``.
+    extension : `str` or None, optional
+        The extension to use, this must match the extension of every path.
+        Determines the type of exporter that is used.
+    overwrite : `bool`, optional
+        Whether or not to overwrite a file if it already exists.
+    n_workers : `int`, optional
+        The number of threads that images are exported in. If ``None``, the
+        number of CPUs on the machine is used.
+    read_ahead : `int`, optional
+        The maximum number of images that are loaded (or being exported) at
+        once. If ``None``, twice the number of workers is used.
+    atomic : `bool`, optional
+        If ``True``, each image is written to a temporary file that is then
+        renamed to its final path, so that a partially written image is never
+        visible at that path.
+    verbose : `bool`, optional
+        If ``True``, print the progress and the throughput of the export.
+
+    Returns
+    -------
+    paths : `list` of `Path`
+        The path each image was exported to, in order.
+
+    Raises
+    ------
+    OverwriteError
+        File already exists and ``overwrite`` != ``True``
+    ValueError
+        The provided extension does not match to an existing exporter type
+        (the output type is not supported).
+
+    Examples
+    --------
+    >>> images = mio.import_images('./massive_image_db/*')
+    >>> mio.export_images(images.map(lambda i: i.resize((64, 64))),
+    >>>                   './thumbnails/{image.path.stem}.png', n_workers=8)
+    """
+    return _export_many(images, path_template, 'image', image_types,
+                        extension, overwrite, n_workers, read_ahead, atomic,
+                        verbose)
+
+
+def export_landmark_files(landmarks, path_template, extension=None,
+                          overwrite=False, n_workers=None, read_ahead=None,
+                          atomic=True, verbose=False):
+    r"""
+    Exports a collection of landmarks, writing them in a pool of
+    ``n_workers`` threads.
+
+    The path of each landmark file is found by formatting ``path_template``
+    with the index of the landmarks, ``i``, and the landmarks themselves,
+    ``landmarks``, e.g. ``'./landmarks/{i:06d}.pts'``. Any missing directories
+    are created. See :func:`export_images` for the details of how the export
+    is performed.
+
+    Parameters
+    ----------
+    landmarks : `list` or :map:`LazyList` of :map:`PointCloud` or :map:`LandmarkManager`
+        The landmarks to export. As with :func:`export_landmark_file`, only the
+        LJSON format supports exporting a :map:`LandmarkManager`.
+    path_template : `str`
+        The template of the path of each landmark file, formatted with ``i``
+        and ``landmarks``.
+    extension : `str` or None, optional
+        The extension to use, this must match the extension of every path.
+        Determines the type of exporter that is used.
+    overwrite : `bool`, optional
+        Whether or not to overwrite a file if it already exists.
+    n_workers : `int`, optional
+        The number of threads that landmarks are exported in. If ``None``, the
+        number of CPUs on the machine is used.
+    read_ahead : `int`, optional
+        The maximum number of landmarks that are loaded (or being exported) at
+        once. If ``None``, twice the number of workers is used.
+    atomic : `bool`, optional
+        If ``True``, each file is written to a temporary file that is then
+        renamed to its final path, so that a partially written file is never
+        visible at that path.
+    verbose : `bool`, optional
+        If ``True``, print the progress and the throughput of the export.
+
+    Returns
+    -------
+    paths : `list` of `Path`
+        The path each landmark file was exported to, in order.
+
+    Raises
+    ------
+    OverwriteError
+        File already exists and ``overwrite`` != ``True``
+    ValueError
+        The provided extension does not match to an existing exporter type
+        (the output type is not supported).
+    ValueError
+        The provided type for landmarks is not supported.
+    """
+    return _export_many(landmarks, path_template, 'landmarks', landmark_types,
+                        extension, overwrite, n_workers, read_ahead, atomic,
+                        verbose)
+
+
+def _export_many(objs, path_template, name, extensions_map, extension,
+                 overwrite, n_workers, read_ahead, atomic, verbose):
+    from timeit import default_timer
+    from menpo.base import LazyList
+    from menpo.visualize import print_progress
+
+    if not isinstance(objs, LazyList):
+        objs = LazyList.init_from_iterable(objs)
+    export_f = partial(_export_one, path_template, name, extensions_map,
+                       extension, overwrite, atomic)
+    # Each item is both loaded and exported in the pool
+    exported = objs.map([partial(export_f, i) for i in range(len(objs))])
+    paths = exported.prefetch(n_workers=n_workers, read_ahead=read_ahead)
+    if verbose:
+        paths = print_progress(paths, prefix='Exporting {}'.format(name),
+                               n_items=len(objs))
+    start = default_timer()
+    paths = list(paths)
+    if verbose:
+        elapsed = default_timer() - start
+        print('Exported {} files in {:.2f}s ({:.1f} files/s)'.format(
+            len(paths), elapsed, len(paths) / max(elapsed, 1e-12)))
+    return paths
+
+
+def _export_one(path_template, name, extensions_map, extension, overwrite,
+                atomic, i, obj):
+    from .pickle import _atomic_write
+
+    path = _validate_filepath(Path(path_template.format(**{'i': i,
+                                                           name: obj})),
+                              overwrite)
+    extension = _parse_and_validate_extension(path, extension, extensions_map)
+    if extensions_map is landmark_types:
+        _validate_landmarks_object(obj, path, extension)
+    export_function = _extension_to_export_function(extension, extensions_map)
+    _make_parent_dirs(path)
+    if atomic:
+        _atomic_write(path, lambda f: export_function(obj, f,
+                                                      extension=extension))
+    else:
+        with path.open('wb') as f:
+            export_function(obj, f, extension=extension)
+    return path
+
+
+def _make_parent_dirs(path):
+    import errno
+    import os
+    try:
+        os.makedirs(str(path.parent))
+    except OSError as e:
+        # Another worker may have created the directory concurrently
+        if e.errno != errno.EEXIST or not path.parent.is_dir():
+            raise
+
+
 def _extension_to_export_function(extension, extensions_map):
     r"""
     Simple function that wraps the extensions map indexing and raises
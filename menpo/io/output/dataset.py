@@ -0,0 +1,103 @@
+import io
+
+from .pickle import (_pickle_with_persistent_id, _prepare_index_dir,
+                     _write_index)
+
+# The files making up a packed dataset directory
+PIXELS_FILENAME = 'pixels.bin'
+POINTS_FILENAME = 'points.bin'
+INDEX_FILENAME = 'index.pkl'
+DATASET_VERSION = 1
+
+
+def _default_pixels_dtype(pixels):
+    import numpy as np
+    # Floating point pixels are stored as single precision by default
+    if np.issubdtype(pixels.dtype, np.floating):
+        return np.dtype(np.float32)
+    return pixels.dtype
+
+
+def pack_dataset(items, path, dtype=None, protocol=2):
+    r"""
+    Pack ``items`` into a dataset directory at ``path`` that can be imported
+    with :func:`menpo.io.input.dataset.PackedDataset`.
+
+    The pixels of every item are appended to a single flat ``pixels.bin``
+    buffer and the points of every landmark group to a single flat
+    ``points.bin`` buffer. Each item is then pickled with those arrays
+    replaced by a reference into the relevant buffer, and the pickled items
+    are stored in ``index.pkl``. The index is written last - its presence
+    therefore marks a complete export.
+
+    Parameters
+    ----------
+    items : `iterable` of :map:`Image`
+        The items to pack.
+    path : `Path`
+        The directory to pack the items into. It is created if it doesn't
+        exist.
+    dtype : `numpy.dtype`, optional
+        The dtype the pixels are stored with. If ``None``, floating point
+        pixels are stored as ``float32`` and other pixels keep the dtype of
+        the first item.
+    protocol : `int`, optional
+        The Pickle protocol used to serialize the items.
+
+    Raises
+    ------
+    ValueError
+        If the pixels of an item can't be safely cast to ``dtype``, or only
+        one of the pixels and ``dtype`` are floating point.
+    """
+    import numpy as np
+    index_path = _prepare_index_dir(path, INDEX_FILENAME)
+    records = []
+    n_pixels, n_points = 0, 0
+    with open(str(path / PIXELS_FILENAME), 'wb') as pixels_f, \
+            open(str(path / POINTS_FILENAME), 'wb') as points_f:
+        for i, item in enumerate(items):
+            pixels = getattr(item, 'pixels', None)
+            if pixels is not None and dtype is None:
+                dtype = _default_pixels_dtype(pixels)
+            # id -> persistent id of the arrays that are packed for this item
+            packed = {}
+            if pixels is not None:
+                # Integer pixels are unnormalized (e.g. 0-255) whilst floating
+                # point pixels are normalized, so mixing the two would
+                # silently store pixels on different scales
+                if (not np.can_cast(pixels.dtype, dtype,
+                                    casting='same_kind') or
+                        np.issubdtype(pixels.dtype, np.floating) !=
+                        np.issubdtype(dtype, np.floating)):
+                    raise ValueError(
+                        'Item {} has {} pixels which cannot be stored as {} - '
+                        'set the dtype kwarg or import all the images with '
+                        'the same normalize setting'.format(
+                            i, pixels.dtype, np.dtype(dtype)))
+                pixels_f.write(np.ascontiguousarray(pixels,
+                                                    dtype=dtype).tobytes())
+                packed[id(pixels)] = ('pixels', n_pixels, pixels.shape)
+                n_pixels += pixels.size
+            if getattr(item, 'has_landmarks', False):
+                for lms in item.landmarks.values():
+                    points = lms.points
+                    points_f.write(np.ascontiguousarray(
+                        points, dtype=np.float64).tobytes())
+                    packed[id(points)] = ('points', n_points, points.shape)
+                    n_points += points.size
+            records.append(_pickle_packed(item, packed, protocol))
+
+    index = {'version': DATASET_VERSION,
+             'pixels_dtype': None if dtype is None else np.dtype(dtype).str,
+             'n_pixels': n_pixels,
+             'n_points': n_points,
+             'records': records}
+    _write_index(index_path, index, protocol)
+
+
+def _pickle_packed(item, packed, protocol):
+    f = io.BytesIO()
+    _pickle_with_persistent_id(item, f, lambda x: packed.get(id(x)),
+                               protocol)
+    return f.getvalue()
@@ -53,3 +53,113 @@ def pickle_paths_as_pure():
 def pickle_exporter(obj, file_handle, protocol=2, **kwargs):
     with pickle_paths_as_pure():
         pickle.dump(obj, file_handle, protocol=protocol)
+
+
+def _atomic_write(path, write_f):
+    r"""
+    Call ``write_f`` with an open (binary) file handle to a temporary file
+    next to ``path`` and then move the temporary file over ``path``. Readers
+    therefore never see a partially written file. The file is given the
+    usual permissions of a newly created file (i.e. respecting the umask).
+    """
+    import os
+    import uuid
+    path = str(path)
+    tmp_path = os.path.join(os.path.dirname(path),
+                            '.tmp_{}.{}'.format(os.path.basename(path),
+                                                uuid.uuid4().hex))
+    # Create the file ourselves (rather than with tempfile.mkstemp, which
+    # makes it readable by its owner only) so that the kernel applies the
+    # umask to the requested permissions
+    fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY |
+                 getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write_f(f)
+        # os.rename won't overwrite on Windows
+        if os.path.exists(path) and os.name == 'nt':
+            os.remove(path)
+        os.rename(tmp_path, path)
+    except:
+        os.remove(tmp_path)
+        raise
+
+
+def pickle_arrays_out_of_band(obj, path, min_array_bytes=1024, protocol=2):
+    r"""
+    Pickle ``obj`` to ``path``, storing every `ndarray` of at least
+    ``min_array_bytes`` in its own ``.npy`` file next to the pickle rather than
+    inside it. The arrays can then be memory-mapped on import, see
+    :func:`menpo.io.input.pickle.unpickle_arrays_out_of_band`.
+
+    The arrays are named ``{path}.{i}.npy`` and all files are written
+    atomically, with the pickle itself written last - the presence of the
+    pickle therefore marks a complete export.
+
+    Parameters
+    ----------
+    obj : `object`
+        The object to pickle.
+    path : `Path`
+        The path of the pickle file.
+    min_array_bytes : `int`, optional
+        Arrays smaller than this are stored inside the pickle.
+    protocol : `int`, optional
+        The Pickle protocol used to serialize the object.
+    """
+    import numpy as np
+    # id -> index of each array already written (arrays may be shared)
+    array_index = {}
+    # keep the arrays alive so that their ids can't be reused
+    arrays = []
+
+    def persistent_id(x):
+        # Only plain, non-object arrays can be memory-mapped
+        if (isinstance(x, np.ndarray) and x.nbytes >= min_array_bytes and
+                not x.dtype.hasobject):
+            if id(x) not in array_index:
+                i = len(arrays)
+                _atomic_write('{}.{}.npy'.format(path, i),
+                              lambda f: np.save(f, np.ascontiguousarray(x)))
+                array_index[id(x)] = i
+                arrays.append(x)
+            # Store only the index so that the files can be moved together
+            return 'ndarray:{}'.format(array_index[id(x)])
+        return None
+
+    _atomic_write(path, lambda f: _pickle_with_persistent_id(
+        obj, f, persistent_id, protocol))
+
+
+def _pickle_with_persistent_id(obj, f, persistent_id, protocol):
+    r"""
+    Pickle ``obj`` into the file ``f``, replacing every object for which
+    ``persistent_id`` returns a value other than ``None`` with that value. The
+    arrays of :func:`pickle_arrays_out_of_band`, ``pack_archive`` and
+    ``pack_dataset`` are stored out-of-band in this way.
+    """
+    pickler = pickle.Pickler(f, protocol)
+    pickler.persistent_id = persistent_id
+    with pickle_paths_as_pure():
+        pickler.dump(obj)
+
+
+def _prepare_index_dir(path, index_filename):
+    r"""
+    Create the directory ``path`` if needed and remove any index left by a
+    previous export, returning the path of the index. The index is written
+    last (with :func:`_write_index`), so that its presence marks a complete
+    export.
+    """
+    if not path.is_dir():
+        path.mkdir(parents=True)
+    index_path = path / index_filename
+    if index_path.exists():
+        # The old index no longer describes the buffers we are about to write
+        index_path.unlink()
+    return index_path
+
+
+def _write_index(index_path, index, protocol):
+    _atomic_write(index_path,
+                  lambda f: pickle.dump(index, f, protocol=protocol))
@@ -1,6 +1,9 @@
 import os
 import subprocess as sp
+import threading
 import warnings
+from functools import partial
+from timeit import default_timer
 
 import numpy as np
 from pathlib import Path
@@ -14,10 +17,15 @@ _FFMPEG_CMD = lambda: str(Path(os.environ.get('MENPO_FFMPEG_CMD', 'ffmpeg')))
 
 def ffmpeg_video_exporter(images, out_path, fps=30, codec='libx264',
                           preset='medium', bitrate=None,
-                          out_pix_fmt='yuv420p', verbose=False, **kwargs):
+                          out_pix_fmt='yuv420p', verbose=False,
+                          n_workers=None, read_ahead=None, **kwargs):
     r"""
     Uses subprocess PIPE to export the images using FFMPEG.
 
+    The export is pipelined - the frames are converted to bytes in a pool of
+    ``n_workers`` threads whilst a dedicated thread writes the converted
+    frames to FFMPEG, so converting the frames overlaps with encoding them.
+
     There are is one important environment variable that can be set to alter
     the behaviour of this function:
 
@@ -48,7 +56,15 @@ def ffmpeg_video_exporter(images, out_path, fps=30, codec='libx264',
     out_pix_fmt : `str`, optional
         The output pixel format.
     verbose : `bool`, optional
-        If ``True``, print a progress bar.
+        If ``True``, print a progress bar and, once finished, the frame rate
+        of the export.
+    n_workers : `int`, optional
+        The number of threads that convert frames. If ``None``, the number of
+        CPUs on the machine is used.
+    read_ahead : `int`, optional
+        The maximum number of frames that are converted ahead of FFMPEG, and
+        the maximum number of converted frames waiting to be written. If
+        ``None``, twice the number of workers is used.
     **kwargs : `dict`, optional
         Extra parameters for advanced video exporting options.
         They are passed through directly to FFMPEG and they should.
@@ -61,6 +77,13 @@ def ffmpeg_video_exporter(images, out_path, fps=30, codec='libx264',
     #   https://github.com/Zulko/moviepy/blob/master/moviepy/video/io/ffmpeg_writer.py
     # and is used under the terms of the MIT license which can be found at
     #   https://github.com/Zulko/moviepy/blob/master/LICENCE.txt
+    from multiprocessing import cpu_count
+    try:
+        from queue import Queue
+    except ImportError:  # Py2
+        from Queue import Queue
+    from menpo.base import LazyList
+
     im = images[0]
     frame_shape = im.shape
     if im.n_channels != 3 and im.n_channels != 1:
@@ -90,35 +113,102 @@ def ffmpeg_video_exporter(images, out_path, fps=30, codec='libx264',
         cmd.extend(['-{}'.format(key), value])
     cmd.append(str(out_path))
 
-    images = (print_progress(images, prefix='Exporting frames') if verbose
-              else images)
+    if n_workers is None:
+        n_workers = cpu_count()
+    if read_ahead is None:
+        read_ahead = 2 * n_workers
+    if not isinstance(images, LazyList):
+        images = LazyList.init_from_iterable(images)
+    frames = images.map([partial(_frame_to_raw, colour, frame_shape, k)
+                         for k in range(len(images))])
+    prefetched = frames.prefetch(n_workers=n_workers, read_ahead=read_ahead)
+    frames = (print_progress(prefetched, prefix='Exporting frames',
+                             n_items=len(images)) if verbose
+              else prefetched)
 
+    start = default_timer()
+    stats = {'n_frames': 0, 'write_time': 0., 'error': None}
     # Pipe stdout to DEVNULL to ignore it
     with _call_subprocess(sp.Popen(cmd, stdin=sp.PIPE, stderr=sp.PIPE,
                                    stdout=DEVNULL)) as pipe:
-        for k, image in enumerate(images):
-            try:
-                if image.n_channels != 1 and colour == 'gray8':
-                    warnings.warn('Frame {} is non-greyscale and the initial '
-                                  'frame was greyscale. This frame will be '
-                                  'corrupted.'.format(k))
-                if image.shape != frame_shape:  # Valid due to tuple/int
-                    warnings.warn('Frame {} is not the same shape as the '
-                                  'initial frame and therefore the output '
-                                  'may be corrupted.'.format(k))
-
-                i = image.pixels_with_channels_at_back(out_dtype=np.uint8)
-                # Handle the case of a greyscale image amidst colour images
-                if image.n_channels == 1 and colour == 'rgb24':
-                    # Repeat the channels axis 3 times
-                    i = i.reshape(i.shape + (1,)).repeat(3, axis=2)
-                pipe.stdin.write(i.tostring())
-            except IOError:
-                error = ('FFMPEG encountered the following error while '
-                         'writing the video:\n\n{}'.format(
-                    pipe.stderr.read().decode()))
-                # Re-raise the error for a useful error message
-                raise IOError(error)
+        queue = Queue(maxsize=read_ahead)
+        writer = threading.Thread(target=_write_frames,
+                                  args=(pipe.stdin, queue, stats))
+        writer.daemon = True
+        writer.start()
+        try:
+            for frame in frames:
+                if stats['error'] is not None:
+                    break
+                queue.put(frame)
+        finally:
+            # Always stop the writer, even if converting a frame failed
+            queue.put(None)
+            writer.join()
+            # Stop converting frames if we stopped early - closing the
+            # generator releases the frames that were prefetched
+            frames.close()
+            prefetched.close()
+        if isinstance(stats['error'], IOError):
+            error = ('FFMPEG encountered the following error while '
+                     'writing the video:\n\n{}'.format(
+                pipe.stderr.read().decode()))
+            # Re-raise the error for a useful error message
+            raise IOError(error)
+        elif stats['error'] is not None:
+            raise stats['error']
+
+    if verbose:
+        elapsed = default_timer() - start
+        print('Exported {} frames in {:.2f}s ({:.1f} frames/s) - {:.2f}s was '
+              'spent writing to FFMPEG'.format(
+                  stats['n_frames'], elapsed,
+                  stats['n_frames'] / max(elapsed, 1e-12),
+                  stats['write_time']))
+
+
+def _frame_to_raw(colour, frame_shape, k, image):
+    r"""
+    Convert ``image``, frame ``k`` of a video, to the raw frame that is
+    written to FFMPEG.
+    """
+    if image.n_channels != 1 and colour == 'gray8':
+        warnings.warn('Frame {} is non-greyscale and the initial '
+                      'frame was greyscale. This frame will be '
+                      'corrupted.'.format(k))
+    if image.shape != frame_shape:  # Valid due to tuple/int
+        warnings.warn('Frame {} is not the same shape as the '
+                      'initial frame and therefore the output '
+                      'may be corrupted.'.format(k))
+
+    i = image.pixels_with_channels_at_back(out_dtype=np.uint8)
+    # Handle the case of a greyscale image amidst colour images
+    if image.n_channels == 1 and colour == 'rgb24':
+        # Repeat the channels axis 3 times
+        i = i.reshape(i.shape + (1,)).repeat(3, axis=2)
+    return np.ascontiguousarray(i)
+
+
+def _write_frames(stdin, queue, stats):
+    r"""
+    Write the frames in ``queue`` to ``stdin`` until a ``None`` is received.
+    The frames are written through the buffer protocol, without a copy.
+    """
+    while True:
+        frame = queue.get()
+        if frame is None:
+            return
+        if stats['error'] is not None:
+            # Keep consuming so that the producer is never blocked
+            continue
+        start = default_timer()
+        try:
+            stdin.write(frame)
+        except Exception as e:
+            stats['error'] = e
+        else:
+            stats['n_frames'] += 1
+        stats['write_time'] += default_timer() - start
 
 
 def imageio_video_exporter(images, out_path, fps=30, codec='libx264',
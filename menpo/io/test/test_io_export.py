@@ -6,7 +6,7 @@ from numpy.testing import assert_allclose
 import os
 from pathlib import PosixPath, WindowsPath, Path
 from mock import patch, PropertyMock, MagicMock
-from pytest import raises
+from pytest import raises, mark
 
 
 import menpo.io as mio
@@ -324,6 +324,51 @@ def test_export_video_avi_kwargs(exists, pipe):
     assert '-crf' in pipe.call_args[0][0]
 
 
+@patch('subprocess.Popen')
+@patch('menpo.io.output.base.Path.exists')
+def test_export_video_pipelined_in_order(exists, pipe):
+    exists.return_value = False
+    frames = [Image(np.full((3, 10, 10), i / 255.)) for i in range(20)]
+    mio.export_video(frames, Path('/fake/fake.avi'), n_workers=3,
+                     read_ahead=2)
+    written = [np.asarray(c[1][0])
+               for c in pipe.return_value.stdin.write.mock_calls]
+    assert len(written) == 20
+    for i, frame in enumerate(written):
+        assert frame.dtype == np.uint8
+        assert frame.shape == (10, 10, 3)
+        assert np.all(frame == i)
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.output.base.Path.exists')
+def test_export_video_write_error(exists, pipe):
+    exists.return_value = False
+    pipe.return_value.stdin.write.side_effect = IOError
+    pipe.return_value.stderr.read.return_value = b'Unknown encoder'
+    with raises(IOError) as e:
+        mio.export_video([colour_test_img] * 10, Path('/fake/fake.avi'))
+    assert 'Unknown encoder' in str(e.value)
+    # writing stops at the first error
+    assert pipe.return_value.stdin.write.call_count == 1
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.output.base.Path.exists')
+def test_export_video_write_error_stops_conversion(exists, pipe):
+    from multiprocessing.pool import ThreadPool
+    exists.return_value = False
+    pipe.return_value.stdin.write.side_effect = IOError
+    pipe.return_value.stderr.read.return_value = b''
+    with patch.object(ThreadPool, 'terminate', autospec=True,
+                      side_effect=ThreadPool.terminate) as terminate:
+        with raises(IOError):
+            mio.export_video([colour_test_img] * 10, Path('/fake/fake.avi'),
+                             n_workers=2, read_ahead=2)
+        # the conversion pool is stopped before the error is raised
+        assert terminate.call_count == 1
+
+
 @patch('menpo.io.output.pickle.pickle.dump')
 @patch('menpo.io.output.base.Path.exists')
 @patch('{}.open'.format(__name__), create=True)
@@ -395,3 +440,184 @@ def test_pickle_paths_as_pure_cleans_up_on_exception():
             raise ValueError()
     except ValueError:
         assert prev_reduce == Path.__reduce__  # ensure we clean up
+
+
+@mark.skipif(os.name == 'nt', reason='Windows has no POSIX permissions')
+def test_atomic_write_respects_umask(tmpdir):
+    from menpo.io.output.pickle import _atomic_write
+    path = str(tmpdir.join('out.bin'))
+    prev_umask = os.umask(0o022)
+    try:
+        _atomic_write(path, lambda f: f.write(b'menpo'))
+    finally:
+        os.umask(prev_umask)
+    assert os.stat(path).st_mode & 0o777 == 0o644
+
+
+def test_atomic_write_leaves_umask_alone(tmpdir):
+    from menpo.io.output.pickle import _atomic_write
+    path = str(tmpdir.join('out.bin'))
+    # the umask is process wide, so it must not be changed whilst other
+    # threads may be creating files
+    with patch('os.umask') as umask:
+        _atomic_write(path, lambda f: f.write(b'menpo'))
+    assert not umask.called
+    with open(path, 'rb') as f:
+        assert f.read() == b'menpo'
+
+
+def test_export_import_dataset_round_trip(tmpdir):
+    images = mio.import_images(mio.data_dir_path())
+    path = str(tmpdir.join('dataset'))
+    mio.export_dataset(images, path)
+    dataset = mio.import_dataset(path)
+    assert len(dataset) == len(images)
+    for img, packed_img in zip(images, dataset):
+        assert type(packed_img) == type(img)
+        assert packed_img.pixels.dtype == np.float32
+        assert_allclose(packed_img.pixels, img.pixels, rtol=1e-6)
+        assert packed_img.path == img.path
+        assert list(packed_img.landmarks.keys()) == list(img.landmarks.keys())
+        for group in img.landmarks:
+            assert_allclose(packed_img.landmarks[group].points,
+                            img.landmarks[group].points)
+
+
+def test_export_dataset_uint8_pixels(tmpdir):
+    img = mio.import_image(mio.data_path_to('takeo.ppm'), normalize=False)
+    path = str(tmpdir.join('dataset'))
+    mio.export_dataset([img], path)
+    packed_img = mio.import_dataset(path)[0]
+    assert packed_img.pixels.dtype == np.uint8
+    assert np.all(packed_img.pixels == img.pixels)
+
+
+def test_export_dataset_float_to_uint8_raises(tmpdir):
+    with raises(ValueError):
+        mio.export_dataset([test_img], str(tmpdir.join('dataset')),
+                           dtype=np.uint8)
+
+
+def test_export_dataset_mixed_pixel_dtypes_raises(tmpdir):
+    uint8_img = Image((np.random.rand(1, 10, 10) * 255).astype(np.uint8))
+    with raises(ValueError):
+        mio.export_dataset([test_img, uint8_img], str(tmpdir.join('a')))
+    with raises(ValueError):
+        mio.export_dataset([uint8_img, test_img], str(tmpdir.join('b')))
+    with raises(ValueError):
+        mio.export_dataset([uint8_img], str(tmpdir.join('c')),
+                           dtype=np.float32)
+
+
+def test_export_dataset_overwrite(tmpdir):
+    path = str(tmpdir.join('dataset'))
+    mio.export_dataset([test_img], path)
+    with raises(mio.OverwriteError):
+        mio.export_dataset([colour_test_img], path)
+    mio.export_dataset([colour_test_img], path, overwrite=True)
+    assert mio.import_dataset(path)[0].n_channels == 3
+
+
+def test_import_dataset_is_copy_on_write(tmpdir):
+    path = str(tmpdir.join('dataset'))
+    mio.export_dataset([test_img], path)
+    dataset = mio.import_dataset(path)
+    dataset[0].pixels[:] = 0
+    assert_allclose(mio.import_dataset(path)[0].pixels, test_img.pixels,
+                    rtol=1e-6)
+
+
+def test_import_dataset_incomplete_raises(tmpdir):
+    with raises(ValueError):
+        mio.import_dataset(str(tmpdir))
+
+
+def test_export_images(tmpdir):
+    images = mio.import_images(mio.data_dir_path(), normalize=False)
+    template = str(tmpdir.join('out', '{i:02d}_{image.path.stem}.png'))
+    paths = mio.export_images(images, template, n_workers=2)
+    assert len(paths) == len(images)
+    for img, path in zip(images, paths):
+        assert path.name.endswith(img.path.stem + '.png')
+        exported = mio.import_image(path, normalize=False)
+        assert np.all(exported.pixels == img.pixels)
+    # only the exported images are left behind
+    assert len(os.listdir(str(tmpdir.join('out')))) == len(images)
+
+
+def test_export_images_overwrite(tmpdir):
+    template = str(tmpdir.join('{i}.png'))
+    mio.export_images([test_img], template)
+    with raises(mio.OverwriteError):
+        mio.export_images([test_img], template)
+    mio.export_images([test_img], template, overwrite=True)
+
+
+def test_export_landmark_files(tmpdir):
+    template = str(tmpdir.join('{i}.pts'))
+    paths = mio.export_landmark_files([test_lg, test_lg], template,
+                                      n_workers=2, atomic=False)
+    for path in paths:
+        # PTS files are written to 3 decimal places
+        assert_allclose(mio.import_landmark_file(path)['PTS'].points,
+                        test_lg.points, atol=1e-3)
+
+
+def test_export_import_archive_round_trip(tmpdir):
+    images = mio.import_images(mio.data_dir_path())
+    objs = list(images) + [{'a': 1, 'b': [test_lg]}]
+    path = str(tmpdir.join('archive'))
+    mio.export_archive(objs, path, chunk_size=2)
+    archive = mio.import_archive(path)
+    assert len(archive) == len(objs)
+    for img, archived_img in zip(images, archive):
+        assert type(archived_img) == type(img)
+        assert isinstance(archived_img.pixels, np.memmap)
+        assert np.all(archived_img.pixels == img.pixels)
+        assert archived_img.path == img.path
+        for group in img.landmarks:
+            assert_allclose(archived_img.landmarks[group].points,
+                            img.landmarks[group].points)
+    # random access of an object that is not the first of its chunk
+    assert archive[-1]['a'] == 1
+    assert_allclose(archive[-1]['b'][0].points, test_lg.points)
+
+
+def test_export_archive_uncompressed_shared_arrays(tmpdir):
+    x = np.random.random((32, 32))
+    path = str(tmpdir.join('archive'))
+    mio.export_archive([(x, x)], path, compression=None)
+    y1, y2 = mio.import_archive(path)[0]
+    assert y1 is y2
+    assert np.all(y1 == x)
+
+
+def test_export_archive_overwrite(tmpdir):
+    path = str(tmpdir.join('archive'))
+    mio.export_archive([1], path)
+    with raises(mio.OverwriteError):
+        mio.export_archive([2], path)
+    mio.export_archive([2], path, overwrite=True)
+    assert list(mio.import_archive(path)) == [2]
+
+
+def test_export_archive_generator_verbose(tmpdir, capsys):
+    path = str(tmpdir.join('archive'))
+    mio.export_archive((i for i in range(3)), path, verbose=True)
+    assert list(mio.import_archive(path)) == [0, 1, 2]
+    out, _ = capsys.readouterr()
+    assert '3 items' in out
+
+
+def test_import_archive_incomplete_raises(tmpdir):
+    path = str(tmpdir.join('archive'))
+    mio.export_archive([1], path)
+    tmpdir.join('archive', 'index.pkl').remove()
+    with raises(ValueError):
+        mio.import_archive(path)
+
+
+def test_export_archive_unknown_compression_raises(tmpdir):
+    with raises(ValueError):
+        mio.export_archive([1], str(tmpdir.join('archive')),
+                           compression='lz4')
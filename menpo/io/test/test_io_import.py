@@ -3,6 +3,7 @@ import warnings
 
 import menpo.io as mio
 import numpy as np
+from numpy.testing import assert_allclose
 from PIL import Image as PILImage
 from mock import patch, MagicMock
 from pytest import raises
@@ -155,6 +156,106 @@ def test_landmark_resolver_none():
     assert(not img.has_landmarks)
 
 
+def test_import_image_scale_hint_rescales_landmarks():
+    img = mio.import_image(mio.data_path_to('einstein.jpg'))
+    small = mio.import_image(mio.data_path_to('einstein.jpg'),
+                             scale_hint=0.3)
+    # decoded at the nearest power of two that is at least the hint
+    assert small.shape == (512, 409)
+    scale = np.array(small.shape) / np.array(img.shape)
+    assert np.allclose(small.landmarks['PTS'].points,
+                       img.landmarks['PTS'].points * scale)
+
+
+def test_pillow_importer_return_transform():
+    from menpo.io.input.image import pillow_importer
+    path = mio.data_path_to('einstein.jpg')
+    img, transform = pillow_importer(path, return_transform=True)
+    assert transform is None
+    small, transform = pillow_importer(path, scale_hint=0.3,
+                                       return_transform=True)
+    assert_allclose(transform.scale, np.array(small.shape) / img.shape)
+    # the scale is returned rather than stored on the image
+    assert not hasattr(small, '_decode_scale')
+
+
+def test_import_image_max_shape():
+    img = mio.import_image(mio.data_path_to('breakingbad.jpg'),
+                           max_shape=(200, 200))
+    assert img.shape == (135, 240)
+    img = mio.import_image(mio.data_path_to('lenna.png'), max_shape=(256, 300))
+    assert img.shape == (256, 256)
+    img = mio.import_image(mio.data_path_to('lenna.png'),
+                           max_shape=(1000, 1000))
+    assert img.shape == (512, 512)
+
+
+def test_import_images_scale_hint_n_workers():
+    imgs = mio.import_images(mio.data_dir_path(), scale_hint=0.5)
+    threaded_imgs = list(mio.import_images(mio.data_dir_path(),
+                                           scale_hint=0.5, as_generator=True,
+                                           n_workers=2))
+    for img, threaded_img in zip(imgs, threaded_imgs):
+        assert img.shape == threaded_img.shape
+        for group in img.landmarks:
+            assert np.all(img.landmarks[group].points ==
+                          threaded_img.landmarks[group].points)
+
+
+def test_import_image_float32():
+    img = mio.import_image(mio.data_path_to('takeo.ppm'))
+    img32 = mio.import_image(mio.data_path_to('takeo.ppm'), dtype=np.float32)
+    assert img32.pixels.dtype == np.float32
+    assert np.allclose(img32.pixels, img.pixels)
+    assert img32.rescale(0.5).pixels.dtype == np.float32
+
+
+def test_image_metadata():
+    metadata = mio.image_metadata(mio.data_dir_path(), n_workers=2,
+                                  chunk_size=2)
+    images = mio.import_images(mio.data_dir_path(), normalize=False)
+    assert len(metadata) == len(images)
+    for row, img in zip(metadata, images):
+        assert row['path'] == img.path
+        assert tuple(row['shape']) == img.shape
+        assert row['n_channels'] == img.n_channels
+        assert row['dtype'] == img.pixels.dtype
+
+
+def test_pillow_header_matches_import(tmpdir):
+    from menpo.io.input.image import pillow_header
+    pixels = np.random.randint(0, 255, size=(6, 8, 4)).astype(np.uint8)
+    rgba = PILImage.fromarray(pixels, mode='RGBA')
+    rgba.save(str(tmpdir.join('rgba.png')))
+    rgba.convert('RGB').convert('P').save(str(tmpdir.join('p.png')))
+    for name in ('rgba.png', 'p.png'):
+        path = tmpdir.join(name)
+        for normalize in (True, False):
+            img = mio.import_image(str(path), normalize=normalize)
+            shape, n_channels, mode, dtype = pillow_header(
+                str(path), normalize=normalize)
+            assert shape == img.shape
+            assert n_channels == img.n_channels
+            assert dtype == img.pixels.dtype
+
+
+def test_pillow_header_unsupported_mode_raises(tmpdir):
+    from menpo.io.input.image import pillow_header
+    path = str(tmpdir.join('la.png'))
+    PILImage.new('LA', (4, 4)).save(path)
+    with raises(ValueError):
+        pillow_header(path)
+
+
+def test_image_metadata_landmark_paths():
+    metadata = mio.image_metadata(mio.data_dir_path() / 'takeo.*')
+    assert metadata['mode'][0] == 'RGB'
+    assert metadata['landmark_paths'][0] == [mio.data_path_to('takeo.pts')]
+    metadata = mio.image_metadata(mio.data_dir_path() / 'takeo.*',
+                                  landmarks=False)
+    assert metadata['landmark_paths'][0] == []
+
+
 def test_import_image_no_norm():
     img_path = mio.data_dir_path() / 'einstein.jpg'
     im = mio.import_image(img_path, normalize=False)
@@ -183,6 +284,18 @@ def test_import_images_are_ordered_and_unduplicated():
     assert exp_imgs_filenames == imgs_filenames
 
 
+def test_import_images_cache_keys_are_stable():
+    from menpo.base import _callable_fingerprint
+    # Each list has its own landmark file index, which must not change the
+    # keys that LazyList.cache_to_dir stores items under
+    imgs_a = mio.import_images(mio.data_dir_path())
+    imgs_b = mio.import_images(mio.data_dir_path())
+    imgs_a[0]
+    keys_a = [_callable_fingerprint(c) for c in imgs_a._callables]
+    keys_b = [_callable_fingerprint(c) for c in imgs_b._callables]
+    assert keys_a == keys_b
+
+
 def test_lsimgs_filenamess():
     assert(set(mio.ls_builtin_assets()) == {'breakingbad.jpg',
                                             'einstein.jpg', 'einstein.pts',
@@ -365,14 +478,19 @@ def test_importing_PIL_P_no_normalize(is_file, mock_image):
     assert im.pixels.dtype == np.uint8
 
 
+def _readinto_empty_frames(buffer):
+    # Stands in for the stdout of ffmpeg, filling the buffer with black frames
+    buffer[:] = b'\0' * len(buffer)
+    return len(buffer)
+
+
 @patch('subprocess.Popen')
 @patch('menpo.io.input.video.video_infos_ffprobe')
 @patch('menpo.io.input.base.Path.is_file')
 def test_importing_ffmpeg_GIF_normalize(is_file, video_infos_ffprobe, pipe):
     video_infos_ffprobe.return_value = {'duration': 2, 'width': 100,
                                         'height': 150, 'n_frames': 10, 'fps': 5}
-    empty_frame = np.zeros(150*100*3, dtype=np.uint8).tostring()
-    pipe.return_value.stdout.read.return_value = empty_frame
+    pipe.return_value.stdout.readinto.side_effect = _readinto_empty_frames
     is_file.return_value = True
 
     ll = mio.import_image('fake_image_being_mocked.gif', normalize=True)
@@ -392,8 +510,7 @@ def test_importing_ffmpeg_GIF_normalize(is_file, video_infos_ffprobe, pipe):
 def test_importing_ffmpeg_GIF_no_normalize(is_file, video_infos_ffprobe, pipe):
     video_infos_ffprobe.return_value = {'duration': 2, 'width': 100,
                                         'height': 150, 'n_frames': 10, 'fps': 5}
-    empty_frame = np.zeros(150*100*3, dtype=np.uint8).tostring()
-    pipe.return_value.stdout.read.return_value = empty_frame
+    pipe.return_value.stdout.readinto.side_effect = _readinto_empty_frames
     is_file.return_value = True
 
     ll = mio.import_image('fake_image_being_mocked.gif', normalize=False)
@@ -512,6 +629,170 @@ def test_import_as_generator():
     assert isinstance(gen, types.GeneratorType)
 
 
+def test_import_images_n_workers_ordered_with_landmarks():
+    imgs = list(mio.import_images(mio.data_dir_path()))
+    threaded_imgs = list(mio.import_images(mio.data_dir_path(),
+                                           as_generator=True, n_workers=3))
+    assert [i.path for i in imgs] == [i.path for i in threaded_imgs]
+    for img, threaded_img in zip(imgs, threaded_imgs):
+        assert list(img.landmarks.keys()) == list(threaded_img.landmarks.keys())
+        assert np.all(img.pixels == threaded_img.pixels)
+
+
+def test_import_images_n_workers_verbose_reports_stages(capsys):
+    list(mio.import_images(mio.data_dir_path(), as_generator=True,
+                           n_workers=2, verbose=True))
+    out, _ = capsys.readouterr()
+    assert 'import' in out
+    assert 'landmarks' in out
+
+
+def test_import_landmark_files_n_workers():
+    lms = list(mio.import_landmark_files(mio.data_dir_path()))
+    threaded_lms = list(mio.import_landmark_files(mio.data_dir_path(),
+                                                  as_generator=True,
+                                                  n_workers=2))
+    assert [l.keys() for l in lms] == [l.keys() for l in threaded_lms]
+
+
+def test_import_images_n_workers_without_generator_raises():
+    with raises(ValueError):
+        mio.import_images(mio.data_dir_path(), n_workers=2)
+
+
+@patch('menpo.io.input.base.importer_for_filepath')
+def test_import_images_n_workers_raises_importer_error(importer_for_filepath):
+    importer_for_filepath.return_value.side_effect = IOError()
+    gen = mio.import_images(mio.data_dir_path(), as_generator=True,
+                            n_workers=2)
+    with raises(IOError):
+        next(gen)
+
+
+def test_landmark_file_index_matches_glob(tmpdir):
+    from pathlib import Path
+    from menpo.io.input import LandmarkFileIndex
+    from menpo.io.input.base import landmark_file_paths
+    for name in ['a.pts', 'a.ljson', 'a.b.pts', 'ab.pts', 'a.jpg', 'b_1.pts']:
+        tmpdir.join(name).write('')
+    directory = Path(str(tmpdir))
+    index = LandmarkFileIndex()
+    for stem in ['a', 'a.b', 'ab', 'b_1', 'c']:
+        expected = list(landmark_file_paths(directory / (stem + '.*')))
+        assert index.paths(directory, stem) == expected
+
+
+@patch('menpo.io.input.base._list_files')
+def test_landmark_file_index_lists_directory_once(list_files):
+    from menpo.io.input import LandmarkFileIndex
+    data_path = mio.data_dir_path()
+    list_files.return_value = ['einstein.pts', 'takeo.pts']
+    index = LandmarkFileIndex()
+    assert index.paths(data_path, 'einstein') == [data_path / 'einstein.pts']
+    assert index.paths(data_path, 'takeo') == [data_path / 'takeo.pts']
+    assert index.paths(data_path, 'lenna') == []
+    assert list_files.call_count == 1
+
+
+def test_import_images_indexed_landmarks_match_same_name():
+    from menpo.io.input import same_name
+    imgs = mio.import_images(mio.data_dir_path())
+    for img in imgs:
+        assert (list(img.landmarks.keys()) ==
+                list(same_name(img.path).keys()))
+
+
+def _pickle_dir_in_the_past(tmpdir, n):
+    import os
+    import time
+    for i in range(n):
+        mio.export_pickle(i, str(tmpdir.join('{}.pkl'.format(i))),
+                          overwrite=True)
+    past = time.time() - 100
+    os.utime(str(tmpdir), (past, past))
+
+
+def test_import_pickles_manifest_skips_glob(tmpdir):
+    _pickle_dir_in_the_past(tmpdir, 3)
+    manifest = str(tmpdir.join('manifest'))
+    pattern = str(tmpdir.join('*'))
+    assert list(mio.import_pickles(pattern, manifest=manifest)) == [0, 1, 2]
+    with patch('menpo.io.input.base._pathlib_glob_for_pattern') as glob:
+        pickles = mio.import_pickles(pattern, manifest=manifest)
+        assert glob.call_count == 0
+    assert list(pickles) == [0, 1, 2]
+    assert list(mio.import_pickles(pattern, manifest=manifest,
+                                   max_pickles=2)) == [0, 1]
+
+
+def test_import_pickles_manifest_rebuilt_on_change(tmpdir):
+    _pickle_dir_in_the_past(tmpdir, 2)
+    manifest = str(tmpdir.join('manifest'))
+    pattern = str(tmpdir.join('*'))
+    assert list(mio.import_pickles(pattern, manifest=manifest)) == [0, 1]
+    _pickle_dir_in_the_past(tmpdir, 3)
+    assert list(mio.import_pickles(pattern, manifest=manifest)) == [0, 1, 2]
+
+
+def test_import_pickles_manifest_stores_sizes(tmpdir):
+    import os
+    from menpo.io.input.pickle import pickle
+    _pickle_dir_in_the_past(tmpdir, 2)
+    manifest = str(tmpdir.join('manifest'))
+    mio.import_pickles(str(tmpdir.join('*')), manifest=manifest)
+    with open(manifest, 'rb') as f:
+        stored = pickle.load(f)
+    assert stored['sizes'] == [os.path.getsize(p) for p in stored['paths']]
+
+
+def test_import_pickles_manifest_keyed_on_pattern(tmpdir):
+    _pickle_dir_in_the_past(tmpdir, 3)
+    manifest = str(tmpdir.join('manifest'))
+    mio.import_pickles(str(tmpdir.join('*')), manifest=manifest)
+    assert list(mio.import_pickles(str(tmpdir.join('1*')),
+                                   manifest=manifest)) == [1]
+
+
+def test_import_landmark_files_as_array():
+    pattern = mio.data_dir_path() / '*.pts'
+    points, paths = mio.import_landmark_files(pattern, max_landmarks=3,
+                                              as_array=True)
+    lms = mio.import_landmark_files(pattern, max_landmarks=3)
+    assert points.shape == (3, 68, 2)
+    assert paths == [l['PTS'].path for l in lms]
+    for p, l in zip(points, lms):
+        assert np.all(p == l['PTS'].points)
+
+
+def test_import_landmark_files_as_array_ljson():
+    points, _ = mio.import_landmark_files(mio.data_dir_path() / '*.ljson',
+                                          as_array=True)
+    lms = mio.import_landmark_file(mio.data_path_to('lenna.ljson'))
+    assert np.all(points[0] == lms['LJSON'].points)
+
+
+def test_import_landmark_files_as_array_shape_mismatch_raises():
+    with raises(ValueError):
+        mio.import_landmark_files(mio.data_dir_path() / '*.pts',
+                                  as_array=True)
+
+
+def test_import_landmark_files_as_array_as_generator_raises():
+    with raises(ValueError):
+        mio.import_landmark_files(mio.data_dir_path(), as_array=True,
+                                  as_generator=True)
+
+
+def test_import_pts_extra_and_ragged_columns(tmpdir):
+    extra = tmpdir.join('extra.pts')
+    extra.write('version: 1\nn_points: 2\n{\n1 2 0\n3 4 0\n}\n')
+    ragged = tmpdir.join('ragged.pts')
+    ragged.write('version: 1\nn_points: 2\n{\n1 2\n3 4 0\n}\n')
+    for f in [extra, ragged]:
+        points = mio.import_landmark_file(str(f))['PTS'].points
+        assert np.all(points == [[1, 0], [3, 2]])
+
+
 def test_import_lazy_list():
     from menpo.base import LazyList
     data_path = mio.data_dir_path()
@@ -606,8 +887,7 @@ def test_importing_ffmpeg_avi_no_normalize(is_file, video_infos_ffprobe, pipe):
     video_infos_ffprobe.return_value = {'duration': 2, 'width': 100,
                                         'height': 150, 'n_frames': 10, 'fps': 5}
     is_file.return_value = True
-    empty_frame = np.zeros(150*100*3, dtype=np.uint8).tostring()
-    pipe.return_value.stdout.read.return_value = empty_frame
+    pipe.return_value.stdout.readinto.side_effect = _readinto_empty_frames
     ll = mio.import_video('fake_image_being_mocked.avi', normalize=False)
     assert ll.path.name == 'fake_image_being_mocked.avi'
     assert ll.fps == 5
@@ -625,8 +905,7 @@ def test_importing_ffmpeg_avi_normalize(is_file, video_infos_ffprobe, pipe):
     video_infos_ffprobe.return_value = {'duration': 2, 'width': 100,
                                         'height': 150, 'n_frames': 10, 'fps': 5}
     is_file.return_value = True
-    empty_frame = np.zeros(150*100*3, dtype=np.uint8).tostring()
-    pipe.return_value.stdout.read.return_value = empty_frame
+    pipe.return_value.stdout.readinto.side_effect = _readinto_empty_frames
     ll = mio.import_video('fake_image_being_mocked.avi', normalize=True)
     assert ll.path.name == 'fake_image_being_mocked.avi'
     assert ll.fps == 5
@@ -657,8 +936,7 @@ def test_importing_ffmpeg_no_exact_frame_count_no_ffprobe(
     video_infos_ffmpeg.return_value = {'duration': 2, 'width': 100,
                                        'height': 150, 'n_frames': 10, 'fps': 5}
     is_file.return_value = True
-    empty_frame = np.zeros(150*100*3, dtype=np.uint8).tostring()
-    pipe.return_value.stdout.read.return_value = empty_frame
+    pipe.return_value.stdout.readinto.side_effect = _readinto_empty_frames
     ll = mio.import_video('fake_image_being_mocked.avi', normalize=True,
                           exact_frame_count=False)
     assert ll.path.name == 'fake_image_being_mocked.avi'
@@ -670,6 +948,212 @@ def test_importing_ffmpeg_no_exact_frame_count_no_ffprobe(
     assert image.pixels.dtype == np.float
 
 
+def _fake_ffmpeg_popen(n_frames, fps, shape):
+    # Every pixel of frame i is i, and the stream honours the -ss seek
+    import io
+
+    def popen(command, **kwargs):
+        start = 0
+        if '-ss' in command:
+            start = int(round(float(command[command.index('-ss') + 1]) * fps))
+        frames = np.ones((n_frames - start,) + shape, dtype=np.uint8)
+        frames *= np.arange(start, n_frames, dtype=np.uint8)[:, None, None,
+                                                             None]
+        pipe = MagicMock()
+        pipe.stdout = io.BytesIO(frames.tobytes())
+        pipe.poll.return_value = None
+        return pipe
+    return popen
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_read_range(video_infos_ffprobe, popen):
+    from menpo.io.input.video import FFMpegVideoReader
+    video_infos_ffprobe.return_value = {'duration': 2, 'width': 10,
+                                        'height': 15, 'n_frames': 10, 'fps': 5}
+    popen.side_effect = _fake_ffmpeg_popen(10, 5, (15, 10, 3))
+    reader = FFMpegVideoReader('fake.avi')
+    frames = reader.read_range(2, 5)
+    assert frames.shape == (3, 15, 10, 3)
+    assert frames.dtype == np.uint8
+    assert np.all(frames[:, 0, 0, 0] == [2, 3, 4])
+    # the next range continues from the open pipe into the provided buffer
+    out = np.empty((2, 15, 10, 3), dtype=np.uint8)
+    assert reader.read_range(7, 9, out=out) is out
+    assert np.all(out[:, 0, 0, 0] == [7, 8])
+    assert popen.call_count == 1
+    with raises(ValueError):
+        reader.read_range(0, 2, out=np.empty((2, 15, 10, 3)))
+    with raises(ValueError):
+        reader.read_range(8, 11)
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_skip_frames_normalize(video_infos_ffprobe, popen):
+    from menpo.io.input.video import FFMpegVideoReader
+    video_infos_ffprobe.return_value = {'duration': 2, 'width': 10,
+                                        'height': 15, 'n_frames': 10, 'fps': 5}
+    popen.side_effect = _fake_ffmpeg_popen(10, 5, (15, 10, 3))
+    reader = FFMpegVideoReader('fake.avi', normalize=True)
+    assert np.all(reader[1] == 1 / 255.)
+    assert np.all(reader[6] == 6 / 255.)
+    assert popen.call_count == 1
+    out = np.empty((2, 15, 10, 3), dtype=np.float32)
+    reader.read_range(8, 10, out=out)
+    assert np.allclose(out[:, 0, 0, 0], np.array([8, 9]) / 255.)
+    # reading backwards reopens the pipe at the frame
+    assert np.all(reader[2] == 2 / 255.)
+    assert popen.call_count == 2
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_keyframes_ffprobe')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_keyframes_cache(video_infos_ffprobe,
+                                       video_keyframes_ffprobe, popen):
+    from menpo.io.input.video import FFMpegVideoReader
+    video_infos_ffprobe.return_value = {'duration': 4, 'width': 2,
+                                        'height': 2, 'n_frames': 100,
+                                        'fps': 25}
+    video_keyframes_ffprobe.return_value = np.array([0, 30, 60, 90])
+    popen.side_effect = _fake_ffmpeg_popen(100, 25, (2, 2, 3))
+    reader = FFMpegVideoReader('fake.avi', keyframe_index=True,
+                               cache_bytes=2 ** 20)
+    assert reader[35][0, 0, 0] == 35
+    # restarted at the keyframe, so the frames before 35 are cached
+    assert popen.call_count == 1
+    assert '-ss' in popen.call_args[0][0]
+    assert reader[31][0, 0, 0] == 31
+    assert reader.cache.hits == 1
+    # decoding from frame 36 is more expensive than restarting at frame 60
+    assert reader[65][0, 0, 0] == 65
+    assert popen.call_count == 2
+    # but nearby frames are decoded from the open pipe
+    assert reader[70][0, 0, 0] == 70
+    assert popen.call_count == 2
+    # the cached frames are not altered by modifying the returned frames
+    reader[31][:] = 0
+    assert reader[31][0, 0, 0] == 31
+
+
+@patch('subprocess.Popen')
+def test_video_keyframes_ffprobe(popen):
+    from menpo.io.input.video import video_keyframes_ffprobe
+    # packets are listed in decode order, with timestamps from the start time
+    popen.return_value.stdout.readlines.return_value = [
+        b'1.000000,K_\n', b'1.160000,__\n', b'1.080000,__\n',
+        b'N/A,__\n', b'1.400000,K_\n', b'1.440000,__\n']
+    keyframes = video_keyframes_ffprobe('fake.avi', 25)
+    assert np.all(keyframes == [0, 10])
+
+
+@patch('menpo.io.input.video.video_keyframes_ffprobe')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_keyframe_index_persisted(video_infos_ffprobe,
+                                                video_keyframes_ffprobe,
+                                                tmpdir):
+    from menpo.io.input.video import FFMpegVideoReader
+    video_infos_ffprobe.return_value = {'duration': 2, 'width': 2,
+                                        'height': 2, 'n_frames': 10, 'fps': 5}
+    video_keyframes_ffprobe.return_value = np.array([0, 5])
+    video_path = tmpdir.join('fake.avi')
+    video_path.write('')
+    index_path = str(tmpdir.join('fake.keyframes'))
+    FFMpegVideoReader(str(video_path), keyframe_index=index_path)
+    reader = FFMpegVideoReader(str(video_path), keyframe_index=index_path)
+    assert video_keyframes_ffprobe.call_count == 1
+    assert np.all(reader.keyframes == [0, 5])
+    # the index is rebuilt once the video changes
+    video_path.write('changed')
+    FFMpegVideoReader(str(video_path), keyframe_index=index_path)
+    assert video_keyframes_ffprobe.call_count == 2
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+@patch('menpo.io.input.base.Path.is_file')
+def test_importing_ffmpeg_crop_shape_greyscale(is_file, video_infos_ffprobe,
+                                               popen):
+    from menpo.shape import PointCloud
+    video_infos_ffprobe.return_value = {'duration': 2, 'width': 100,
+                                        'height': 150, 'n_frames': 10, 'fps': 5}
+    is_file.return_value = True
+    popen.side_effect = _fake_ffmpeg_popen(10, 5, (20, 30, 1))
+
+    def resolver(path, frame_number):
+        return {'PTS': PointCloud(np.array([[50., 20.], [90., 80.]]))}
+
+    ll = mio.import_video('fake_image_being_mocked.avi', normalize=False,
+                          crop=((50, 20), (90, 80)), shape=(20, 30),
+                          greyscale=True, landmark_resolver=resolver)
+    image = ll[3]
+    assert image.shape == (20, 30)
+    assert image.n_channels == 1
+    assert np.all(image.pixels == 3)
+    command = popen.call_args[0][0]
+    assert command[command.index('-vf') + 1] == 'crop=60:40:20:50,scale=30:20'
+    assert command[command.index('-pix_fmt') + 1] == 'gray'
+    # landmarks of the video file are moved onto the decoded frames
+    assert_allclose(image.landmarks['PTS'].points, [[0, 0], [20, 30]])
+    assert not hasattr(ll, '_decode_transform')
+    with raises(ValueError):
+        mio.import_video('fake_image_being_mocked.avi',
+                         crop=((0, 0), (151, 10)))
+
+
+def _record_read_ahead_thread(threads):
+    from menpo.io.input.video import _ReadAheadThread
+
+    def create(*args):
+        thread = _ReadAheadThread(*args)
+        threads.append(thread)
+        return thread
+    return create
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_read_ahead(video_infos_ffprobe, popen):
+    from menpo.io.input.video import FFMpegVideoReader
+    video_infos_ffprobe.return_value = {'duration': 2, 'width': 2,
+                                        'height': 2, 'n_frames': 10, 'fps': 5}
+    popen.side_effect = _fake_ffmpeg_popen(10, 5, (2, 2, 3))
+    reader = FFMpegVideoReader('fake.avi', read_ahead=3)
+    threads = []
+    with patch('menpo.io.input.video._ReadAheadThread',
+               side_effect=_record_read_ahead_thread(threads)):
+        assert [f[0, 0, 0] for f in reader] == list(range(10))
+    # a single thread read every frame
+    assert len(threads) == 1
+    assert threads[0].next_index == 10
+    assert popen.call_count == 1
+    # out of order access stops the thread and reopens the video
+    assert reader[4][0, 0, 0] == 4
+    assert reader[5][0, 0, 0] == 5
+    assert popen.call_count == 2
+    assert np.all(reader.read_range(1, 3)[:, 0, 0, 0] == [1, 2])
+    assert reader._read_ahead_thread is None
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_import_videos_n_workers_read_ahead(video_infos_ffprobe, popen,
+                                            tmpdir):
+    video_infos_ffprobe.return_value = {'duration': 2, 'width': 2,
+                                        'height': 2, 'n_frames': 10, 'fps': 5}
+    popen.side_effect = _fake_ffmpeg_popen(10, 5, (2, 2, 3))
+    for name in ['a.avi', 'b.avi', 'c.avi']:
+        tmpdir.join(name).write('')
+    videos = list(mio.import_videos(str(tmpdir), as_generator=True,
+                                    n_workers=2, read_ahead=4,
+                                    normalize=False))
+    assert [v.path.name for v in videos] == ['a.avi', 'b.avi', 'c.avi']
+    for video in videos:
+        assert [f.pixels[0, 0, 0] for f in video] == list(range(10))
+
+
 def test_import_images_negative_max_images():
     with raises(ValueError):
         list(mio.import_images(mio.data_dir_path(), max_images=-2))
@@ -82,7 +82,8 @@ def dot_inplace_right(a, b, block_size=1000):
     return b[:n_small]
 
 
-def as_matrix(vectorizables, length=None, return_template=False, verbose=False):
+def as_matrix(vectorizables, length=None, return_template=False, verbose=False,
+              out=None):
     r"""
     Create a matrix from a list/generator of :map:`Vectorizable` objects.
     All the objects in the list **must** be the same size when vectorized.
@@ -103,11 +104,15 @@ def as_matrix(vectorizables, length=None, return_template=False, verbose=False):
         If ``True``, will return the first element of the list/generator, which
         was used as the template. Useful if you need to map back from the
         matrix to a list of vectorizable objects.
+    out : ``(length, n_features)`` `ndarray`, optional
+        If provided, the matrix is written into ``out`` rather than into a
+        newly allocated array. The vectors are cast to the dtype of ``out``.
 
     Returns
     -------
     M : (length, n_features) `ndarray`
-        Every row is an element of the list.
+        Every row is an element of the list. If ``out`` was provided, this
+        is ``out``.
     template : :map:`Vectorizable`, optional
         If ``return_template == True``, will return the template used to
         build the matrix `M`.
@@ -116,6 +121,8 @@ def as_matrix(vectorizables, length=None, return_template=False, verbose=False):
     ------
     ValueError
         ``vectorizables`` terminates in fewer than ``length`` iterations
+    ValueError
+        ``out`` is not of shape ``(length, n_features)``
     """
     # get the first element as the template and use it to configure the
     # data matrix
@@ -130,7 +137,13 @@ def as_matrix(vectorizables, length=None, return_template=False, verbose=False):
     n_features = template.n_parameters
     template_vector = template.as_vector()
 
-    data = np.zeros((length, n_features), dtype=template_vector.dtype)
+    if out is None:
+        data = np.zeros((length, n_features), dtype=template_vector.dtype)
+    elif out.shape != (length, n_features):
+        raise ValueError('out must be of shape {} ({} provided)'.format(
+            (length, n_features), out.shape))
+    else:
+        data = out
     if verbose:
         print('Allocated data matrix of size {} '
               '({} samples)'.format(bytes_str(data.nbytes), length))
@@ -73,6 +73,18 @@ def test_as_matrix_generator():
     assert_equal(data.shape, (n_images, 20))
 
 
+def test_as_matrix_out():
+    out = np.empty((n_images, 20), dtype=np.float32)
+    data = as_matrix([template.copy() for _ in range(n_images)], out=out)
+    assert data is out
+
+
+def test_as_matrix_out_wrong_shape_raises_value_error():
+    with raises(ValueError):
+        as_matrix([template.copy() for _ in range(n_images)],
+                  out=np.empty((n_images, 19)))
+
+
 def test_as_matrix_short_length():
     data = as_matrix((template.copy() for _ in range(n_images)), length=1)
     # Two rows of the mask are True (10 * 2 = 20)
@@ -1204,6 +1204,57 @@ class PCAModel(VectorizableBackedModel, PCAVectorModel):
                                 n_samples=n_samples, inplace=inplace)
         VectorizableBackedModel.__init__(self, template)
 
+    @classmethod
+    def init_from_data_matrix(cls, data, template, centre=True,
+                              max_n_components=None, inplace=False):
+        r"""
+        Build the Principal Component Analysis (PCA) from an existing data
+        matrix, whose rows are the vectorized samples. This avoids building
+        a :map:`Vectorizable` per sample when the data has been produced in
+        bulk (for instance by :map:`warp_images`). Integer data (e.g.
+        ``uint8`` pixels) is converted to ``float64`` first.
+
+        Parameters
+        ----------
+        data : ``(n_samples, ...)`` `ndarray`
+            The data matrix. Each sample is flattened, and so must have the
+            same number of elements as ``template.as_vector()``.
+        template : :map:`Vectorizable`
+            An instance that is used for all conversions to and from vectors.
+        centre : `bool`, optional
+            When ``True`` (default) PCA is performed after mean centering the
+            data. If ``False`` the data is assumed to be centred, and the mean
+            will be ``0``.
+        max_n_components : `int`, optional
+            The maximum number of components to keep in the model. Any
+            components above and beyond this one are discarded.
+        inplace : `bool`, optional
+            If ``True`` the data matrix is centred in place, which avoids a
+            copy but destroys ``data``. Note that if ``data`` is memory-mapped
+            (e.g. the ``mmap_path`` output of :map:`warp_images`), this also
+            modifies the file on disk. Otherwise, the data matrix is copied.
+            Integer data is always copied when it is converted to float.
+
+        Raises
+        ------
+        ValueError
+            If the samples do not have the same number of elements as the
+            template.
+        """
+        if not np.issubdtype(data.dtype, np.floating):
+            data = data.astype(np.float64)
+        data = data.reshape([data.shape[0], -1])
+        if data.shape[1] != template.n_parameters:
+            raise ValueError('The samples have {} elements, but the template '
+                             'has {}'.format(data.shape[1],
+                                             template.n_parameters))
+        self_model = PCAVectorModel.__new__(cls)
+        PCAVectorModel.__init__(self_model, data, centre=centre,
+                                max_n_components=max_n_components,
+                                n_samples=data.shape[0], inplace=inplace)
+        VectorizableBackedModel.__init__(self_model, template)
+        return self_model
+
     @classmethod
     def init_from_covariance_matrix(cls, C, mean, n_samples, centred=True,
                                     is_inverse=False, max_n_components=None):
@@ -5,7 +5,6 @@ import numbers
 import collections
 from warnings import warn
 from scipy.sparse import csr_matrix
-from scipy.spatial.distance import cdist
 
 from menpo.transform import WithDims
 from menpo.visualize import viewwrapper
@@ -1164,6 +1163,7 @@ class PointCloud(Shape):
         if self.n_dims != pointcloud.n_dims:
             raise ValueError("The two PointClouds must be of the same "
                              "dimensionality.")
+        from scipy.spatial.distance import cdist
         return cdist(self.points, pointcloud.points, **kwargs)
 
     def norm(self, **kwargs):
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import menpo
+
+
+lazy_imports = pytest.mark.skipif(sys.version_info < (3, 7),
+                                  reason='Lazy imports require Python 3.7')
+
+
+def loaded_modules(statement):
+    # A fresh interpreter is needed, as this one has already imported
+    # everything
+    code = ('import sys\n{}\n'
+            'print("\\n".join(sorted(sys.modules)))'.format(statement))
+    env = dict(os.environ)
+    menpo_parent = os.path.dirname(os.path.dirname(menpo.__file__))
+    env['PYTHONPATH'] = os.pathsep.join(
+        [menpo_parent] + [p for p in [env.get('PYTHONPATH')] if p])
+    output = subprocess.check_output([sys.executable, '-c', code], env=env)
+    return set(output.decode('utf-8').split())
+
+
+def loaded_subpackages(statement):
+    return {m.split('.')[1] for m in loaded_modules(statement)
+            if m.startswith('menpo.')}
+
+
+@lazy_imports
+def test_import_menpo_is_lazy():
+    assert loaded_subpackages('import menpo') <= {'base', '_version'}
+
+
+@lazy_imports
+def test_import_menpo_shape_only_imports_dependencies():
+    assert 'shape' in loaded_subpackages('import menpo.shape')
+    assert not (loaded_subpackages('import menpo.shape') &
+                {'feature', 'image', 'io', 'math', 'model'})
+
+
+@lazy_imports
+def test_import_menpo_io_does_not_import_image_or_shape():
+    assert not (loaded_subpackages('import menpo.io') &
+                {'feature', 'image', 'landmark', 'math', 'model', 'shape',
+                 'transform'})
+
+
+@lazy_imports
+def test_import_menpo_shape_does_not_import_scipy_spatial():
+    assert 'scipy.spatial' not in loaded_modules('import menpo.shape')
+
+
+def test_menpo_subpackage_attribute_access():
+    assert menpo.shape.PointCloud is not None
+    assert 'image' in dir(menpo)
+    with pytest.raises(AttributeError):
+        menpo.not_a_subpackage
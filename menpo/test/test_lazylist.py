@@ -3,7 +3,7 @@ import numpy as np
 from mock import Mock
 from pytest import raises
 
-from menpo.base import LazyList
+from menpo.base import LazyList, _callable_fingerprint
 
 
 def test_lazylist_get():
@@ -172,3 +172,235 @@ def test_lazylist_slice_with_ndarray():
     l = LazyList.init_from_iterable(['a', 'b', 'c', 'd', 'e'])
     l_indexed = l[index]
     assert list(l_indexed) == ['b', 'a', 'd']
+
+
+def test_lazylist_prefetch_ordered():
+    ll = LazyList.init_from_iterable(range(20), f=lambda x: x * 2)
+    assert list(ll.prefetch(n_workers=4, read_ahead=3)) == list(range(0, 40, 2))
+
+
+def test_lazylist_prefetch_bounded_read_ahead():
+    mock_func = Mock()
+    mock_func.return_value = 1
+    ll = LazyList([mock_func] * 10)
+    prefetched = ll.prefetch(n_workers=2, read_ahead=3)
+    next(prefetched)
+    # the item being consumed counts towards the read-ahead window
+    assert mock_func.call_count <= 3
+    prefetched.close()
+
+
+def test_lazylist_prefetch_counts_concurrent_items():
+    import threading
+    import time
+    lock = threading.Lock()
+    state = {'alive': 0, 'max_alive': 0}
+
+    def load():
+        # an item is alive from when it starts being evaluated until the
+        # consumer has finished with it
+        with lock:
+            state['alive'] += 1
+            state['max_alive'] = max(state['max_alive'], state['alive'])
+        return 1
+
+    ll = LazyList([load] * 20)
+    for _ in ll.prefetch(n_workers=8, read_ahead=3):
+        time.sleep(0.005)
+        with lock:
+            state['alive'] -= 1
+    assert state['max_alive'] <= 3
+
+
+def test_lazylist_prefetch_process():
+    from functools import partial
+    ll = LazyList([partial(abs, -1), partial(abs, -2)])
+    assert list(ll.prefetch(n_workers=2, backend='process')) == [1, 2]
+
+
+def test_lazylist_prefetch_raises_in_order():
+    def fail():
+        raise KeyError()
+    ll = LazyList([lambda: 1, fail, lambda: 3])
+    prefetched = ll.prefetch(n_workers=2)
+    assert next(prefetched) == 1
+    with raises(KeyError):
+        next(prefetched)
+
+
+def test_lazylist_prefetch_invalid_backend():
+    with raises(ValueError):
+        LazyList([]).prefetch(backend='gpu')
+
+
+def test_lazylist_prefetch_invalid_read_ahead():
+    with raises(ValueError):
+        LazyList([]).prefetch(n_workers=1, read_ahead=0)
+
+
+def test_lazylist_cached_hits():
+    mock_func = Mock()
+    mock_func.return_value = 1
+    ll = LazyList([mock_func]).cached()
+    ll[0]
+    ll[0]
+    assert mock_func.call_count == 1
+    assert ll.cache.hits == 1
+    assert ll.cache.misses == 1
+
+
+def test_lazylist_cached_lru_eviction():
+    ll = LazyList.init_from_iterable(range(3), f=lambda x: np.zeros(10))
+    ll = ll.cached(max_bytes=160)  # room for two items
+    ll[0]
+    ll[1]
+    ll[0]  # 1 is now the least recently used
+    ll[2]
+    assert ll.cache.evictions == 1
+    assert ll.cache.n_bytes == 160
+    ll[0]
+    assert ll.cache.hits == 2
+
+
+def test_lazylist_cached_fifo_eviction():
+    ll = LazyList.init_from_iterable(range(3), f=lambda x: np.zeros(10))
+    ll = ll.cached(max_bytes=160, policy='fifo')
+    ll[0]
+    ll[1]
+    ll[0]
+    ll[2]  # evicts 0 despite it being recently used
+    ll[0]
+    assert ll.cache.hits == 1
+    assert ll.cache.evictions == 2
+
+
+def test_lazylist_cached_too_large_not_stored():
+    ll = LazyList([lambda: np.zeros(10)]).cached(max_bytes=8)
+    ll[0]
+    assert ll.cache.n_items == 0
+
+
+def test_lazylist_cached_shared_by_slices_and_maps():
+    mock_func = Mock()
+    mock_func.return_value = 1
+    ll = LazyList([mock_func] * 4).cached()
+    ll[1]
+    assert ll[1:3].map(lambda x: x + 1)[0] == 2
+    assert mock_func.call_count == 1
+
+
+def test_lazylist_cached_invalid_policy():
+    with raises(ValueError):
+        LazyList([]).cached(policy='mru')
+
+
+def test_estimate_nbytes_image():
+    from menpo.base import estimate_nbytes
+    from menpo.image import Image
+    from menpo.shape import PointCloud
+    image = Image.init_blank((10, 10), dtype=np.uint8)
+    image.landmarks['test'] = PointCloud(np.zeros((5, 2)))
+    assert estimate_nbytes(image) == 100 + 80
+
+
+def _double(x):
+    return x * 2
+
+
+def _double_locked(x, lock):
+    with lock:
+        return x * 2
+
+
+def test_lazylist_cache_to_dir(tmpdir):
+    from functools import partial
+    ll = LazyList([partial(np.arange, 1000.)]).map(_double)
+    cached_ll = ll.cache_to_dir(str(tmpdir))
+    assert not isinstance(cached_ll[0], np.memmap)
+    # A fresh LazyList with the same pipeline is served from disk
+    cached_ll = ll.cache_to_dir(str(tmpdir))
+    item = cached_ll[0]
+    assert isinstance(item, np.memmap)
+    assert np.all(item == np.arange(1000.) * 2)
+
+
+def test_lazylist_cache_to_dir_fingerprint_changes(tmpdir):
+    from functools import partial
+    ll_a = LazyList([partial(_double, 1)]).cache_to_dir(str(tmpdir))
+    ll_b = LazyList([partial(_double, 2)]).cache_to_dir(str(tmpdir))
+    assert ll_a[0] == 2
+    assert ll_b[0] == 4
+    assert len(tmpdir.listdir()) == 2
+
+
+def test_callable_fingerprint_set_independent_of_order():
+    from functools import partial
+    # 1 and 9 collide in a small set, so the iteration order of these sets
+    # follows the insertion order (as it does for strings across processes)
+    a, b = {1, 9}, {9, 1}
+    assert list(a) != list(b)
+    assert (_callable_fingerprint(partial(_double, a)) ==
+            _callable_fingerprint(partial(_double, b)))
+    assert (_callable_fingerprint(partial(_double, frozenset(a))) ==
+            _callable_fingerprint(partial(_double, frozenset(b))))
+    assert (_callable_fingerprint(partial(_double, a)) !=
+            _callable_fingerprint(partial(_double, {1, 8})))
+
+
+def test_lazylist_cache_to_dir_unstable_fingerprint_not_cached(tmpdir):
+    from functools import partial
+    import threading
+    ll = LazyList([partial(_double_locked, 1, threading.Lock())])
+    with raises(ValueError):
+        _callable_fingerprint(ll._callables[0])
+    assert ll.cache_to_dir(str(tmpdir))[0] == 2
+    assert len(tmpdir.listdir()) == 0
+
+
+def test_lazylist_iter_batches_vectors():
+    from menpo.shape import PointCloud
+    ll = LazyList.init_from_iterable(range(5),
+                                     f=lambda x: PointCloud(np.ones((3, 2)) * x))
+    batches = list(ll.iter_batches(2))
+    assert [b.shape for b in batches] == [(2, 6), (2, 6), (1, 6)]
+    assert batches[2][0, 0] == 4
+
+
+def test_lazylist_iter_batches_pixels_reuse_buffer():
+    from menpo.image import Image
+    ll = LazyList.init_from_iterable(
+        range(3), f=lambda x: Image.init_blank((4, 5), n_channels=3, fill=x))
+    batches = list(ll.iter_batches(2, pixels=True, reuse_buffer=True))
+    assert batches[0].shape == (2, 3, 4, 5)
+    assert batches[1].shape == (1, 3, 4, 5)
+    # the second batch was written into the same buffer as the first
+    assert np.shares_memory(batches[0], batches[1])
+    assert batches[0][0, 0, 0, 0] == 2
+
+
+def test_lazylist_iter_batches_out():
+    from menpo.image import Image
+    out = np.empty((2, 1, 4, 5), dtype=np.float32)
+    ll = LazyList.init_from_iterable(
+        range(2), f=lambda x: Image.init_blank((4, 5), fill=x))
+    batch = next(ll.iter_batches(2, pixels=True, out=out))
+    assert np.shares_memory(batch, out)
+    assert out[1, 0, 0, 0] == 1
+
+
+def test_lazylist_iter_batches_pixels_mismatched_shapes():
+    from menpo.image import Image
+    ll = LazyList([lambda: Image.init_blank((4, 5)),
+                   lambda: Image.init_blank((5, 5))])
+    with raises(ValueError):
+        list(ll.iter_batches(2, pixels=True))
+
+
+def test_lazylist_iter_batches_lists():
+    ll = LazyList.init_from_iterable(range(5))
+    assert list(ll.iter_batches(3, as_array=False)) == [[0, 1, 2], [3, 4]]
+
+
+def test_lazylist_iter_batches_invalid_batch_size():
+    with raises(ValueError):
+        LazyList([]).iter_batches(0)
@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.spatial.distance import cdist
 from .base import Transform
 
 
@@ -86,6 +85,7 @@ class R2LogR2RBF(RadialBasisFunction):
             The basis function applied to each distance,
             :math:`\lVert x - c \rVert`.
         """
+        from scipy.spatial.distance import cdist
         euclidean_distance = cdist(x, self.c)
         mask = euclidean_distance == 0
         with np.errstate(divide='ignore', invalid='ignore'):
@@ -130,6 +130,7 @@ class R2LogRRBF(RadialBasisFunction):
             The basis function applied to each distance,
             :math:`\lVert points - c \rVert`.
         """
+        from scipy.spatial.distance import cdist
         euclidean_distance = cdist(points, self.c)
         mask = euclidean_distance == 0
         with np.errstate(divide='ignore', invalid='ignore'):